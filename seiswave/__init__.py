@@ -5,10 +5,13 @@ SeisWave - 地震信号处理与选波工具包
 """
 
 from .core import (
-    EQSignal, Spectra, Filter, WaveGenerator,
-    FileIO, EQRecord, CodeSpectrum,
-    WaveSelector, SelectionCriteria, SelectionResult,
+    EQSignal, Spectra, Filter, StreamingFilter, WaveGenerator,
+    FileIO, EQRecord, LazyRecord, WaveformCache, RecordStream, StreamWindow, CodeSpectrum,
+    WaveSelector, SelectionCriteria, SelectionResult, SweepResult,
     FFT, Response,
+    IntensityMeasures, IMIndex, RecordBatch, RecordStore, RecordCatalog, RecordLibrary, RecordDedup, DedupResult, NewmarkOperator, StreamingSpectra, FitReport, Envelope,
+    StochasticGenerator, PointSource, PSDGenerator, CompatibilityResult,
+    RVT,
 )
 
 __version__ = "2.0.0"
@@ -17,13 +20,36 @@ __all__ = [
     'EQSignal',
     'Spectra',
     'Filter',
+    'StreamingFilter',
     'WaveGenerator',
+    'FitReport',
+    'Envelope',
+    'StochasticGenerator',
+    'PointSource',
+    'PSDGenerator',
+    'CompatibilityResult',
+    'RVT',
     'FileIO',
     'EQRecord',
+    'LazyRecord',
+    'WaveformCache',
+    'RecordStream',
+    'StreamWindow',
     'CodeSpectrum',
     'WaveSelector',
     'SelectionCriteria',
     'SelectionResult',
+    'SweepResult',
     'FFT',
     'Response',
+    'IntensityMeasures',
+    'IMIndex',
+    'RecordBatch',
+    'RecordStore',
+    'RecordCatalog',
+    'RecordLibrary',
+    'RecordDedup',
+    'DedupResult',
+    'NewmarkOperator',
+    'StreamingSpectra',
 ]
@@ -5,9 +5,14 @@ python -m seiswave 启动 GUI 应用。
 """
 
 import sys
+import multiprocessing
 
 
 def main():
+    # PyInstaller 打包后，进程池（spawn）的子进程执行到此处即转入工作进程，
+    # 不再启动新的 GUI
+    multiprocessing.freeze_support()
+
     from PySide6.QtWidgets import QApplication
     from PySide6.QtCore import Qt
 
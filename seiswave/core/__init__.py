@@ -5,26 +5,59 @@ SeisWave 核心计算库
 """
 
 from .signal import EQSignal
-from .spectrum import Spectra
-from .filter import Filter
-from .generator import WaveGenerator
-from .io import FileIO, EQRecord
+from .spectrum import Spectra, NewmarkOperator, StreamingSpectra
+from .filter import Filter, StreamingFilter
+from .generator import WaveGenerator, FitReport
+from .envelope import Envelope
+from .stochastic import StochasticGenerator, PointSource
+from .psd import PSDGenerator, CompatibilityResult
+from .rvt import RVT
+from .io import FileIO, EQRecord, LazyRecord, WaveformCache, RecordStream, StreamWindow
 from .code_spec import CodeSpectrum
-from .selector import WaveSelector, SelectionCriteria, SelectionResult
+from .selector import WaveSelector, SelectionCriteria, SelectionResult, SweepResult
 from .fft import FFT
 from .response import Response
+from .intensity import IntensityMeasures, IMIndex
+from .batch import RecordBatch
+from .store import RecordStore
+from .catalog import RecordCatalog
+from .library import RecordLibrary
+from .dedup import RecordDedup, DedupResult
 
 __all__ = [
     'EQSignal',
     'Spectra',
     'Filter',
+    'StreamingFilter',
     'WaveGenerator',
+    'FitReport',
+    'Envelope',
+    'StochasticGenerator',
+    'PointSource',
+    'PSDGenerator',
+    'CompatibilityResult',
+    'RVT',
     'FileIO',
     'EQRecord',
+    'LazyRecord',
+    'WaveformCache',
+    'RecordStream',
+    'StreamWindow',
     'CodeSpectrum',
     'WaveSelector',
     'SelectionCriteria',
     'SelectionResult',
+    'SweepResult',
     'FFT',
     'Response',
+    'IntensityMeasures',
+    'IMIndex',
+    'RecordBatch',
+    'RecordStore',
+    'RecordCatalog',
+    'RecordLibrary',
+    'RecordDedup',
+    'DedupResult',
+    'NewmarkOperator',
+    'StreamingSpectra',
 ]
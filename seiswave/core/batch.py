@@ -0,0 +1,158 @@
+"""
+记录批量容器模块
+
+将多条长度不一的加速度记录拼接为一个连续数组 + 偏移量（ragged 存储），
+持时等逐条统计量用分段归约（np.maximum.reduceat 等）一次算出，
+避免在 Python 中逐条循环。
+"""
+
+import numpy as np
+from typing import Optional
+
+from .io import EQRecord
+
+
+class RecordBatch:
+    """拼接存储的记录集合
+
+    第 i 条记录的数据为 data[offsets[i]:offsets[i + 1]]。
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, dt: np.ndarray,
+                 names: Optional[list[str]] = None):
+        """
+        Parameters
+        ----------
+        data : np.ndarray
+            所有记录加速度首尾拼接的一维数组（可为 np.memmap）
+        offsets : np.ndarray
+            长度 n_records + 1 的起止偏移，offsets[0] = 0，offsets[-1] = len(data)
+        dt : np.ndarray
+            各记录时间步长 (s)
+        names : list[str], optional
+            各记录名称
+        """
+        self.data = data
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.dt = np.asarray(dt, dtype=np.float64)
+        n = len(self.offsets) - 1
+        self.names = list(names) if names is not None else [f"record_{i}" for i in range(n)]
+
+        if len(self.dt) != n or len(self.names) != n:
+            raise ValueError(
+                f"offsets ({n} 条)、dt ({len(self.dt)}) 与 names ({len(self.names)}) 数量不一致"
+            )
+
+    @classmethod
+    def from_records(cls, records: list) -> 'RecordBatch':
+        """由记录列表拼接（复制一次数据）"""
+        lengths = [len(rec.acc) for rec in records]
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if records:
+            data = np.concatenate([np.asarray(rec.acc, dtype=np.float64) for rec in records])
+        else:
+            data = np.zeros(0)
+        return cls(data, offsets, [rec.dt for rec in records],
+                   [rec.name for rec in records])
+
+    # ──────────────────── 访问 ────────────────────
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """各记录数据点数"""
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> EQRecord:
+        """第 index 条记录（acc 为 data 的视图，不复制）"""
+        acc = self.data[self.offsets[index]:self.offsets[index + 1]]
+        return EQRecord(acc=acc, dt=float(self.dt[index]), name=self.names[index])
+
+    def to_records(self) -> list[EQRecord]:
+        return [self[i] for i in range(len(self))]
+
+    # ──────────────────── 分段统计 ────────────────────
+
+    def _segments(self) -> tuple:
+        """非空记录的掩码、起点与长度（reduceat 不支持空段）"""
+        lengths = self.lengths
+        nonempty = lengths > 0
+        return nonempty, self.offsets[:-1][nonempty], lengths[nonempty]
+
+    def pga(self) -> np.ndarray:
+        """各记录峰值加速度，空记录为 0"""
+        nonempty, starts, _ = self._segments()
+        out = np.zeros(len(self))
+        if len(starts):
+            out[nonempty] = np.maximum.reduceat(np.abs(self.data), starts)
+        return out
+
+    def bracketed_duration(self, threshold: float = 0.1) -> np.ndarray:
+        """括号持时：首次到最后一次 |a| ≥ threshold × PGA 的时间段
+
+        WaveSelector._check_duration 的实现。
+
+        Returns
+        -------
+        np.ndarray
+            持时 (s)，PGA 为零或空记录为 NaN
+        """
+        nonempty, starts, lengths = self._segments()
+        out = np.full(len(self), np.nan)
+        if not len(starts):
+            return out
+
+        absd = np.abs(self.data)
+        pga = np.maximum.reduceat(absd, starts)
+        above = absd >= np.repeat(threshold * pga, lengths)
+
+        n = len(absd)
+        pos = np.arange(n)
+        first = np.minimum.reduceat(np.where(above, pos, n), starts)
+        last = np.maximum.reduceat(np.where(above, pos, -1), starts)
+
+        dur = (last - first) * self.dt[nonempty]
+        dur[pga == 0] = np.nan
+        out[nonempty] = dur
+        return out
+
+    def significant_duration(self, lo: float = 0.05, hi: float = 0.95) -> np.ndarray:
+        """显著持时：Arias 强度由 lo 增至 hi 的时间段
+
+        与 EQSignal.effective_duration 的定义一致（默认 5%~95%）。
+
+        Returns
+        -------
+        np.ndarray
+            持时 (s)，Arias 强度为零或空记录为 0
+        """
+        nonempty, starts, lengths = self._segments()
+        out = np.zeros(len(self))
+        if not len(starts):
+            return out
+
+        # 逐段累加：整批累加后再减去段首基数，排在大记录之后的小记录会因相消损失精度
+        a2 = np.square(self.data, dtype=np.float64)
+        local = np.empty_like(a2)
+        for start, length in zip(starts, lengths):
+            np.cumsum(a2[start:start + length], out=local[start:start + length])
+        total = local[starts + lengths - 1]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            norm = local / np.repeat(total, lengths)
+        i1 = np.add.reduceat((norm < lo).astype(np.int64), starts)
+        i2 = np.add.reduceat((norm < hi).astype(np.int64), starts)
+
+        dur = (i2 - i1) * self.dt[nonempty]
+        dur[total == 0] = 0.0
+        out[nonempty] = dur
+        return out
+
+    def __str__(self):
+        return f"RecordBatch(n_records={len(self)}, n_samples={len(self.data)})"
+
+    def __repr__(self):
+        return self.__str__()
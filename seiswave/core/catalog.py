@@ -0,0 +1,374 @@
+"""
+记录库元数据索引模块
+
+从 AT2 头部与文件名解析事件、台站、分量、RSN 等字段，可关联 PEER 检索结果 /
+flatfile CSV 中的震级、距离、Vs30 等参数，列式存入 SQLite。按条件查询得到
+记录序号后再加载波形，候选集在读取任何波形之前即可缩小：
+
+    catalog = RecordCatalog.from_directory('lib.db', 'PEER/', flatfile='_SearchResults.csv')
+    ids = catalog.query(magnitude=(6.0, 7.5), rrup=(None, 30.0))
+    records = catalog.records(ids)   # 延迟加载记录，可直接用于选波
+"""
+
+import os
+import re
+import csv
+import sqlite3
+import numpy as np
+
+from .io import FileIO, LazyRecord
+
+# 索引表版本，表结构变化时递增
+CATALOG_VERSION = 1
+
+# 列名 → SQLite 类型
+COLUMNS = {
+    'name': 'TEXT',
+    'filepath': 'TEXT',
+    'dt': 'REAL',
+    'npts': 'INTEGER',
+    'rsn': 'INTEGER',            # PEER 记录序号（文件名 RSNxxx_）
+    'event': 'TEXT',             # 地震事件名
+    'date': 'TEXT',              # 发震日期（头部原文）
+    'station': 'TEXT',           # 台站名
+    'component': 'TEXT',         # 分量方向
+    'units': 'TEXT',             # 头部第 3 行的单位说明
+    'magnitude': 'REAL',
+    'mechanism': 'TEXT',
+    'year': 'INTEGER',
+    'rjb': 'REAL',               # Joyner-Boore 距离 (km)
+    'rrup': 'REAL',              # 断层最近距离 (km)
+    'vs30': 'REAL',              # (m/s)
+    'd5_75': 'REAL',             # 5-75% 显著持时 (s)
+    'd5_95': 'REAL',             # 5-95% 显著持时 (s)
+    'arias': 'REAL',             # Arias 强度 (m/s)
+    'tp_pulse': 'REAL',          # 速度脉冲周期 (s)
+    'lowest_freq': 'REAL',       # 最低可用频率 (Hz)
+}
+
+# flatfile 列名别名（PEER 检索结果 _SearchResults.csv 与 NGA-West2 flatfile）
+FLATFILE_ALIASES = {
+    'rsn': ('Record Sequence Number', 'RSN'),
+    'event': ('Earthquake Name',),
+    'year': ('Year', 'YEAR'),
+    'station': ('Station Name',),
+    'magnitude': ('Magnitude', 'Earthquake Magnitude'),
+    'mechanism': ('Mechanism', 'Mechanism Based on Rake Angle'),
+    'rjb': ('Rjb (km)', 'Joyner-Boore Dist. (km)'),
+    'rrup': ('Rrup (km)', 'ClstD (km)'),
+    'vs30': ('Vs30 (m/sec)', 'Vs30 (m/s) selected for analysis'),
+    'd5_75': ('5-75% Duration (sec)',),
+    'd5_95': ('5-95% Duration (sec)',),
+    'arias': ('Arias Intensity (m/sec)',),
+    'tp_pulse': ('Tp-Pulse Period (sec)',),
+    'lowest_freq': ('Lowest Useable Frequency (Hz)',),
+}
+
+_RSN_PATTERN = re.compile(r'^RSN(\d+)_', re.IGNORECASE)
+# 旧版 NGA 头部第 2 行事件字段："IMPERIAL VALLEY 10/15/79 2316"
+_OLD_EVENT_PATTERN = re.compile(r'^(.*?)\s+(\d{1,2}/\d{1,2}/\d{2,4})(?:\s+\d{3,4})?$')
+
+
+class RecordCatalog:
+    """SQLite 列式元数据索引
+
+    记录序号 id 为建库时记录列表中的位置（从 0 开始）。
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """打开（或新建空的）索引库
+
+        Parameters
+        ----------
+        path : str
+            SQLite 文件路径，':memory:' 为内存库
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._create_tables()
+
+    def _create_tables(self):
+        cols = ', '.join(f'{k} {v}' for k, v in COLUMNS.items())
+        with self._conn:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS records (id INTEGER PRIMARY KEY, {cols})')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)')
+            for col in ('rsn', 'event', 'station', 'magnitude', 'rrup'):
+                self._conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS idx_{col} ON records ({col})')
+            row = self._conn.execute(
+                "SELECT value FROM info WHERE key = 'version'").fetchone()
+            if row is None:
+                self._conn.execute("INSERT INTO info VALUES ('version', ?)",
+                                   (str(CATALOG_VERSION),))
+            elif int(row[0]) != CATALOG_VERSION:
+                raise ValueError(
+                    f"索引库版本 {row[0]} 与当前支持的版本 {CATALOG_VERSION} 不一致: {self.path}"
+                )
+
+    # ──────────────────── 建库 ────────────────────
+
+    @classmethod
+    def build(cls, path: str, records: list, flatfile=None) -> 'RecordCatalog':
+        """由记录列表建库（已有内容被替换）
+
+        Parameters
+        ----------
+        path : str
+            SQLite 文件路径或 ':memory:'
+        records : list
+            EQRecord 或 LazyRecord 列表，只使用 name/dt/npts/filepath/metadata，
+            不访问波形
+        flatfile : str or list[str], optional
+            PEER 检索结果或 flatfile CSV（可多个），按 RSN 关联
+
+        Returns
+        -------
+        RecordCatalog
+        """
+        catalog = cls(path)
+        names = list(COLUMNS)
+        rows = []
+        for i, rec in enumerate(records):
+            fields = RecordCatalog.parse_header(rec.name, rec.metadata)
+            fields.update(name=rec.name, filepath=rec.filepath,
+                          dt=float(rec.dt), npts=int(rec.npts))
+            rows.append((i,) + tuple(fields.get(k) for k in names))
+
+        with catalog._conn:
+            catalog._conn.execute('DELETE FROM records')
+            catalog._conn.executemany(
+                f'INSERT INTO records (id, {", ".join(names)}) '
+                f'VALUES ({", ".join("?" * (len(names) + 1))})', rows)
+        if flatfile is not None:
+            for ff in ([flatfile] if isinstance(flatfile, str) else flatfile):
+                catalog.join_flatfile(ff)
+        return catalog
+
+    @classmethod
+    def from_directory(cls, path: str, directory: str, pattern: str = "*.AT2",
+                       recursive: bool = False,
+                       flatfile=None) -> 'RecordCatalog':
+        """扫描目录（或 zip 归档）的 AT2 头部建库，不读取波形
+
+        Parameters
+        ----------
+        path : str
+            SQLite 文件路径或 ':memory:'
+        directory, pattern, recursive
+            同 FileIO.batch_scan()
+        flatfile : str, optional
+            同 build()
+        """
+        records = FileIO.batch_scan(directory, pattern, recursive=recursive)
+        return cls.build(path, records, flatfile=flatfile)
+
+    @staticmethod
+    def parse_header(name: str, metadata: dict) -> dict:
+        """由文件名与 AT2 头部解析索引字段
+
+        头部第 2 行为 "事件, 日期, 台站, 分量"（NGA-West2）或
+        "事件 日期 时刻, 台站, 分量"（旧版 NGA）。无法识别的字段为 None。
+        """
+        fields = {}
+        match = _RSN_PATTERN.match(name or '')
+        fields['rsn'] = int(match.group(1)) if match else None
+
+        parts = [p.strip() for p in metadata.get('header2', '').split(',')]
+        if len(parts) >= 4:
+            fields['event'], fields['date'] = parts[0], parts[1]
+            fields['station'], fields['component'] = parts[2], parts[-1]
+        elif len(parts) == 3:
+            old = _OLD_EVENT_PATTERN.match(parts[0])
+            if old:
+                fields['event'], fields['date'] = old.group(1), old.group(2)
+            else:
+                fields['event'] = parts[0]
+            fields['station'], fields['component'] = parts[1], parts[2]
+
+        units = metadata.get('header3')
+        fields['units'] = units or None
+        return fields
+
+    @staticmethod
+    def read_flatfile(filepath: str) -> dict:
+        """读取 PEER 检索结果 / flatfile CSV
+
+        自动定位含 "Record Sequence Number" 的表头行，读到其后第一个空行为止。
+
+        Returns
+        -------
+        dict
+            {rsn: {列名: 值}}，列名见 FLATFILE_ALIASES；数值列无法解析（如 '-'）时为 None
+        """
+        with open(filepath, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+            rows = list(csv.reader(f))
+
+        lookup = {alias: key for key, aliases in FLATFILE_ALIASES.items()
+                  for alias in aliases}
+        header_idx = None
+        for i, row in enumerate(rows):
+            cells = [c.strip() for c in row]
+            if any(lookup.get(c) == 'rsn' for c in cells):
+                header_idx = i
+                break
+        if header_idx is None:
+            raise ValueError(f"flatfile 中未找到 Record Sequence Number 列: {filepath}")
+
+        columns = {j: lookup[c.strip()] for j, c in enumerate(rows[header_idx])
+                   if c.strip() in lookup}
+        table = {}
+        for row in rows[header_idx + 1:]:
+            if not any(c.strip() for c in row):
+                break
+            entry = {}
+            for j, key in columns.items():
+                if j < len(row):
+                    entry[key] = RecordCatalog._convert(row[j].strip(), COLUMNS[key])
+            if entry.get('rsn') is not None:
+                table[entry['rsn']] = entry
+        return table
+
+    @staticmethod
+    def _convert(text: str, sql_type: str):
+        """按列类型转换 flatfile 单元格"""
+        if sql_type == 'TEXT':
+            return text or None
+        try:
+            value = float(text)
+        except ValueError:
+            return None
+        return int(value) if sql_type == 'INTEGER' else value
+
+    def join_flatfile(self, flatfile: str) -> int:
+        """按 RSN 关联 flatfile，补全各记录的震级、距离等字段
+
+        头部已解析出的事件、台站名保留不变，其余 flatfile 列覆盖写入。
+
+        Returns
+        -------
+        int
+            关联上的记录条数
+        """
+        table = RecordCatalog.read_flatfile(flatfile)
+        keep = ('rsn', 'event', 'station')
+        updated = 0
+        with self._conn:
+            for rsn, entry in table.items():
+                values = {k: v for k, v in entry.items() if k not in keep}
+                fill = {k: entry[k] for k in ('event', 'station') if k in entry}
+                sets = [f'{k} = ?' for k in values] + \
+                       [f'{k} = COALESCE({k}, ?)' for k in fill]
+                if not sets:
+                    continue
+                cur = self._conn.execute(
+                    f'UPDATE records SET {", ".join(sets)} WHERE rsn = ?',
+                    tuple(values.values()) + tuple(fill.values()) + (rsn,))
+                updated += cur.rowcount
+        return updated
+
+    # ──────────────────── 查询 ────────────────────
+
+    def query(self, as_mask: bool = False, **conditions) -> np.ndarray:
+        """按条件查询记录序号
+
+        条件写法：
+        - 元组 (lo, hi)：数值范围，lo/hi 为 None 表示不限，边界包含在内
+        - 列表 / 集合：取值属于其中之一
+        - 其他标量：相等
+
+        字段值缺失（NULL）的记录不满足任何条件。
+
+        Parameters
+        ----------
+        as_mask : bool
+            True 时返回长度为 len(self) 的布尔掩码，可与 IMIndex.screen 组合
+
+        Returns
+        -------
+        np.ndarray
+            升序记录序号，或布尔掩码
+
+        Examples
+        --------
+        >>> catalog.query(magnitude=(6.0, None), rrup=(None, 30.0), mechanism='strike slip')
+        """
+        clauses, params = [], []
+        for key, cond in conditions.items():
+            if key not in COLUMNS:
+                raise KeyError(f"未知的索引字段: '{key}'. 可选值: {list(COLUMNS)}")
+            if isinstance(cond, tuple):
+                lo, hi = cond
+                clauses.append(f'{key} IS NOT NULL')
+                if lo is not None:
+                    clauses.append(f'{key} >= ?')
+                    params.append(lo)
+                if hi is not None:
+                    clauses.append(f'{key} <= ?')
+                    params.append(hi)
+            elif isinstance(cond, (list, set, frozenset)):
+                values = list(cond)
+                clauses.append(f'{key} IN ({", ".join("?" * len(values))})')
+                params.extend(values)
+            else:
+                clauses.append(f'{key} = ?')
+                params.append(cond)
+
+        sql = 'SELECT id FROM records'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        ids = np.array([r[0] for r in self._conn.execute(sql + ' ORDER BY id', params)],
+                       dtype=np.int64)
+        if as_mask:
+            mask = np.zeros(len(self), dtype=bool)
+            mask[ids] = True
+            return mask
+        return ids
+
+    def column(self, name: str, ids=None) -> np.ndarray:
+        """读取一列（按 id 升序，或按给定 ids 的顺序）；数值列缺失值为 NaN"""
+        if name not in COLUMNS:
+            raise KeyError(f"未知的索引字段: '{name}'. 可选值: {list(COLUMNS)}")
+        rows = self._conn.execute(f'SELECT id, {name} FROM records ORDER BY id').fetchall()
+        values = [r[1] for r in rows]
+        if COLUMNS[name] == 'TEXT':
+            out = np.array(values, dtype=object)
+        else:
+            out = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        return out if ids is None else out[np.asarray(ids, dtype=np.int64)]
+
+    def row(self, index: int) -> dict:
+        """单条记录的全部字段"""
+        cur = self._conn.execute('SELECT * FROM records WHERE id = ?', (int(index),))
+        values = cur.fetchone()
+        if values is None:
+            raise KeyError(f"记录序号不存在: {index}")
+        return dict(zip([d[0] for d in cur.description], values))
+
+    def paths(self, ids) -> list[str]:
+        """按 ids 顺序返回文件路径"""
+        fps = self.column('filepath', ids)
+        return [str(p) for p in fps]
+
+    def records(self, ids) -> list[LazyRecord]:
+        """按 ids 顺序创建延迟加载记录（波形在首次访问 acc 时读取）"""
+        return [LazyRecord.from_at2(fp) for fp in self.paths(ids)]
+
+    def __len__(self):
+        return self._conn.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __str__(self):
+        return f"RecordCatalog(path='{self.path}', n_records={len(self)})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,188 @@
+"""
+记录去重模块
+
+合并后的记录库中同一条记录常以不同文件名、不同格式（AT2 / 文本）重复出现。
+按 dt、有效点数与量化后的加速度样本计算指纹，识别内容相同的记录，
+每组只保留一条规范记录，其余文件作为别名记入 metadata['aliases']。
+
+量化步长取 10 的整数次幂（不大于 tol × PGA），AT2 的 7 位有效数字、文本的
+定点小数等格式精度差异不会改变量化结果。个别样本恰好落在量化边界两侧，或
+PGA 恰在 10 的整数次幂附近使两份拷贝的量化步长不同，都会导致指纹不同；此时
+再在 dt 相同、PGA 相差不超过容差的记录间按容差逐点比较（首尾近零段不计）。
+"""
+
+import copy
+import bisect
+import hashlib
+import numpy as np
+from dataclasses import dataclass, field
+
+# 默认容差（相对 PGA）
+DEDUP_TOL = 1e-4
+
+
+@dataclass
+class DedupResult:
+    """去重结果"""
+    records: list = field(default_factory=list)   # 规范记录（副本，metadata['aliases'] 为别名）
+    groups: list = field(default_factory=list)    # 每条规范记录对应的输入序号，首个为规范记录
+    index: np.ndarray = None                      # 每条输入记录所属的规范记录序号
+
+    @property
+    def n_duplicates(self) -> int:
+        """被合并掉的重复记录条数"""
+        return sum(len(g) - 1 for g in self.groups)
+
+    def __str__(self):
+        return (f"DedupResult(n_records={len(self.records)}, "
+                f"n_duplicates={self.n_duplicates})")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class RecordDedup:
+    """基于内容指纹的记录去重"""
+
+    @staticmethod
+    def fingerprint(acc: np.ndarray, dt: float, tol: float = DEDUP_TOL) -> str:
+        """记录内容指纹
+
+        首尾的零值（量化后）不计入，首尾补零长度不同的同一记录指纹相同。
+
+        Parameters
+        ----------
+        acc : np.ndarray
+            加速度时程
+        dt : float
+            时间步长 (s)，按 6 位有效数字参与指纹
+        tol : float
+            量化容差（相对 PGA）
+
+        Returns
+        -------
+        str
+            十六进制指纹
+        """
+        return RecordDedup._digest(RecordDedup._quantize(acc, tol), dt)
+
+    @staticmethod
+    def _digest(q: np.ndarray, dt: float) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f'{dt:.6g}|{len(q)}|'.encode())
+        h.update(q.tobytes())
+        return h.hexdigest()
+
+    @staticmethod
+    def _quantize(acc: np.ndarray, tol: float) -> np.ndarray:
+        """按 10 的整数次幂步长量化，去掉首尾的零"""
+        acc = np.asarray(acc, dtype=np.float64)
+        pga = float(np.max(np.abs(acc))) if len(acc) else 0.0
+        if pga == 0.0:
+            return np.zeros(0, dtype=np.int64)
+        step = 10.0 ** np.floor(np.log10(tol * pga))
+        q = np.rint(acc / step).astype(np.int64)
+        nonzero = np.flatnonzero(q)
+        return q[nonzero[0]:nonzero[-1] + 1]
+
+    @staticmethod
+    def deduplicate(records: list, tol: float = DEDUP_TOL) -> DedupResult:
+        """合并内容相同的记录
+
+        规范记录优先取 AT2 文件（头部带事件、台站等元数据），同为 AT2
+        或同为其他格式时取输入顺序靠前者。别名为其余重复记录的文件路径
+        （无路径时为名称）。
+
+        Parameters
+        ----------
+        records : list
+            EQRecord 或 LazyRecord 列表（LazyRecord 会读取波形）
+        tol : float
+            容差（相对 PGA）：两条记录 dt 相同，去掉首尾不超过 tol × PGA / 2
+            的样本后逐点差值不超过 tol × PGA（允许错开一个样本）即视为重复
+
+        Returns
+        -------
+        DedupResult
+            规范记录按其在输入中的位置排序
+        """
+        order = sorted(range(len(records)),
+                       key=lambda i: (not str(records[i].filepath).lower().endswith('.at2'), i))
+        owner = np.zeros(len(records), dtype=np.int64)
+        by_fp = {}          # 指纹 → 规范记录的输入序号
+        buckets = {}        # dt → ([规范记录 PGA，升序], [对应输入序号])
+        for i in order:
+            rec = records[i]
+            acc = np.asarray(rec.acc, dtype=np.float64)
+            pga = float(np.max(np.abs(acc))) if len(acc) else 0.0
+            fp = RecordDedup._digest(RecordDedup._quantize(acc, tol), rec.dt)
+            c = by_fp.get(fp)
+            pgas, owners = buckets.setdefault(f'{rec.dt:.6g}', ([], []))
+            if c is None:
+                c = RecordDedup._match(acc, pga, pgas, owners, records, tol)
+            if c is None:
+                c = i
+                k = bisect.bisect(pgas, pga)
+                pgas.insert(k, pga)
+                owners.insert(k, i)
+            by_fp.setdefault(fp, c)
+            owner[i] = c
+
+        canon = sorted(set(owner.tolist()))
+        position = {c: k for k, c in enumerate(canon)}
+        groups = [[c] for c in canon]
+        for i in order:
+            if owner[i] != i:
+                groups[position[owner[i]]].append(i)
+
+        result = DedupResult(index=np.array([position[c] for c in owner], dtype=np.int64))
+        for group in groups:
+            rec = copy.copy(records[group[0]])
+            aliases = [records[j].filepath or records[j].name for j in group[1:]]
+            rec.metadata = dict(rec.metadata, aliases=aliases)
+            result.records.append(rec)
+            result.groups.append(group)
+        return result
+
+    @staticmethod
+    def _match(acc: np.ndarray, pga: float, pgas: list, owners: list,
+               records: list, tol: float):
+        """在同一 dt、PGA 相差不超过容差的规范记录中按容差查找重复，找不到返回 None"""
+        lo = bisect.bisect_left(pgas, pga * (1.0 - tol))
+        hi = bisect.bisect_right(pgas, pga / (1.0 - tol)) if tol < 1.0 else len(pgas)
+        for k in range(lo, hi):
+            atol = tol * max(pga, pgas[k])
+            if abs(pga - pgas[k]) > atol:
+                continue
+            other = np.asarray(records[owners[k]].acc, dtype=np.float64)
+            if RecordDedup._close(acc, other, atol):
+                return owners[k]
+        return None
+
+    @staticmethod
+    def _strip(acc: np.ndarray, threshold: float) -> np.ndarray:
+        """去掉首尾绝对值不超过 threshold 的样本"""
+        idx = np.flatnonzero(np.abs(acc) > threshold)
+        return acc[idx[0]:idx[-1] + 1] if len(idx) else acc[:0]
+
+    @staticmethod
+    def _close(a: np.ndarray, b: np.ndarray, atol: float) -> bool:
+        """去掉首尾近零段后逐点比较，差值均不超过 atol 为真
+
+        阈值附近的样本可能在一份拷贝中被去掉而在另一份中保留，因此允许
+        两者错开一个样本；错开或长度不同多出的样本按与零比较。
+        """
+        a = RecordDedup._strip(a, atol / 2)
+        b = RecordDedup._strip(b, atol / 2)
+        if abs(len(a) - len(b)) > 2:
+            return False
+        for shift in (0, 1, -1):
+            x, y = (a, b) if shift >= 0 else (b, a)
+            head, x = x[:abs(shift)], x[abs(shift):]
+            n = min(len(x), len(y))
+            if max(np.max(np.abs(head), initial=0.0),
+                   np.max(np.abs(x[:n] - y[:n]), initial=0.0),
+                   np.max(np.abs(x[n:]), initial=0.0),
+                   np.max(np.abs(y[n:]), initial=0.0)) <= atol:
+                return True
+        return False
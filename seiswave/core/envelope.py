@@ -0,0 +1,201 @@
+"""
+时域包络函数模块
+
+人工波生成用的强度包络（非平稳调制函数），全部向量化计算：
+- trapezoidal:   三段式（二次上升 → 平稳 → 指数衰减），按总时长比例定义，
+                 WaveGenerator 的默认包络
+- saragoni_hart: Saragoni & Hart (1974) 形式 a·t^b·e^(-ct)，参数按 Boore (2003)
+                 由峰值位置 ε 与末端幅值 η 确定
+- jennings:      Jennings, Housner & Tsai (1968) 三段式，t1、t2、c 以秒为单位，
+                 便于直接使用按震级/距离统计的参数表
+- evolutionary:  时频演化包络，按频带分别施加 Saragoni-Hart 包络，
+                 高频段峰值更早、衰减更快
+
+包络按 (shape, n, dt, params) 缓存，返回只读数组，批量生成和迭代中不重复构建。
+"""
+
+import numpy as np
+from functools import lru_cache
+
+
+class Envelope:
+    """强度包络函数"""
+
+    SHAPES = ('trapezoidal', 'saragoni_hart', 'jennings', 'evolutionary')
+
+    # 各形状的默认参数
+    DEFAULTS = {
+        'trapezoidal': {'rise': 0.1, 'strong': 0.5, 'decay': 3.0},
+        'saragoni_hart': {'eps': 0.2, 'eta': 0.05},
+        'jennings': {'t1': None, 't2': None, 'c': None},
+        'evolutionary': {'eps': 0.2, 'eta': 0.05, 'n_bands': 6,
+                         'f_min': 0.2, 'f_ref': 2.0, 'slope': 0.3},
+    }
+
+    @staticmethod
+    def compute(shape: str, n: int, dt: float, **params) -> np.ndarray:
+        """计算包络
+
+        Parameters
+        ----------
+        shape : str
+            包络形状，见 Envelope.SHAPES
+        n : int
+            数据点数
+        dt : float
+            时间步长 (s)
+        **params
+            形状参数，未给出的取 Envelope.DEFAULTS：
+            - trapezoidal: rise、strong 为上升段、平稳段占总时长比例，
+              decay 为衰减段末端的指数（末端幅值 e^-decay）
+            - saragoni_hart: eps 为峰值时刻占总时长比例，eta 为末端幅值
+            - jennings: t1、t2 为平稳段起止时刻 (s)，c 为衰减系数 (1/s)，
+              缺省时取总时长的 10%、60% 及 3 / (总时长 - t2)
+            - evolutionary: 在 saragoni_hart 参数基础上，n_bands 为频带数，
+              f_min 为最低频带下限 (Hz)，第 k 频带的峰值比例为
+              eps·(f_ref / f_k)^slope（限制在 0.05~0.6）
+
+        Returns
+        -------
+        np.ndarray
+            只读数组，形状 (n,)；evolutionary 为 (n_bands, n)
+        """
+        return Envelope._cached(shape, n, float(dt), Envelope._key(shape, params))[0]
+
+    @staticmethod
+    def apply(acc: np.ndarray, dt: float, shape: str = 'trapezoidal',
+              **params) -> np.ndarray:
+        """对加速度时程施加包络
+
+        Parameters
+        ----------
+        acc : np.ndarray
+            加速度时程，形状 (n,) 或 (m, n)
+        dt : float
+            时间步长 (s)
+        shape : str
+            包络形状
+        **params
+            形状参数，同 compute()
+
+        Returns
+        -------
+        np.ndarray
+            施加包络后的时程（新数组）。evolutionary 先用频域划分将时程分解为
+            各频带分量（各频带权重之和为 1），分别乘以对应包络后求和。
+        """
+        acc = np.asarray(acc, dtype=np.float64)
+        n = acc.shape[-1]
+        env, bands = Envelope._cached(shape, n, float(dt), Envelope._key(shape, params))
+        if bands is None:
+            return acc * env
+
+        af = np.fft.rfft(acc, axis=-1)
+        parts = np.fft.irfft(af[..., None, :] * bands, n, axis=-1)
+        return np.sum(parts * env, axis=-2)
+
+    # ──────────────────── 缓存 ────────────────────
+
+    @staticmethod
+    def _key(shape: str, params: dict) -> tuple:
+        if shape not in Envelope.DEFAULTS:
+            raise ValueError(
+                f"未知的包络形状: '{shape}'. 可选值: {list(Envelope.SHAPES)}"
+            )
+        defaults = Envelope.DEFAULTS[shape]
+        unknown = set(params) - set(defaults)
+        if unknown:
+            raise ValueError(
+                f"包络 '{shape}' 不支持参数: {sorted(unknown)}. 可选值: {list(defaults)}"
+            )
+        merged = {**defaults, **params}
+        return tuple(sorted(merged.items()))
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _cached(shape: str, n: int, dt: float, key: tuple) -> tuple:
+        """(包络, 频带权重)；非 evolutionary 的频带权重为 None"""
+        params = dict(key)
+        t = np.arange(n) * dt
+        t_total = max((n - 1) * dt, dt)
+        bands = None
+
+        if shape == 'trapezoidal':
+            env = Envelope._trapezoidal(t, t_total, **params)
+        elif shape == 'saragoni_hart':
+            env = Envelope._saragoni_hart(t, t_total, **params)
+        elif shape == 'jennings':
+            env = Envelope._jennings(t, t_total, **params)
+        else:
+            env, bands = Envelope._evolutionary(t, t_total, n, dt, **params)
+            bands.flags.writeable = False
+
+        env.flags.writeable = False
+        return env, bands
+
+    # ──────────────────── 形状 ────────────────────
+
+    @staticmethod
+    def _trapezoidal(t, t_total, rise, strong, decay):
+        t_rise = t_total * rise
+        t_strong = t_total * strong
+        t_decay = t_total - t_rise - t_strong
+
+        env = np.ones_like(t)
+        up = t <= t_rise
+        env[up] = (t[up] / t_rise) ** 2
+        down = t > t_rise + t_strong
+        env[down] = np.exp(-decay * (t[down] - t_rise - t_strong) / t_decay)
+        return env
+
+    @staticmethod
+    def _saragoni_hart(t, t_total, eps, eta):
+        # Boore (2003) 式 (7)：峰值位于 eps·T，t = T 时幅值为 eta，峰值归一化为 1
+        b = -eps * np.log(eta) / (1.0 + eps * (np.log(eps) - 1.0))
+        x = t / (eps * t_total)
+        with np.errstate(divide='ignore'):
+            return np.exp(b * (1.0 + np.log(x) - x)) * (x > 0)
+
+    @staticmethod
+    def _jennings(t, t_total, t1, t2, c):
+        t1 = 0.1 * t_total if t1 is None else t1
+        t2 = 0.6 * t_total if t2 is None else t2
+        if not 0 < t1 <= t2:
+            raise ValueError(f"Jennings 包络要求 0 < t1 ≤ t2，当前 t1={t1}, t2={t2}")
+        if c is None:
+            c = 3.0 / max(t_total - t2, t_total * 1e-3)
+
+        env = np.ones_like(t)
+        up = t < t1
+        env[up] = (t[up] / t1) ** 2
+        down = t > t2
+        env[down] = np.exp(-c * (t[down] - t2))
+        return env
+
+    @staticmethod
+    def _evolutionary(t, t_total, n, dt, eps, eta, n_bands, f_min, f_ref, slope):
+        freqs = np.fft.rfftfreq(n, dt)
+        f_max = freqs[-1]
+        if not 0 < f_min < f_max:
+            raise ValueError(f"f_min={f_min} Hz 须在 (0, {f_max:g}) Hz 之间")
+
+        # 对数频率上的三角形划分，权重之和处处为 1
+        centers = np.geomspace(f_min, f_max, n_bands)
+        x = np.log(np.clip(freqs, f_min, f_max))
+        xc = np.log(centers)
+        bands = np.zeros((n_bands, len(freqs)))
+        for k in range(n_bands):
+            if k > 0:
+                left = (x - xc[k - 1]) / (xc[k] - xc[k - 1])
+                sel = (x >= xc[k - 1]) & (x <= xc[k])
+                bands[k, sel] = left[sel]
+            if k < n_bands - 1:
+                right = (xc[k + 1] - x) / (xc[k + 1] - xc[k])
+                sel = (x >= xc[k]) & (x < xc[k + 1])
+                bands[k, sel] = right[sel]
+        bands[0, x <= xc[0]] = 1.0
+        bands[-1, x >= xc[-1]] = 1.0
+
+        eps_k = np.clip(eps * (f_ref / centers) ** slope, 0.05, 0.6)
+        env = np.vstack([Envelope._saragoni_hart(t, t_total, e, eta) for e in eps_k])
+        return env, bands
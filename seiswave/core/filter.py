@@ -132,6 +132,13 @@ class Filter:
         np.ndarray
             滤波后的加速度
         """
+        wn = Filter._butter_wn(dt, ftype, freqs)
+        b, a = signal.butter(order, wn, btype=ftype)
+        return signal.filtfilt(b, a, acc)
+
+    @staticmethod
+    def _butter_wn(dt: float, ftype: str, freqs):
+        """Butterworth 归一化截止频率（freqs 为 None 时取默认值）"""
         nyq = 0.5 / dt
 
         if ftype == 'bandpass':
@@ -151,9 +158,7 @@ class Filter:
             wn = freq / nyq
         else:
             raise ValueError(f"未知的滤波类型: {ftype}")
-
-        b, a = signal.butter(order, wn, btype=ftype)
-        return signal.filtfilt(b, a, acc)
+        return wn
 
     @staticmethod
     def fft_filter(acc: np.ndarray, dt: float,
@@ -186,3 +191,34 @@ class Filter:
         mask[np.abs(freqs) > cutoff_high] = 0
 
         return np.real(np.fft.ifft(fft_result * mask))
+
+
+class StreamingFilter:
+    """分段连续的 Butterworth 因果滤波
+
+    以二阶节（SOS）形式滤波并在段间保留滤波器状态，逐段送入的结果与对
+    整条记录一次性 sosfilt 完全一致，适合配合 RecordStream 处理超长记录。
+    零相位的 Filter.butterworth（filtfilt）需要整条记录反向滤波，无法分段；
+    本类为单向滤波，输出有相位滞后。
+    """
+
+    def __init__(self, dt: float, ftype: str = 'bandpass', order: int = 4, freqs=None):
+        """
+        Parameters
+        ----------
+        dt, ftype, order, freqs
+            同 Filter.butterworth()
+        """
+        wn = Filter._butter_wn(dt, ftype, freqs)
+        self.sos = signal.butter(order, wn, btype=ftype, output='sos')
+        self.reset()
+
+    def reset(self) -> None:
+        """清零滤波器状态，从新记录开始"""
+        self.zi = np.zeros((self.sos.shape[0], 2))
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """滤波下一段数据（与上一段首尾相接）"""
+        out, self.zi = signal.sosfilt(self.sos, np.asarray(chunk, dtype=np.float64),
+                                      zi=self.zi)
+        return out
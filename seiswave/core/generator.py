@@ -13,8 +13,34 @@
 """
 
 import numpy as np
+from dataclasses import dataclass, field
 from typing import Optional, Callable
 
+from .envelope import Envelope
+
+# 单次调整比的范围
+RATIO_MIN = 0.5
+RATIO_MAX = 2.0
+
+# 自适应增益（调整比指数）：偏差符号不变时乘 GAIN_UP，反号（过调）时乘 GAIN_DOWN
+GAIN_UP = 1.3
+GAIN_DOWN = 0.5
+GAIN_MIN = 0.2
+GAIN_MAX = 3.0
+
+# 堆叠拟合每块计算反应谱的行数，控制 (行, 周期, nfft) 中间数组的内存
+FIT_CHUNK = 32
+
+
+@dataclass
+class FitReport:
+    """单条人工波的谱拟合报告"""
+    converged: bool                          # 最大偏差是否达到 tol
+    iterations: int                          # 反应谱计算次数
+    max_error: float                         # 最优结果的最大相对偏差
+    mean_error: float                        # 最优结果的均方根相对偏差
+    history: list = field(default_factory=list)  # 逐次迭代 (最大偏差, 均方根偏差)
+
 
 class WaveGenerator:
     """人工地震波生成器"""
@@ -23,27 +49,36 @@ class WaveGenerator:
     def generate(target_spectrum: np.ndarray, periods: np.ndarray,
                  n: int = 4096, dt: float = 0.02, zeta: float = 0.05,
                  pga: float = 1.0, tol: float = 0.05, max_iter: int = 50,
-                 progress_callback: Optional[Callable] = None):
+                 progress_callback: Optional[Callable] = None,
+                 envelope: Optional[str] = 'trapezoidal',
+                 envelope_params: Optional[dict] = None,
+                 adaptive: bool = False, patience: Optional[int] = None,
+                 initial=None, return_report: bool = False):
         """基于目标反应谱迭代生成人工地震波
 
         算法流程（移植自 EQSignal C++ fitSP）：
-        1. 生成初始白噪声，施加包络函数
+        1. 生成初始白噪声，施加包络函数（或由 initial 暖启动）
         2. 计算当前波的反应谱
-        3. 在频域按 target/current 比值调整振幅谱
-        4. 重复 2-3 直到收敛（最大偏差 ≤ tol）或达到最大迭代次数
+        3. 在频域按 target/current 调整振幅谱（adaptive=True 时为 (target/current)^g）
+        4. 重复 2-3 直到收敛（最大偏差 ≤ tol）、停滞或达到最大迭代次数
 
         Parameters
         ----------
         target_spectrum : np.ndarray
-            目标反应谱值（与 periods 对应的 Sa 值）
+            目标反应谱值（与 periods 对应的 Sa 值）；多阻尼比同时拟合时为
+            (n_zeta, n_periods) 数组，第 k 行对应 zeta[k]
         periods : np.ndarray
             周期数组 (s)
         n : int
             输出波形点数
         dt : float
             时间步长 (s)
-        zeta : float
-            阻尼比
+        zeta : float or sequence of float
+            阻尼比；给出多个时每次迭代由同一条波同时计算全部阻尼比的反应谱，
+            各周期点的调整比取各阻尼比调整比对数的极值中点（使该点最大偏差最小），
+            误差取全部阻尼比的最大值。
+            规范谱不同阻尼比之间的比值与实际波并不严格一致，可达到的容差一般
+            大于单阻尼比拟合
         pga : float
             目标 PGA
         tol : float
@@ -52,122 +87,368 @@ class WaveGenerator:
             最大迭代次数
         progress_callback : callable, optional
             进度回调 fn(iteration, max_error, mean_error)
+        envelope : str or None
+            包络形状，见 Envelope.SHAPES；None 表示迭代中不施加包络
+            （以实际记录暖启动时可保留其原有包络）
+        envelope_params : dict, optional
+            包络参数，见 Envelope.compute
+        adaptive : bool
+            是否使用自适应增益（逐周期点，过调时减小、欠调时增大）。
+            多随机流对比中未见收敛加快，默认关闭
+        patience : int, optional
+            连续 patience 次迭代最优误差相对下降不足 1% 时提前停止
+        initial : EQSignal, EQRecord or np.ndarray, optional
+            暖启动波形（如已生成的人工波或选出的实际记录），代替白噪声作为初始波；
+            给定时 n 取其长度，有 dt 属性时 dt 亦取自 initial
+        return_report : bool
+            为 True 时同时返回 FitReport（含逐次迭代误差 history）
 
         Returns
         -------
-        EQSignal
+        EQSignal or tuple[EQSignal, FitReport]
             生成的人工地震波
         """
         from .signal import EQSignal
-        from .spectrum import Spectra
 
         target_spectrum = np.asarray(target_spectrum, dtype=np.float64)
         periods = np.asarray(periods, dtype=np.float64)
 
-        # Step 1: 生成初始白噪声 + 包络
-        acc = np.random.randn(n)
-        envelope = WaveGenerator._envelope(n, dt)
-        acc *= envelope
+        # Step 1: 生成初始白噪声，或取暖启动波形
+        if initial is None:
+            noise = np.random.randn(n)
+        elif isinstance(initial, np.ndarray):
+            noise = np.asarray(initial, dtype=np.float64)
+        else:
+            noise = np.asarray(initial.acc, dtype=np.float64)
+            dt = getattr(initial, 'dt', dt)
+
+        def fit_cb(iteration, max_err, mean_err):
+            progress_callback(iteration, float(max_err[0]), float(mean_err[0]))
 
-        # 缩放到目标 PGA
-        peak = np.max(np.abs(acc))
-        if peak > 0:
-            acc *= pga / peak
+        acc, reports = WaveGenerator._fit(
+            noise[None, :], target_spectrum, periods, dt, zeta, pga, tol,
+            max_iter, fit_cb if progress_callback else None,
+            envelope, envelope_params, adaptive, patience,
+            warm=initial is not None,
+        )
 
-        nfft = 1 << int(np.ceil(np.log2(n)))
+        result = EQSignal(acc[0], dt, name="artificial")
+        result.a2vd()
+        if return_report:
+            return result, reports[0]
+        return result
+
+    @staticmethod
+    def generate_batch(count: int, target_spectrum: np.ndarray, periods: np.ndarray,
+                       n: int = 4096, dt: float = 0.02, zeta: float = 0.05,
+                       pga: float = 1.0, tol: float = 0.05, max_iter: int = 50,
+                       seed=None,
+                       progress_callback: Optional[Callable] = None,
+                       envelope: Optional[str] = 'trapezoidal',
+                       envelope_params: Optional[dict] = None,
+                       adaptive: bool = False,
+                       patience: Optional[int] = None) -> tuple:
+        """批量生成多条人工地震波
+
+        每条波使用由 np.random.SeedSequence(seed).spawn(count) 派生的独立随机流，
+        给定 seed 时结果可复现，且第 i 条波与 count 无关。所有波堆叠为
+        (count, n) 数组同步迭代，已收敛的波不再调整。
+
+        Parameters
+        ----------
+        count : int
+            生成条数
+        target_spectrum, periods, n, dt, zeta, pga, tol, max_iter
+            同 generate()
+        envelope, envelope_params, adaptive, patience
+            同 generate()
+        seed : int or np.random.SeedSequence, optional
+            根种子
+        progress_callback : callable, optional
+            进度回调 fn(iteration, n_converged, count)
+
+        Returns
+        -------
+        tuple[list[EQSignal], list[FitReport]]
+            生成的人工波及各自的收敛报告
+        """
+        from .signal import EQSignal
+
+        target_spectrum = np.asarray(target_spectrum, dtype=np.float64)
+        periods = np.asarray(periods, dtype=np.float64)
+
+        root = seed if isinstance(seed, np.random.SeedSequence) \
+            else np.random.SeedSequence(seed)
+        streams = root.spawn(count)
+        noise = np.vstack([np.random.default_rng(ss).standard_normal(n)
+                           for ss in streams]) if count else np.zeros((0, n))
+
+        def fit_cb(iteration, max_err, mean_err):
+            progress_callback(iteration, int(np.sum(max_err <= tol)), count)
+
+        acc, reports = WaveGenerator._fit(
+            noise, target_spectrum, periods, dt, zeta, pga, tol,
+            max_iter, fit_cb if progress_callback else None,
+            envelope, envelope_params, adaptive, patience,
+        )
+
+        signals = []
+        for i in range(count):
+            sig = EQSignal(acc[i], dt, name=f"artificial_{i + 1}")
+            sig.a2vd()
+            signals.append(sig)
+        return signals, reports
 
-        # 构建周期到频率的映射（用于频域调整）
-        freq_target = 1.0 / periods  # 目标频率点
+    @staticmethod
+    def match(signal, target_spectrum: np.ndarray, periods: np.ndarray,
+              zeta: float = 0.05, tol: float = 0.05, max_iter: int = 20,
+              gain: float = 0.5, progress_callback: Optional[Callable] = None):
+        """时域小波法谱匹配：在实际记录上叠加修正小波逼近目标谱
+
+        与 generate() 的频域振幅调整不同，本方法只在各周期反应峰值时刻附近
+        叠加改进的渐缩余弦小波（Al Atik & Abrahamson, 2010），保留原记录的
+        相位与非平稳特性。每次迭代：
+        1. 计算各周期绝对加速度响应的峰值时刻 t_i 与峰值
+        2. 组装小波影响矩阵 C[i, j]（小波 j 在振子 i 的 t_i 时刻产生的响应）
+        3. 求解 C·b = ΔR 得到各小波幅值，按 gain 松弛后叠加到加速度时程
+
+        振子脉冲响应与小波形状只依赖 (n, dt, periods, zeta)，在迭代前预计算一次。
+        输入记录宜先整体缩放到目标谱水平，小波只负责修正谱形。
+
+        Parameters
+        ----------
+        signal : EQSignal or EQRecord
+            待匹配的地震波（需有 acc, dt, name 属性）
+        target_spectrum : np.ndarray
+            目标反应谱值（与 periods 对应的 Sa 值，单位同 signal.acc）
+        periods : np.ndarray
+            周期数组 (s)
+        zeta : float
+            阻尼比
+        tol : float
+            收敛容差（最大相对偏差）
+        max_iter : int
+            最大迭代次数
+        gain : float
+            松弛系数（0~1）。峰值时刻随修正漂移使问题非线性，取 1 易振荡
+        progress_callback : callable, optional
+            进度回调 fn(iteration, max_error, mean_error)
+
+        Returns
+        -------
+        EQSignal
+            匹配后的地震波（不重新缩放 PGA）
+        """
+        from .signal import EQSignal
+        from .spectrum import NewmarkOperator
+
+        target_spectrum = np.asarray(target_spectrum, dtype=np.float64)
+        periods = np.asarray(periods, dtype=np.float64)
+        acc = np.array(signal.acc, dtype=np.float64)
+        n, dt = len(acc), signal.dt
+
+        operator = NewmarkOperator(n, dt, periods, zeta)
+        basis = _WaveletBasis(periods, zeta, n, dt)
+        lags = np.arange(n)
 
-        converged = False
         best_acc = acc.copy()
-        best_error = float('inf')
+        best_error = np.inf
 
         for iteration in range(max_iter):
-            # Step 2: 计算当前波的反应谱
-            sp = Spectra.compute(acc, dt, periods, zeta=zeta, method="newmark")
-            current_sa = sp.sa
-
-            # 计算误差
-            errors = WaveGenerator.fit_error(current_sa, target_spectrum)
-            max_err = errors['max_error']
-            mean_err = errors['mean_error']
+            response = operator.response(acc)
+            t_peak = np.argmax(np.abs(response), axis=-1)
+            peak = response[np.arange(len(periods)), t_peak]
+            current_sa = np.abs(peak)
 
+            max_err, mean_err = WaveGenerator._errors(current_sa, target_spectrum)
             if progress_callback:
-                progress_callback(iteration + 1, max_err, mean_err)
+                progress_callback(iteration + 1, float(max_err), float(mean_err))
 
-            # 记录最优结果
             if max_err < best_error:
                 best_error = max_err
                 best_acc = acc.copy()
-
-            # 检查收敛
             if max_err <= tol:
-                converged = True
                 break
 
-            # Step 3: 频域调整
-            acc = WaveGenerator._adjust_spectrum(
-                acc, dt, periods, zeta, target_spectrum, current_sa, nfft
-            )
+            # 峰值处的目标修正量（保持峰值符号）
+            delta = (target_spectrum - current_sa) * np.sign(peak)
 
-            # 重新施加包络并缩放 PGA
-            acc[:n] *= envelope
-            peak = np.max(np.abs(acc[:n]))
-            if peak > 0:
-                acc[:n] *= pga / peak
+            # C[i, j] = Σ_k h_i[t_i - k]·w_j[k]
+            idx = t_peak[:, None] - lags
+            h_rev = np.where(idx >= 0,
+                             np.take_along_axis(operator.h, np.maximum(idx, 0), axis=-1),
+                             0.0)
+            wavelets = basis.place(t_peak)
+            C = h_rev @ wavelets.T
 
-        # 使用最优结果
-        if not converged:
-            acc = best_acc
+            # 峰值时刻相近的短周期小波几乎共线，C 病态：加 Tikhonov 正则
+            CtC = C.T @ C
+            reg = 1e-4 * np.trace(CtC) / len(periods)
+            b = np.linalg.solve(CtC + reg * np.eye(len(periods)), C.T @ delta)
+            acc = acc + gain * (b @ wavelets)
 
-        result = EQSignal(acc[:n], dt, name="artificial")
+        result = EQSignal(best_acc, dt, name=f"{signal.name}_matched")
         result.a2vd()
         return result
 
     @staticmethod
-    def _envelope(n: int, dt: float) -> np.ndarray:
-        """时域包络函数（梯形包络）
-
-        三段式：上升段（二次）→ 平稳段 → 衰减段（指数）
+    def _fit(noise: np.ndarray, target_spectrum: np.ndarray, periods: np.ndarray,
+             dt: float, zeta: float, pga: float, tol: float, max_iter: int,
+             callback: Optional[Callable] = None,
+             envelope: Optional[str] = 'trapezoidal',
+             envelope_params: Optional[dict] = None,
+             adaptive: bool = False, patience: Optional[int] = None,
+             warm: bool = False) -> tuple:
+        """对堆叠的 (m, n) 初始波形同步执行迭代谱拟合
 
         Parameters
         ----------
-        n : int
-            数据点数
-        dt : float
-            时间步长
+        noise : np.ndarray
+            初始波形 (m, n)；warm=False 时为白噪声，先施加包络
+        adaptive : bool
+            自适应增益：各行各周期点的调整比取 ratio^g，该点偏差符号与上次相同
+            （欠调）时 g 乘 GAIN_UP，反号（过调）时乘 GAIN_DOWN，ratio^g 仍限制在
+            [RATIO_MIN, RATIO_MAX]；False 时 g 恒为 1（原 fitSP 更新）
+        patience : int, optional
+            连续 patience 次迭代最优误差相对下降不足 1% 时提前停止该行；None 不提前停止
+        warm : bool
+            暖启动：noise 为已有波形，初始不再施加包络
 
         Returns
         -------
-        np.ndarray
-            包络函数
+        tuple[np.ndarray, list[FitReport]]
+            各行的最优波形与收敛报告
         """
-        t_total = (n - 1) * dt
-        t_rise = t_total * 0.1     # 上升段 10%
-        t_strong = t_total * 0.5   # 平稳段 50%
-        t_decay = t_total - t_rise - t_strong  # 衰减段
-
-        env = np.zeros(n)
-        t = np.arange(n) * dt
-
-        for i in range(n):
-            ti = t[i]
-            if ti <= t_rise:
-                env[i] = (ti / t_rise) ** 2
-            elif ti <= t_rise + t_strong:
-                env[i] = 1.0
-            else:
-                decay_t = ti - t_rise - t_strong
-                env[i] = np.exp(-3.0 * decay_t / t_decay)
-
-        return env
+        from .spectrum import NewmarkOperator
+
+        m, n = noise.shape
+        target_spectrum, zetas = WaveGenerator._targets(target_spectrum, periods, zeta)
+        n_periods = len(periods)
+
+        # 施加包络并缩放到目标 PGA（包络按参数缓存，迭代中不重复构建）
+        env_params = envelope_params or {}
+
+        def modulate(x):
+            if envelope is None:
+                return x
+            return Envelope.apply(x, dt, envelope, **env_params)
+
+        acc = WaveGenerator._scale_pga(noise if warm else modulate(noise), pga)
+
+        nfft = 1 << int(np.ceil(np.log2(n)))
+
+        # 周期点 → FFT 频率点的插值网格只构建一次
+        adjuster = _SpectrumAdjuster(periods, dt, nfft)
+
+        # n、dt、periods、zeta 在迭代中不变，Newmark 响应算子只构建一次；
+        # 多个阻尼比的周期点拼接进同一个算子，每次迭代一次 FFT 同时得到全部反应谱
+        operator = NewmarkOperator(n, dt, np.tile(periods, len(zetas)),
+                                   np.repeat(zetas, n_periods))
+
+        best_acc = acc.copy()
+        best_error = np.full(m, np.inf)
+        best_mean = np.full(m, np.inf)
+        iterations = np.zeros(m, dtype=int)
+        active = np.ones(m, dtype=bool)
+        max_err = np.full(m, np.inf)
+        mean_err = np.full(m, np.inf)
+        gain = np.ones((m, n_periods))
+        prev_sign = np.zeros((m, n_periods))
+        stale = np.zeros(m, dtype=int)
+        history = [[] for _ in range(m)]
+
+        for iteration in range(max_iter):
+            if not np.any(active):
+                break
+            rows = np.flatnonzero(active)
+
+            # Step 2: 计算当前波的反应谱（分块，同 check_compatibility）
+            current_sa = np.concatenate([
+                operator.sa(acc[rows[start:start + FIT_CHUNK]])
+                for start in range(0, len(rows), FIT_CHUNK)
+            ]).reshape((len(rows),) + target_spectrum.shape)
+
+            # 计算误差（多阻尼比时取全部阻尼比的周期点）
+            max_err[rows], mean_err[rows] = WaveGenerator._errors(
+                current_sa.reshape(len(rows), -1), target_spectrum.ravel())
+            iterations[rows] = iteration + 1
+            for i in rows:
+                history[i].append((float(max_err[i]), float(mean_err[i])))
+
+            if callback:
+                callback(iteration + 1, max_err, mean_err)
+
+            # 记录最优结果；最优误差停滞计数
+            improved = max_err[rows] < best_error[rows] * 0.99
+            stale[rows] = np.where(improved, 0, stale[rows] + 1)
+            better = rows[max_err[rows] < best_error[rows]]
+            best_error[better] = max_err[better]
+            best_mean[better] = mean_err[better]
+            best_acc[better] = acc[better]
+
+            # 自适应增益
+            if adaptive:
+                sign = np.sign(np.log(WaveGenerator._ratio(target_spectrum, current_sa)))
+                same = (sign == prev_sign[rows]) | (prev_sign[rows] == 0)
+                gain[rows] = np.where(same,
+                                      np.minimum(gain[rows] * GAIN_UP, GAIN_MAX),
+                                      np.maximum(gain[rows] * GAIN_DOWN, GAIN_MIN))
+                prev_sign[rows] = sign
+
+            # 检查收敛与停滞：这些行不再调整
+            active[rows[max_err[rows] <= tol]] = False
+            if patience is not None:
+                active[rows[stale[rows] >= patience]] = False
+            keep = active[rows]
+            rows = rows[keep]
+            if not len(rows):
+                break
+
+            # Step 3: 频域调整
+            adjusted = WaveGenerator._adjust_spectrum(
+                acc[rows], target_spectrum, current_sa[keep], adjuster,
+                gain[rows] if adaptive else None,
+            )
+
+            # 重新施加包络并缩放 PGA
+            acc[rows] = WaveGenerator._scale_pga(modulate(adjusted), pga)
+
+        reports = [
+            FitReport(
+                converged=bool(best_error[i] <= tol),
+                iterations=int(iterations[i]),
+                max_error=float(best_error[i]),
+                mean_error=float(best_mean[i]),
+                history=history[i],
+            )
+            for i in range(m)
+        ]
+        return best_acc, reports
+
+    @staticmethod
+    def _scale_pga(acc: np.ndarray, pga: float) -> np.ndarray:
+        """逐行缩放到目标 PGA（全零行保持不变）"""
+        peak = np.max(np.abs(acc), axis=-1, keepdims=True)
+        return acc * np.where(peak > 0, pga / np.where(peak > 0, peak, 1.0), 1.0)
+
+    @staticmethod
+    def _errors(actual: np.ndarray, target: np.ndarray) -> tuple:
+        """批量相对偏差：返回各行 (最大偏差, 均方根偏差)，定义同 fit_error"""
+        valid = target > 1e-30
+        safe = np.where(valid, target, 1.0)
+        re = np.where(valid, np.abs(actual - target) / safe, 0.0)
+        return np.max(re, axis=-1), np.sqrt(np.mean(re ** 2, axis=-1))
+
+    @staticmethod
+    def _envelope(n: int, dt: float) -> np.ndarray:
+        """时域包络函数（梯形包络，见 Envelope.compute）"""
+        return Envelope.compute('trapezoidal', n, dt)
 
     @staticmethod
-    def _adjust_spectrum(acc: np.ndarray, dt: float,
-                         periods: np.ndarray, zeta: float,
-                         target: np.ndarray, current: np.ndarray,
-                         nfft: int) -> np.ndarray:
+    def _adjust_spectrum(acc: np.ndarray, target: np.ndarray,
+                         current: np.ndarray,
+                         adjuster: '_SpectrumAdjuster',
+                         gain: Optional[np.ndarray] = None) -> np.ndarray:
         """频域谱调整
 
         对每个频率点，按 target_sa / current_sa 的比值调整振幅谱，
@@ -176,73 +457,60 @@ class WaveGenerator:
         Parameters
         ----------
         acc : np.ndarray
-            当前加速度时程
-        dt : float
-            时间步长
-        periods : np.ndarray
-            周期数组
-        zeta : float
-            阻尼比
+            当前加速度时程，形状 (n,) 或 (m, n)
         target : np.ndarray
-            目标反应谱值
+            目标反应谱值 (n_periods,)，多阻尼比拟合时为 (n_zeta, n_periods)
         current : np.ndarray
-            当前反应谱值
-        nfft : int
-            FFT 点数
+            当前反应谱值，形状为 acc 的批量维度 + target 的形状
+        adjuster : _SpectrumAdjuster
+            本次生成预计算的频率插值网格
+        gain : np.ndarray, optional
+            各行各周期点的调整比指数（自适应增益），None 表示 1
 
         Returns
         -------
         np.ndarray
             调整后的加速度时程
         """
-        n = len(acc)
+        ratio = WaveGenerator._ratio(target, current)
+        if gain is not None:
+            # 增益只改变步长，单次调整比仍限制在 _ratio 的范围内
+            ratio = np.clip(ratio ** gain, RATIO_MIN, RATIO_MAX)
+
+        return adjuster.apply(acc, ratio)
+
+    @staticmethod
+    def _ratio(target: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """各周期点的调整比 target / current，限制在 [0.5, 2.0]
 
-        # 计算调整比
-        ratio = np.ones_like(target)
-        for i in range(len(periods)):
-            if current[i] > 1e-30:
-                ratio[i] = target[i] / current[i]
-            else:
-                ratio[i] = 1.0
+        target 为二维（多阻尼比）时，取各阻尼比调整比对数最大、最小值的中点，
+        即同一次振幅谱调整下使该周期点各阻尼比最大偏差最小的比值。
+        """
+        safe = np.where(current > 1e-30, current, 1.0)
+        ratio = np.where(current > 1e-30, target / safe, 1.0)
 
         # 限制单次调整幅度，避免振荡
-        ratio = np.clip(ratio, 0.5, 2.0)
-
-        # FFT
-        acc_padded = np.zeros(nfft)
-        acc_padded[:n] = acc
-        af = np.fft.fft(acc_padded)
-
-        # 频率数组
-        freqs = np.fft.fftfreq(nfft, dt)
-        freq_target = 1.0 / periods  # 周期对应的频率
-
-        # 将调整比从周期点插值到所有频率点
-        # 按频率排序
-        sort_idx = np.argsort(freq_target)
-        freq_sorted = freq_target[sort_idx]
-        ratio_sorted = ratio[sort_idx]
-
-        # 对正频率部分插值
-        pos_mask = freqs > 0
-        pos_freqs = np.abs(freqs[pos_mask])
-
-        adjustment = np.interp(pos_freqs, freq_sorted, ratio_sorted,
-                               left=ratio_sorted[0], right=ratio_sorted[-1])
-
-        # 应用调整（保持相位）
-        af_new = af.copy()
-        pos_indices = np.where(pos_mask)[0]
-        for idx, adj in zip(pos_indices, adjustment):
-            af_new[idx] *= adj
-            # 保持共轭对称
-            conj_idx = nfft - idx
-            if conj_idx < nfft:
-                af_new[conj_idx] = np.conj(af_new[idx])
-
-        # IFFT
-        result = np.real(np.fft.ifft(af_new))[:n]
-        return result
+        ratio = np.clip(ratio, RATIO_MIN, RATIO_MAX)
+        if np.ndim(target) == 2:
+            log_r = np.log(ratio)
+            ratio = np.exp(0.5 * (np.min(log_r, axis=-2) + np.max(log_r, axis=-2)))
+        return ratio
+
+    @staticmethod
+    def _targets(target_spectrum, periods: np.ndarray, zeta) -> tuple:
+        """整理 (阻尼比, 目标谱) 组：返回 target (n_periods,) 或 (n_zeta, n_periods) 与阻尼比数组"""
+        target = np.asarray(target_spectrum, dtype=np.float64)
+        zetas = np.atleast_1d(np.asarray(zeta, dtype=np.float64))
+        if target.ndim == 1 and len(zetas) == 1:
+            expected = (len(periods),)
+        else:
+            expected = (len(zetas), len(periods))
+        if target.shape != expected:
+            raise ValueError(
+                f"目标谱形状 {target.shape} 与阻尼比个数 {len(zetas)}、"
+                f"周期点数 {len(periods)} 不一致，应为 {expected}"
+            )
+        return target, zetas
 
     @staticmethod
     def fit_error(actual: np.ndarray, target: np.ndarray) -> dict:
@@ -266,11 +534,10 @@ class WaveGenerator:
                 'cv': 变异系数
             }
         """
-        n = len(target)
-        re = np.zeros(n)
-        for i in range(n):
-            if target[i] > 1e-30:
-                re[i] = abs(actual[i] - target[i]) / target[i]
+        actual = np.asarray(actual, dtype=np.float64)
+        target = np.asarray(target, dtype=np.float64)
+        valid = target > 1e-30
+        re = np.where(valid, np.abs(actual - target) / np.where(valid, target, 1.0), 0.0)
 
         e_max = float(np.max(re))
         e_mean = float(np.sqrt(np.mean(re ** 2)))
@@ -287,3 +554,73 @@ class WaveGenerator:
             'mean_error': e_mean,
             'cv': cv,
         }
+
+
+class _SpectrumAdjuster:
+    """频域谱调整的预计算网格
+
+    rfft 正频率点（不含直流与 Nyquist）相对于周期点频率的线性插值
+    下标与权重只依赖 (periods, dt, nfft)，每次生成构建一次，
+    每次迭代只需一次 rfft、一次向量乘法和一次 irfft。
+    """
+
+    def __init__(self, periods: np.ndarray, dt: float, nfft: int):
+        freq = 1.0 / np.asarray(periods, dtype=np.float64)
+        self.order = np.argsort(freq)
+        xp = freq[self.order]
+        x = np.fft.rfftfreq(nfft, dt)[1:nfft // 2]
+
+        # 同 np.interp：区间外取端点值
+        last = len(xp) - 1
+        lo = np.clip(np.searchsorted(xp, x, side='right') - 1, 0, max(last - 1, 0))
+        hi = np.minimum(lo + 1, last)
+        span = xp[hi] - xp[lo]
+        w = np.divide(x - xp[lo], span, out=np.zeros_like(x), where=span > 0)
+
+        self.nfft = nfft
+        self.lo = lo
+        self.hi = hi
+        self.w = np.clip(w, 0.0, 1.0)
+
+    def apply(self, acc: np.ndarray, ratio: np.ndarray) -> np.ndarray:
+        """按周期点调整比缩放振幅谱（相位不变），支持 (m, n) 批量"""
+        n = acc.shape[-1]
+        r = ratio[..., self.order]
+        adjustment = r[..., self.lo] * (1.0 - self.w) + r[..., self.hi] * self.w
+
+        af = np.fft.rfft(acc, self.nfft, axis=-1)
+        af[..., 1:self.nfft // 2] *= adjustment
+        return np.fft.irfft(af, self.nfft, axis=-1)[..., :n]
+
+
+class _WaveletBasis:
+    """改进的渐缩余弦小波（Al Atik & Abrahamson, 2010）
+
+    w_j(t) = cos[ω'_j (t - t_j + Δt_j)] · exp[-((t - t_j + Δt_j) / γ_j)²]，
+    γ_j = 1.178 f_j^-0.93，ω'_j = ω_j √(1 - ζ²)，Δt_j = atan(√(1 - ζ²)/ζ) / ω'_j。
+    Δt_j 使振子 j 对小波的响应峰值落在 t_j 附近；小波自身积分为零，
+    叠加后不引入速度、位移漂移。
+    """
+
+    def __init__(self, periods: np.ndarray, zeta: float, n: int, dt: float):
+        periods = np.asarray(periods, dtype=np.float64)
+        freq = 1.0 / periods
+        zeta = np.broadcast_to(np.asarray(zeta, dtype=np.float64), periods.shape)
+        root = np.sqrt(1.0 - zeta ** 2)
+
+        self.omega = 2.0 * np.pi * freq * root
+        self.gamma = 1.178 * freq ** -0.93
+        self.shift = np.arctan(root / zeta) / self.omega
+        self.t = np.arange(n) * dt
+        self.dt = dt
+
+    def place(self, t_peak: np.ndarray) -> np.ndarray:
+        """以各周期峰值时刻（采样点下标）为中心的小波矩阵 (n_periods, n)
+
+        首点置零，使 Newmark 算子的初始条件修正项不参与。
+        """
+        tau = self.t - (np.asarray(t_peak)[:, None] * self.dt
+                        - self.shift[:, None])
+        w = np.cos(self.omega[:, None] * tau) * np.exp(-(tau / self.gamma[:, None]) ** 2)
+        w[:, 0] = 0.0
+        return w
@@ -0,0 +1,175 @@
+"""
+地震动强度指标模块
+
+计算 PGA、PGV、PGV/PGA、Arias 强度、显著持时（5%~95% Arias）和平均周期 Tm，
+并为记录库建立列式索引，供选波前的快速预筛使用。
+
+参考：
+- Rathje, Abrahamson & Bray (1998): 平均周期 Tm
+- EQSignal: arias_intensity / effective_duration
+"""
+
+import numpy as np
+from typing import Optional, Callable
+
+
+class IntensityMeasures:
+    """标量强度指标计算"""
+
+    # 索引中保存的指标名称
+    NAMES = ('pga', 'pgv', 'pgv_pga', 'arias', 'significant_duration', 'mean_period')
+
+    @staticmethod
+    def compute(acc: np.ndarray, dt: float) -> dict:
+        """计算单条记录的全部强度指标
+
+        Parameters
+        ----------
+        acc : np.ndarray
+            加速度时程
+        dt : float
+            时间步长 (s)
+
+        Returns
+        -------
+        dict
+            {name: value}，name 见 IntensityMeasures.NAMES。
+            PGV 与加速度单位一致（如 g·s），Arias 强度同 EQSignal.arias_intensity。
+        """
+        acc = np.asarray(acc, dtype=np.float64)
+        pga = float(np.max(np.abs(acc))) if len(acc) else 0.0
+
+        vel = np.concatenate([[0.0], np.cumsum(0.5 * (acc[1:] + acc[:-1]) * dt)])
+        pgv = float(np.max(np.abs(vel)))
+
+        ia = np.cumsum(acc ** 2) * dt * np.pi / (2.0 * 9.81)
+        arias = float(ia[-1]) if len(ia) else 0.0
+
+        if arias > 0:
+            ia_norm = ia / ia[-1]
+            i1 = np.searchsorted(ia_norm, 0.05)
+            i2 = np.searchsorted(ia_norm, 0.95)
+            sig_dur = float((i2 - i1) * dt)
+        else:
+            sig_dur = 0.0
+
+        return {
+            'pga': pga,
+            'pgv': pgv,
+            'pgv_pga': pgv / pga if pga > 0 else 0.0,
+            'arias': arias,
+            'significant_duration': sig_dur,
+            'mean_period': IntensityMeasures.mean_period(acc, dt),
+        }
+
+    @staticmethod
+    def mean_period(acc: np.ndarray, dt: float,
+                    f1: float = 0.25, f2: float = 20.0) -> float:
+        """平均周期 Tm（Rathje 等, 1998）
+
+        Tm = Σ(C²/f) / ΣC²，C 为 f1~f2 Hz 范围内的傅里叶振幅。
+
+        Returns
+        -------
+        float
+            平均周期 (s)，频带内无能量时返回 0
+        """
+        from .fft import FFT
+        freqs, amp = FFT.amplitude_spectrum(acc, dt)
+        mask = (freqs >= f1) & (freqs <= f2)
+        c2 = amp[mask] ** 2
+        total = np.sum(c2)
+        if total <= 0:
+            return 0.0
+        return float(np.sum(c2 / freqs[mask]) / total)
+
+
+class IMIndex:
+    """记录库强度指标列式索引
+
+    每个指标一列（与记录顺序一一对应），预筛时只做数组比较，
+    无需重新读取或积分波形。
+    """
+
+    def __init__(self, names: list[str], columns: dict):
+        self.names = list(names)
+        self.columns = {k: np.asarray(v, dtype=np.float64) for k, v in columns.items()}
+
+    @classmethod
+    def from_records(cls, records: list,
+                     progress_callback: Optional[Callable] = None) -> 'IMIndex':
+        """由记录列表建立索引
+
+        Parameters
+        ----------
+        records : list[EQRecord]
+            地震动记录（需有 acc, dt, name 属性）
+        progress_callback : callable, optional
+            进度回调 fn(current, total, record_name)
+        """
+        total = len(records)
+        columns = {k: np.zeros(total) for k in IntensityMeasures.NAMES}
+        for i, rec in enumerate(records):
+            if progress_callback:
+                progress_callback(i + 1, total, rec.name)
+            ims = IntensityMeasures.compute(rec.acc, rec.dt)
+            for k in IntensityMeasures.NAMES:
+                columns[k][i] = ims[k]
+        return cls([rec.name for rec in records], columns)
+
+    def screen(self, bounds: dict) -> np.ndarray:
+        """按上下限筛选
+
+        Parameters
+        ----------
+        bounds : dict
+            {name: (lo, hi)}，lo/hi 为 None 表示不限，边界包含在内
+
+        Returns
+        -------
+        np.ndarray
+            布尔掩码，True 表示通过预筛
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for key, (lo, hi) in bounds.items():
+            if key not in self.columns:
+                raise KeyError(
+                    f"未知的强度指标: '{key}'. 可选值: {list(self.columns.keys())}"
+                )
+            col = self.columns[key]
+            if lo is not None:
+                mask &= col >= lo
+            if hi is not None:
+                mask &= col <= hi
+        return mask
+
+    def subset(self, indices) -> 'IMIndex':
+        """按序号取子索引"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return IMIndex([self.names[i] for i in indices],
+                       {k: v[indices] for k, v in self.columns.items()})
+
+    def row(self, index: int) -> dict:
+        """获取单条记录的全部指标"""
+        return {k: float(v[index]) for k, v in self.columns.items()}
+
+    def save(self, filepath: str) -> None:
+        """保存为 .npz"""
+        np.savez(filepath, names=np.array(self.names, dtype=str), **self.columns)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'IMIndex':
+        """从 .npz 读取"""
+        with np.load(filepath) as data:
+            names = [str(n) for n in data['names']]
+            columns = {k: data[k] for k in data.files if k != 'names'}
+        return cls(names, columns)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __str__(self):
+        return f"IMIndex(n_records={len(self)}, measures={list(self.columns.keys())})"
+
+    def __repr__(self):
+        return self.__str__()
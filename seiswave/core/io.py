@@ -11,12 +11,34 @@
 - MATLAB SelectWave_0802g.m 文件读取部分
 """
 
+import io
 import os
 import re
 import glob
+import fnmatch
+import itertools
+import posixpath
+import threading
+import zipfile
 import numpy as np
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
+
+# 进程池加载时单个任务最多包含的文件数
+LOAD_CHUNK = 64
+
+# 写文件时每次整块格式化的行数
+WRITE_CHUNK_ROWS = 8192
+
+# LazyRecord 波形缓存默认上限（字节）
+DEFAULT_CACHE_BYTES = 256 * 2 ** 20
+
+# RecordStream 每次读取的文本行数
+STREAM_BLOCK_LINES = 8192
+
+# 每个线程最多保持打开的 zip 归档句柄数
+ZIP_HANDLES = 8
 
 
 @dataclass
@@ -33,6 +55,321 @@ class EQRecord:
         self.npts = len(self.acc)
 
 
+class WaveformCache:
+    """已加载波形的 LRU 缓存，按数组总字节数限制内存
+
+    缓存的数组设为只读，多条记录共享同一份数据时不会互相修改。
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[np.ndarray]:
+        """取出缓存波形并标记为最近使用，未命中返回 None"""
+        with self._lock:
+            acc = self._items.get(key)
+            if acc is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return acc
+
+    def put(self, key, acc: np.ndarray) -> None:
+        """放入波形，超出 max_bytes 时淘汰最久未使用的波形"""
+        acc.flags.writeable = False
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._nbytes -= old.nbytes
+            if acc.nbytes > self.max_bytes:
+                return
+            self._items[key] = acc
+            self._nbytes += acc.nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def nbytes(self) -> int:
+        """当前缓存的数组总字节数"""
+        return self._nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+class LazyRecord:
+    """延迟加载的地震动记录
+
+    创建时只保存头部信息（名称、dt、NPTS、元数据），首次访问 acc 时才读取
+    并解析整个文件。加载的波形放入类级 LRU 缓存 LazyRecord.cache，记录本身
+    不持有数组，因此大量 LazyRecord 的内存占用受缓存上限约束。
+    与 EQRecord 具有相同的属性，可直接传给选波、反应谱等接口。
+    """
+
+    cache = WaveformCache()
+
+    def __init__(self, filepath: str, dt: float, npts: Optional[int] = None,
+                 name: str = "", metadata: Optional[dict] = None,
+                 loader: Optional[Callable] = None, cache: bool = True):
+        """
+        Parameters
+        ----------
+        filepath : str
+            文件路径
+        dt : float
+            时间步长 (s)
+        npts : int, optional
+            头部给出的数据点数；未知时首次访问 npts 会加载波形
+        name : str
+            记录名称
+        metadata : dict, optional
+            元数据
+        loader : callable, optional
+            读取函数 fn(filepath) -> EQRecord，默认 FileIO.read_at2
+        cache : bool
+            是否将加载的波形放入 LazyRecord.cache；False 时每次访问 acc 都重新读取
+        """
+        self.filepath = filepath
+        self.dt = dt
+        self.name = name
+        self.metadata = metadata if metadata is not None else {}
+        self._npts = npts
+        self._loader = loader
+        self._cache = cache
+
+    @classmethod
+    def from_at2(cls, filepath: str, cache: bool = True) -> 'LazyRecord':
+        """只读取 AT2 头部创建记录"""
+        header = FileIO.read_at2_header(filepath)
+        return cls(filepath, header['dt'], header['npts'], header['name'],
+                   header['metadata'], cache=cache)
+
+    @property
+    def acc(self) -> np.ndarray:
+        """加速度时程（首次访问时读取文件；无论是否缓存均返回只读数组）"""
+        if self._cache:
+            acc = LazyRecord.cache.get(self.filepath)
+            if acc is not None:
+                return acc
+
+        loader = self._loader or FileIO.read_at2
+        acc = loader(self.filepath).acc
+        # 数据不足 NPTS 时以实际长度为准，与 read_at2 一致
+        self._npts = len(acc)
+        if self._cache:
+            LazyRecord.cache.put(self.filepath, acc)
+        else:
+            acc.flags.writeable = False
+        return acc
+
+    @property
+    def npts(self) -> int:
+        """数据点数"""
+        if self._npts is None:
+            return len(self.acc)
+        return self._npts
+
+    @property
+    def is_loaded(self) -> bool:
+        """波形当前是否在缓存中"""
+        return self._cache and self.filepath in LazyRecord.cache
+
+    def load(self) -> EQRecord:
+        """读取波形并返回普通 EQRecord"""
+        return EQRecord(acc=self.acc, dt=self.dt, name=self.name,
+                        filepath=self.filepath, metadata=self.metadata)
+
+    def __str__(self):
+        return f"LazyRecord(name='{self.name}', dt={self.dt}, npts={self._npts})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+@dataclass
+class StreamWindow:
+    """RecordStream 输出的一个窗口"""
+    start: int                         # 首个数据点在整条记录中的序号
+    data: np.ndarray                   # 窗口数据
+    overlap: int = 0                   # 开头与上一窗口重叠的点数（首个窗口为 0）
+
+    @property
+    def new(self) -> np.ndarray:
+        """本窗口新增的数据点（去掉重叠部分），逐段送入有状态的处理器"""
+        return self.data[self.overlap:]
+
+
+class RecordStream:
+    """分块流式读取超长地震动文件
+
+    按 STREAM_BLOCK_LINES 行分块解析文本，输出固定长度、可相互重叠的窗口，
+    内存占用与窗口长度同量级，与文件长短无关。每次迭代都重新打开文件，
+    可多次遍历。配合 StreamingFilter、StreamingSpectra 等有状态处理器
+    （逐窗口送入 window.new）可在有限内存内处理数小时的连续记录：
+
+        stream = RecordStream('station.txt', window=60000, overlap=1000)
+        spectra = StreamingSpectra(stream.dt, periods)
+        for w in stream:
+            spectra.update(w.new)
+    """
+
+    def __init__(self, filepath: str, window: int, overlap: int = 0,
+                 dt: float = None, skip_rows: int = 0,
+                 single_col: Optional[bool] = None):
+        """
+        Parameters
+        ----------
+        filepath : str
+            AT2 或文本文件路径（可为 zip 归档内成员）
+        window : int
+            窗口点数
+        overlap : int
+            相邻窗口重叠点数，0 <= overlap < window
+        dt : float, optional
+            时间步长。AT2 取头部；文本双列格式由第一块的时间列推断
+        skip_rows : int
+            文本文件跳过的头部行数，其后的非数值行与 '#' 注释行也自动跳过
+        single_col : bool, optional
+            文本文件：True=取第一列为加速度，False=第一列时间、第二列加速度，
+            None=按列数自动判断（同 FileIO._auto_read_txt）
+        """
+        if window < 1 or not 0 <= overlap < window:
+            raise ValueError(f"须满足 window >= 1 且 0 <= overlap < window，"
+                             f"当前 window={window}, overlap={overlap}")
+        self.filepath = filepath
+        self.window = int(window)
+        self.overlap = int(overlap)
+        self.name = os.path.splitext(os.path.basename(filepath))[0]
+        self.metadata = {}
+        self.npts = None
+
+        self._is_at2 = filepath.lower().endswith('.at2')
+        if self._is_at2:
+            header = FileIO.read_at2_header(filepath)
+            self.dt, self.npts, self.metadata = header['dt'], header['npts'], header['metadata']
+            self._skip, self._ncols, self._column = 4, 1, 0
+        else:
+            self._skip_rows = skip_rows
+            self._probe_text(dt, single_col)
+        if dt is not None:
+            self.dt = dt
+        if self.dt is None:
+            raise ValueError("单列格式必须指定 dt")
+
+    def _probe_text(self, dt: Optional[float], single_col: Optional[bool]) -> None:
+        """确定文本文件的数据起始行、列数与 dt"""
+        with FileIO._open_text(self.filepath) as f:
+            lines = list(itertools.islice(f, self._skip_rows, self._skip_rows + STREAM_BLOCK_LINES))
+        offset = next((i for i, line in enumerate(lines) if _is_numeric_line(line)), None)
+        if offset is None:
+            raise ValueError(f"未找到数值数据: {self.filepath}")
+        self._skip = self._skip_rows + offset
+        self._ncols = len(lines[offset].split())
+        if single_col is None:
+            single_col = self._ncols < 2
+
+        self.dt = dt
+        if single_col:
+            self._column = 0
+        else:
+            if self._ncols < 2:
+                raise ValueError(f"双列格式至少需要 2 列: {self.filepath}")
+            self._column = 1
+            if dt is None:
+                time = self._parse_block(lines[offset:])[:, 0]
+                if len(time) < 2:
+                    raise ValueError(f"数据点不足，无法推断 dt: {self.filepath}")
+                self.dt = float(np.mean(np.diff(time)))
+
+    def _parse_block(self, lines: list[str]) -> np.ndarray:
+        """解析一块数据行，返回 (行数, 列数) 数组；AT2 为一维"""
+        lines = [line for line in lines if not line.lstrip().startswith('#')]
+        values = FileIO._parse_numeric_block(''.join(lines))
+        if self._is_at2:
+            return values
+        if len(values) % self._ncols:
+            raise ValueError(f"数据列数不一致（应为 {self._ncols} 列）: {self.filepath}")
+        return values.reshape(-1, self._ncols)
+
+    def blocks(self):
+        """逐块产生加速度数据（不分窗）"""
+        remaining = self.npts if self._is_at2 and self.npts is not None else None
+        with FileIO._open_text(self.filepath) as f:
+            for _ in itertools.islice(f, self._skip):
+                pass
+            while True:
+                lines = list(itertools.islice(f, STREAM_BLOCK_LINES))
+                if not lines:
+                    break
+                block = self._parse_block(lines)
+                acc = block if block.ndim == 1 else block[:, self._column]
+                if remaining is not None:
+                    # 与 read_at2 一致：多于 NPTS 的数据截断
+                    acc = acc[:remaining]
+                    remaining -= len(acc)
+                if len(acc):
+                    yield np.ascontiguousarray(acc)
+                if remaining == 0:
+                    break
+
+    def __iter__(self):
+        step = self.window - self.overlap
+        pieces, pending = [], 0
+        start = 0
+        emitted = 0        # 缓冲区开头已输出过的点数
+        for acc in self.blocks():
+            pieces.append(acc)
+            pending += len(acc)
+            if pending < self.window:
+                continue
+            # 凑够一个窗口才拼接，避免大窗口时每块都复制整个缓冲区
+            buf = np.concatenate(pieces)
+            while len(buf) >= self.window:
+                yield StreamWindow(start, buf[:self.window].copy(), emitted)
+                buf = buf[step:]
+                start += step
+                emitted = self.overlap
+            pieces, pending = [buf], len(buf)
+        if pending > emitted:
+            yield StreamWindow(start, np.concatenate(pieces), emitted)
+
+    def __str__(self):
+        return (f"RecordStream(name='{self.name}', dt={self.dt}, "
+                f"window={self.window}, overlap={self.overlap})")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def _is_numeric_line(line: str) -> bool:
+    """首个记号可转换为浮点数"""
+    tokens = line.split()
+    if not tokens:
+        return False
+    try:
+        float(tokens[0])
+        return True
+    except ValueError:
+        return False
+
+
 class FileIO:
     """地震动文件读写"""
 
@@ -49,7 +386,7 @@ class FileIO:
         Parameters
         ----------
         filepath : str
-            AT2 文件路径
+            AT2 文件路径，或 zip 归档内成员 "archive.zip/dir/name.AT2"
 
         Returns
         -------
@@ -63,15 +400,89 @@ class FileIO:
         ValueError
             无法解析文件格式
         """
-        if not os.path.isfile(filepath):
-            raise FileNotFoundError(f"文件不存在: {filepath}")
+        with FileIO._open_text(filepath) as f:
+            text = f.read()
 
-        with open(filepath, 'r', errors='replace') as f:
-            lines = f.readlines()
+        return FileIO._parse_at2_text(text, filepath)
 
-        if len(lines) < 5:
+    @staticmethod
+    def read_at2_header(filepath: str) -> dict:
+        """只读取 AT2 文件头部，不解析加速度数据
+
+        Parameters
+        ----------
+        filepath : str
+            AT2 文件路径或 zip 归档内成员，同 read_at2()
+
+        Returns
+        -------
+        dict
+            {'name', 'dt', 'npts', 'metadata'}；头部未给出 NPTS 时 npts 为 None
+
+        Raises
+        ------
+        FileNotFoundError
+            文件不存在
+        ValueError
+            无法解析文件格式
+        """
+        # 多读一行，与 read_at2 一样要求至少有一行数据
+        with FileIO._open_text(filepath) as f:
+            lines = [f.readline() for _ in range(5)]
+        if not lines[4]:
+            raise ValueError(f"AT2 文件行数不足: {filepath}")
+
+        npts, dt, metadata = FileIO._parse_at2_header(lines[:4], filepath)
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        return {'name': name, 'dt': dt, 'npts': npts, 'metadata': metadata}
+
+    @staticmethod
+    def _open_text(filepath: str):
+        """以文本方式打开普通文件或 zip 归档成员（直接读取归档数据流，不解压到磁盘）
+
+        编码与换行处理与 open(filepath, 'r', errors='replace') 相同。
+        """
+        if os.path.isfile(filepath):
+            return open(filepath, 'r', errors='replace')
+        split = _split_zip_path(filepath)
+        if split is not None:
+            zf = _zip_handle(split[0])
+            try:
+                return io.TextIOWrapper(zf.open(split[1]), errors='replace')
+            except KeyError:
+                pass
+        raise FileNotFoundError(f"文件不存在: {filepath}")
+
+    @staticmethod
+    def _parse_at2_text(text: str, filepath: str) -> EQRecord:
+        """解析 AT2 文件全文（头部 4 行 + 数据块）"""
+        # 只切出头部 4 行，数据块保持为一个整体字符串
+        lines = text.split('\n', 4)
+        if len(lines) < 5 or not lines[4]:
             raise ValueError(f"AT2 文件行数不足: {filepath}")
 
+        npts, dt, metadata = FileIO._parse_at2_header(lines[:4], filepath)
+
+        # 读取加速度数据（第5行开始）
+        acc = FileIO._parse_numeric_block(lines[4])
+
+        # 如果解析到 npts，验证一致性
+        if npts is not None and len(acc) != npts:
+            # 有些文件末尾有多余数据，截断到 npts
+            if len(acc) > npts:
+                acc = acc[:npts]
+            # 数据不足时不截断，保留实际长度
+
+        name = os.path.splitext(os.path.basename(filepath))[0]
+
+        return EQRecord(
+            acc=acc, dt=dt, name=name,
+            filepath=filepath, metadata=metadata
+        )
+
+    @staticmethod
+    def _parse_at2_header(lines: list[str], filepath: str) -> tuple:
+        """解析 AT2 头部 4 行，返回 (npts, dt, metadata)；npts 可能为 None"""
         # 解析元数据（前3行）
         metadata = {
             'header1': lines[0].strip(),
@@ -121,30 +532,28 @@ class FileIO:
                 f"无法从第4行解析 dt: '{header4}'\n文件: {filepath}"
             )
 
-        # 读取加速度数据（第5行开始）
-        acc_data = []
-        for line in lines[4:]:
-            for val in line.split():
-                try:
-                    acc_data.append(float(val))
-                except ValueError:
-                    continue
-
-        acc = np.array(acc_data, dtype=np.float64)
+        return npts, dt, metadata
 
-        # 如果解析到 npts，验证一致性
-        if npts is not None and len(acc) != npts:
-            # 有些文件末尾有多余数据，截断到 npts
-            if len(acc) > npts:
-                acc = acc[:npts]
-            # 数据不足时不截断，保留实际长度
+    @staticmethod
+    def _parse_numeric_block(block: str) -> np.ndarray:
+        """将空白分隔的数值块转换为 float64 数组
 
-        name = os.path.splitext(os.path.basename(filepath))[0]
+        快速路径：整块切分后由 numpy 一次转换（逐元素语义与 float() 相同）；
+        含无法解析的记号时回退到逐记号容错解析，跳过非数值记号。
+        """
+        tokens = block.split()
+        try:
+            return np.array(tokens, dtype=np.float64)
+        except ValueError:
+            pass
 
-        return EQRecord(
-            acc=acc, dt=dt, name=name,
-            filepath=filepath, metadata=metadata
-        )
+        acc_data = []
+        for val in tokens:
+            try:
+                acc_data.append(float(val))
+            except ValueError:
+                continue
+        return np.array(acc_data, dtype=np.float64)
 
     @staticmethod
     def read_txt(filepath: str, dt: float = None,
@@ -166,10 +575,8 @@ class FileIO:
         -------
         EQRecord
         """
-        if not os.path.isfile(filepath):
-            raise FileNotFoundError(f"文件不存在: {filepath}")
-
-        data = np.loadtxt(filepath, skiprows=skip_rows)
+        with FileIO._open_text(filepath) as f:
+            data = np.loadtxt(f, skiprows=skip_rows)
 
         if data.ndim == 1:
             # 单列数据
@@ -202,25 +609,65 @@ class FileIO:
 
         return EQRecord(acc=acc, dt=dt, name=name, filepath=filepath)
 
+    @staticmethod
+    def close_archives() -> None:
+        """关闭当前线程（及已结束的工作线程）缓存的 zip 归档句柄
+
+        读取归档成员时每个线程复用已打开的 ZipFile；batch_load()、load_files()、
+        batch_scan() 结束时自动调用。Windows 下归档在句柄关闭前无法移动或删除，
+        直接读取 LazyRecord 等归档成员后可手动调用。
+        """
+        _close_archives()
+
     @staticmethod
     def batch_load(directory: str, pattern: str = "*.AT2",
-                   recursive: bool = False) -> list[EQRecord]:
+                   recursive: bool = False, workers: Optional[int] = 1,
+                   executor: str = "thread",
+                   progress_callback: Optional[Callable] = None,
+                   result_callback: Optional[Callable] = None,
+                   dedup: bool = False) -> list[EQRecord]:
         """批量加载目录下的地震动文件
 
         Parameters
         ----------
         directory : str
-            目录路径
+            目录路径，或 zip 归档路径（成员直接从归档数据流解析）
         pattern : str
             文件匹配模式，默认 "*.AT2"
         recursive : bool
             是否递归搜索子目录
+        workers, executor, progress_callback, result_callback
+            并行加载选项，见 load_files()
+        dedup : bool
+            是否合并内容重复的记录（见 RecordDedup.deduplicate），
+            重复文件的路径记入规范记录的 metadata['aliases']
 
         Returns
         -------
         list[EQRecord]
-            成功加载的记录列表（跳过解析失败的文件）
+            成功加载的记录列表（按文件路径排序，跳过解析失败的文件）
+        """
+        try:
+            files = FileIO._find_files(directory, pattern, recursive)
+        finally:
+            _close_archives()
+        records = FileIO.load_files(
+            files, workers=workers, executor=executor,
+            progress_callback=progress_callback, result_callback=result_callback,
+        )
+        if dedup:
+            from .dedup import RecordDedup
+            records = RecordDedup.deduplicate(records).records
+        return records
+
+    @staticmethod
+    def _find_files(directory: str, pattern: str, recursive: bool) -> list[str]:
+        """按模式查找文件（无匹配时退回不区分大小写的扩展名匹配），返回排序后的路径
+
+        directory 为 zip 文件时在归档成员中查找，返回 "archive.zip/成员" 形式的路径。
         """
+        if os.path.isfile(directory) and zipfile.is_zipfile(directory):
+            return FileIO._find_zip_members(directory, pattern, recursive)
         if not os.path.isdir(directory):
             raise FileNotFoundError(f"目录不存在: {directory}")
 
@@ -246,23 +693,50 @@ class FileIO:
                         all_files.append(os.path.join(directory, fn))
             files = all_files
 
-        files.sort()
+        return sorted(files)
+
+    @staticmethod
+    def _find_zip_members(zip_path: str, pattern: str, recursive: bool) -> list[str]:
+        """在 zip 归档中按文件名模式查找成员；recursive=False 时只查找根目录"""
+        members = [m for m in _zip_handle(zip_path).namelist() if not m.endswith('/')]
+        if not recursive:
+            members = [m for m in members if '/' not in m]
+
+        files = [m for m in members if fnmatch.fnmatch(posixpath.basename(m), pattern)]
+        # 不区分大小写匹配
+        if not files:
+            suffix = pattern.lower().replace('*', '')
+            files = [m for m in members if m.lower().endswith(suffix)]
+
+        return sorted(os.path.join(zip_path, *m.split('/')) for m in files)
+
+    @staticmethod
+    def batch_scan(directory: str, pattern: str = "*.AT2",
+                   recursive: bool = False, cache: bool = True) -> list['LazyRecord']:
+        """扫描目录下的 AT2 文件，只读取头部，返回延迟加载记录
+
+        Parameters
+        ----------
+        directory, pattern, recursive
+            同 batch_load()
+        cache : bool
+            首次访问 acc 后是否放入 LazyRecord.cache
+
+        Returns
+        -------
+        list[LazyRecord]
+            按文件路径排序（跳过头部解析失败的文件，逐个发出警告）
+        """
         records = []
         errors = []
-
-        for fp in files:
-            try:
-                ext = os.path.splitext(fp)[1].lower()
-                if ext in ('.at2',):
-                    rec = FileIO.read_at2(fp)
-                elif ext in ('.txt', '.dat'):
-                    # txt 文件尝试自动检测格式
-                    rec = FileIO._auto_read_txt(fp)
-                else:
-                    continue
-                records.append(rec)
-            except Exception as e:
-                errors.append((fp, str(e)))
+        try:
+            for fp in FileIO._find_files(directory, pattern, recursive):
+                try:
+                    records.append(LazyRecord.from_at2(fp, cache=cache))
+                except Exception as e:
+                    errors.append((fp, str(e)))
+        finally:
+            _close_archives()
 
         if errors:
             import warnings
@@ -271,6 +745,106 @@ class FileIO:
 
         return records
 
+    @staticmethod
+    def load_files(files: list[str], reader: Optional[Callable] = None,
+                   workers: Optional[int] = 1, executor: str = "thread",
+                   progress_callback: Optional[Callable] = None,
+                   result_callback: Optional[Callable] = None,
+                   return_records: bool = True) -> list[EQRecord]:
+        """加载给定文件列表，可用线程池或进程池并行解析
+
+        线程池适合网络盘等 I/O 受限的场合；文本解析受 GIL 限制时用进程池。
+        无论完成顺序如何，返回列表都与 files 顺序一致。
+
+        Parameters
+        ----------
+        files : list[str]
+            文件路径列表
+        reader : callable, optional
+            单文件读取函数 fn(filepath) -> EQRecord。默认按扩展名选择
+            （.AT2 → read_at2，.txt/.dat → 自动检测，其余跳过）。
+            进程池时须可 pickle（如 functools.partial(FileIO.read_txt, dt=0.02)）
+        workers : int, optional
+            并行数，1 为在当前线程顺序加载，None 为 os.cpu_count()
+        executor : str
+            'thread' 或 'process'
+        progress_callback : callable, optional
+            进度回调 fn(current, total, filepath)，按完成顺序调用（含失败文件）
+        result_callback : callable, optional
+            单条结果回调 fn(index, EQRecord)，index 为 files 中的序号，
+            按完成顺序调用；解析失败的文件不回调
+        return_records : bool
+            False 时不保留已加载的记录（只经 result_callback 逐条交付），
+            返回空列表，内存占用与文件总数无关
+
+        Returns
+        -------
+        list[EQRecord]
+            成功加载的记录列表（跳过解析失败的文件，逐个发出警告）
+        """
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"executor 须为 'thread' 或 'process'，当前为 {executor!r}")
+
+        files = list(files)
+        total = len(files)
+        records = [None] * total
+        errors = [None] * total
+        done = 0
+
+        def collect(idx, rec, err):
+            nonlocal done
+            records[idx], errors[idx] = rec if return_records else None, err
+            done += 1
+            if progress_callback:
+                progress_callback(done, total, files[idx])
+            if result_callback and rec is not None:
+                result_callback(idx, rec)
+
+        if workers == 1 or total <= 1:
+            try:
+                for idx, fp in enumerate(files):
+                    collect(idx, *_load_file(fp, reader))
+            finally:
+                _close_archives()
+        else:
+            from concurrent.futures import (
+                ThreadPoolExecutor, ProcessPoolExecutor, as_completed,
+            )
+            if executor == 'process':
+                import multiprocessing
+                # spawn：避免在 GUI 多线程进程中 fork
+                pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                # 进程间按块分发，摊薄每个任务的序列化开销
+                n_workers = workers or os.cpu_count() or 1
+                chunk = max(1, min(LOAD_CHUNK, total // (4 * n_workers)))
+            else:
+                pool = ThreadPoolExecutor(max_workers=workers)
+                chunk = 1
+            try:
+                with pool:
+                    futures = {pool.submit(_load_chunk, files[i:i + chunk], reader): i
+                               for i in range(0, total, chunk)}
+                    try:
+                        for fut in as_completed(futures):
+                            start = futures[fut]
+                            for k, (rec, err) in enumerate(fut.result()):
+                                collect(start + k, rec, err)
+                    except BaseException:
+                        pool.shutdown(wait=True, cancel_futures=True)
+                        raise
+            finally:
+                # 线程池已结束，回收工作线程的归档句柄（进程池随进程退出关闭）
+                _close_archives()
+
+        if any(errors):
+            import warnings
+            for fp, err in zip(files, errors):
+                if err is not None:
+                    warnings.warn(f"跳过文件 {os.path.basename(fp)}: {err}")
+
+        return [rec for rec in records if rec is not None]
+
     @staticmethod
     def _auto_read_txt(filepath: str) -> EQRecord:
         """自动检测 txt 文件格式并读取
@@ -279,21 +853,12 @@ class FileIO:
         1. 双列（时间+加速度）
         2. 单列（需要从文件名或默认值推断 dt）
         """
-        try:
-            data = np.loadtxt(filepath, comments='#')
-        except Exception:
-            # 尝试跳过头部行
-            with open(filepath, 'r') as f:
-                lines = f.readlines()
-            skip = 0
-            for i, line in enumerate(lines):
-                try:
-                    float(line.split()[0])
-                    skip = i
-                    break
-                except (ValueError, IndexError):
-                    continue
-            data = np.loadtxt(filepath, skiprows=skip)
+        with FileIO._open_text(filepath) as f:
+            text = f.read()
+        # 跳过头部行（首个记号不是数值的行），只解析一次
+        skip = next((i for i, line in enumerate(io.StringIO(text))
+                     if _is_numeric_line(line)), 0)
+        data = np.loadtxt(io.StringIO(text), comments='#', skiprows=skip)
 
         if data.ndim == 2 and data.shape[1] >= 2:
             time = data[:, 0]
@@ -335,11 +900,13 @@ class FileIO:
             f.write(meta.get('header3', 'ACCELERATION (G)') + '\n')
             f.write(f'NPTS= {npts:>8d}, DT= {dt:>10.6f} SEC\n')
 
-            # 每行5个数据
-            for i in range(0, npts, 5):
-                chunk = acc[i:i+5]
-                line = ''.join(f'{v:>15.7E}' for v in chunk)
-                f.write(line + '\n')
+            # 每行5个数据，整行块格式化
+            values = np.asarray(acc).tolist()
+            n_full = npts // 5 * 5
+            FileIO._write_rows(f, values[:n_full], '%15.7E' * 5 + '\n', 5)
+            if n_full < npts:
+                FileIO._write_rows(f, values[n_full:], '%15.7E' * (npts - n_full) + '\n',
+                                   npts - n_full)
 
     @staticmethod
     def write_txt(filepath: str, acc: np.ndarray, dt: float,
@@ -357,16 +924,21 @@ class FileIO:
         two_col : bool
             True=双列（时间+加速度），False=单列
         """
+        # 输出与 np.savetxt(fmt='%15.7E', delimiter='  ', comments='# ') 逐字节一致
         if two_col:
             time = np.arange(len(acc)) * dt
             data = np.column_stack([time, acc])
-            np.savetxt(filepath, data, fmt='%15.7E', delimiter='  ',
-                       header=f'Time(s)  Acceleration\ndt={dt}  npts={len(acc)}',
-                       comments='# ')
+            header = f'Time(s)  Acceleration\ndt={dt}  npts={len(acc)}'
+            row_fmt = '%15.7E  %15.7E\n'
         else:
-            np.savetxt(filepath, acc, fmt='%15.7E',
-                       header=f'dt={dt}  npts={len(acc)}',
-                       comments='# ')
+            data = np.asarray(acc)
+            header = f'dt={dt}  npts={len(acc)}'
+            row_fmt = '%15.7E\n'
+
+        with open(filepath, 'w') as f:
+            f.write('# ' + header.replace('\n', '\n# ') + '\n')
+            FileIO._write_rows(f, data.ravel().tolist(), row_fmt,
+                               2 if two_col else 1)
 
     @staticmethod
     def write_csv(filepath: str, **columns) -> None:
@@ -385,10 +957,18 @@ class FileIO:
         arrays = [np.asarray(v) for v in columns.values()]
         n = max(len(a) for a in arrays)
 
+        # 各列都有数据的前 n_common 行整块格式化，与 csv.writer 的输出一致
+        n_common = min(len(a) for a in arrays)
+        row_fmt = ','.join(['%.7E'] * len(arrays)) + '\r\n'
+        common = np.column_stack([a[:n_common] for a in arrays]) if n_common else None
+
         with open(filepath, 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(names)
-            for i in range(n):
+            if common is not None:
+                FileIO._write_rows(f, common.ravel().tolist(), row_fmt, len(arrays))
+            # 列长度不一致时余下的行逐行写出
+            for i in range(n_common, n):
                 row = []
                 for a in arrays:
                     if i < len(a):
@@ -396,3 +976,101 @@ class FileIO:
                     else:
                         row.append('')
                 writer.writerow(row)
+
+    @staticmethod
+    def _write_rows(f, values: list, row_fmt: str, per_row: int) -> None:
+        """按行格式整块格式化并分块写入
+
+        每 WRITE_CHUNK_ROWS 行拼成一个格式串，由一次 % 运算在 C 层完成全部
+        格式化，避免逐值调用 format。values 为展平后的 Python 数值列表。
+        """
+        n_rows = len(values) // per_row
+        for start in range(0, n_rows, WRITE_CHUNK_ROWS):
+            rows = min(WRITE_CHUNK_ROWS, n_rows - start)
+            chunk = values[start * per_row:(start + rows) * per_row]
+            f.write((row_fmt * rows) % tuple(chunk))
+
+
+_zip_local = threading.local()
+_zip_lock = threading.Lock()
+_zip_tables = {}    # 线程 → 该线程的句柄表，供 close_archives() 回收已结束线程的句柄
+
+
+def _split_zip_path(filepath: str) -> Optional[tuple[str, str]]:
+    """将 "archive.zip/dir/name.AT2" 拆分为 (归档路径, 成员名)，不是归档成员时返回 None"""
+    for m in re.finditer(r'\.zip(?=[\\/])', filepath, re.IGNORECASE):
+        zip_path = filepath[:m.end()]
+        if os.path.isfile(zip_path):
+            member = filepath[m.end() + 1:].replace('\\', '/')
+            return zip_path, member
+    return None
+
+
+def _zip_handle(zip_path: str) -> zipfile.ZipFile:
+    """当前线程复用的 ZipFile 句柄（归档修改后重新打开）
+
+    每个线程/进程各持有一个句柄，并行读取成员时互不干扰，
+    也避免每个成员都重新解析归档的中央目录。每个线程最多保留
+    ZIP_HANDLES 个句柄，超出时关闭最久未使用的归档。
+    """
+    handles = getattr(_zip_local, 'handles', None)
+    if handles is None:
+        handles = _zip_local.handles = OrderedDict()
+        with _zip_lock:
+            _zip_tables[threading.current_thread()] = handles
+    st = os.stat(zip_path)
+    key = os.path.abspath(zip_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = handles.get(key)
+    if cached is not None and cached[0] == stamp:
+        handles.move_to_end(key)
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    zf = zipfile.ZipFile(zip_path)
+    handles[key] = (stamp, zf)
+    handles.move_to_end(key)
+    while len(handles) > ZIP_HANDLES:
+        _, (_, evicted) = handles.popitem(last=False)
+        evicted.close()
+    return zf
+
+
+def _close_archives() -> None:
+    """关闭当前线程及已结束线程持有的 zip 句柄（其他活动线程的句柄不受影响）"""
+    current = threading.current_thread()
+    with _zip_lock:
+        owners = [t for t in _zip_tables if t is current or not t.is_alive()]
+        tables = [_zip_tables.pop(t) for t in owners]
+    for handles in tables:
+        for _, zf in handles.values():
+            zf.close()
+        handles.clear()
+    if current in owners:
+        del _zip_local.handles
+
+
+def _load_file(filepath: str, reader: Optional[Callable] = None
+               ) -> tuple[Optional[EQRecord], Optional[str]]:
+    """读取单个文件，返回 (记录, 错误信息)；不支持的扩展名返回 (None, None)
+
+    模块级函数，供 FileIO.load_files 的进程池 pickle。
+    """
+    try:
+        if reader is not None:
+            return reader(filepath), None
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext in ('.at2',):
+            return FileIO.read_at2(filepath), None
+        if ext in ('.txt', '.dat'):
+            # txt 文件尝试自动检测格式
+            return FileIO._auto_read_txt(filepath), None
+        return None, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _load_chunk(filepaths: list[str], reader: Optional[Callable] = None
+                ) -> list[tuple[Optional[EQRecord], Optional[str]]]:
+    """按顺序读取一组文件（进程池任务单元）"""
+    return [_load_file(fp, reader) for fp in filepaths]
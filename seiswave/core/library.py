@@ -0,0 +1,317 @@
+"""
+增量更新的记录库模块
+
+在 RecordStore 二进制库的基础上记录每个源文件的路径、大小、修改时间和内容
+哈希，重新扫描源目录时只解析新增或改动的文件、剔除已删除的文件，并就地更新
+派生缓存（强度指标 IMIndex、反应谱矩阵）：
+
+    <库目录>/data.bin, index.npz   RecordStore 数据与索引
+    <库目录>/files.npz             源文件清单（路径、大小、mtime、SHA-1）
+    <库目录>/im.npz                IMIndex（可选）
+    <库目录>/spectra.npz           反应谱矩阵（可选）
+
+源目录未变化时再次同步只需逐个 stat 文件，不读取任何文件内容。
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import numpy as np
+from typing import Callable, Optional
+
+from .io import FileIO, EQRecord, _split_zip_path, _zip_handle
+from .store import RecordStore, DATA_FILE, INDEX_FILE
+from .intensity import IMIndex
+from .spectrum import NewmarkOperator
+
+# 源文件清单版本，结构变化时递增
+LIBRARY_VERSION = 1
+
+FILES_FILE = 'files.npz'
+IM_FILE = 'im.npz'
+SPECTRA_FILE = 'spectra.npz'
+
+
+class RecordLibrary:
+    """随源目录增量同步的记录库
+
+    记录顺序与 FileIO.batch_load 相同（按源文件路径排序），
+    第 i 条记录对应 filepaths[i]、store[i]、im_index 与 sa 的第 i 行。
+    """
+
+    def __init__(self, path: str, mode: str = 'r'):
+        """打开已有记录库
+
+        Parameters
+        ----------
+        path : str
+            库目录
+        mode : str
+            同 RecordStore
+        """
+        files_path = os.path.join(path, FILES_FILE)
+        if not os.path.isfile(files_path):
+            raise FileNotFoundError(f"记录库不存在或不完整: {path}")
+        self.store = RecordStore(path, mode=mode)
+
+        with np.load(files_path) as files:
+            version = int(files['version'])
+            if version != LIBRARY_VERSION:
+                raise ValueError(
+                    f"记录库版本 {version} 与当前支持的版本 {LIBRARY_VERSION} 不一致: {path}"
+                )
+            self.filepaths = [str(p) for p in files['filepaths']]
+            self.sizes = files['sizes']
+            self.mtimes = files['mtimes']
+            self.hashes = [str(h) for h in files['hashes']]
+        if len(self.filepaths) != len(self.store):
+            raise ValueError(f"源文件清单与记录库条数不一致: {path}")
+
+        im_path = os.path.join(path, IM_FILE)
+        self.im_index = IMIndex.load(im_path) if os.path.isfile(im_path) else None
+
+        self.periods = None
+        self.zeta = None
+        self.sa = None
+        spectra_path = os.path.join(path, SPECTRA_FILE)
+        if os.path.isfile(spectra_path):
+            with np.load(spectra_path) as spectra:
+                self.periods = spectra['periods']
+                self.zeta = float(spectra['zeta'])
+                self.sa = spectra['sa']
+
+        self.path = path
+        # 最近一次 sync() 的变化 {'added', 'changed', 'removed': [源文件路径]}
+        self.changes = {'added': [], 'changed': [], 'removed': []}
+
+    # ──────────────────── 同步 ────────────────────
+
+    @classmethod
+    def sync(cls, path: str, directory: str, pattern: str = "*.AT2",
+             recursive: bool = False, intensity: bool = True,
+             periods: Optional[np.ndarray] = None, zeta: float = 0.05,
+             dtype=np.float64, workers: Optional[int] = 1, executor: str = "thread",
+             progress_callback: Optional[Callable] = None) -> 'RecordLibrary':
+        """将记录库与源目录同步（库不存在时全量建库）
+
+        大小与 mtime 均未变的文件直接沿用；大小相同而 mtime 变化的文件
+        比较内容哈希，哈希相同（仅被 touch 或复制）也沿用。沿用记录的波形
+        从旧库数据文件整段复制，强度指标与反应谱直接复用对应行。
+
+        Parameters
+        ----------
+        path : str
+            库目录
+        directory, pattern, recursive
+            同 FileIO.batch_load()
+        intensity : bool
+            是否维护 IMIndex 缓存
+        periods : np.ndarray, optional
+            维护反应谱缓存的周期点，None 表示不维护。周期或阻尼比与
+            旧缓存不同时全部重算
+        zeta : float
+            反应谱阻尼比
+        dtype : np.dtype
+            同 RecordStore.build()（仅在全量建库时生效，之后沿用旧库精度）
+        workers, executor, progress_callback
+            解析新增/改动文件时的并行选项，同 FileIO.load_files()
+
+        Returns
+        -------
+        RecordLibrary
+            changes 属性记录本次新增、改动、删除的源文件
+        """
+        old = None
+        try:
+            old = cls(path)
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        if old is not None:
+            dtype = old.store.dtype
+        periods = None if periods is None else np.asarray(periods, dtype=np.float64)
+
+        # 逐个 stat，判断哪些文件需要重新解析
+        old_index = {fp: i for i, fp in enumerate(old.filepaths)} if old is not None else {}
+        files = FileIO._find_files(directory, pattern, recursive)
+        sizes = np.zeros(len(files), dtype=np.int64)
+        mtimes = np.zeros(len(files), dtype=np.int64)
+        hashes = [''] * len(files)
+        source = [None] * len(files)      # 沿用的旧库序号，None 为需要解析
+        changes = {'added': [], 'changed': [], 'removed': []}
+        touched = False
+        for k, fp in enumerate(files):
+            sizes[k], mtimes[k] = RecordLibrary._stat(fp)
+            i = old_index.get(fp)
+            if i is not None and sizes[k] == old.sizes[i]:
+                if mtimes[k] == old.mtimes[i]:
+                    source[k], hashes[k] = i, old.hashes[i]
+                    continue
+                hashes[k] = RecordLibrary._content_hash(fp)
+                if hashes[k] == old.hashes[i]:
+                    source[k] = i
+                    touched = True
+                    continue
+            if not hashes[k]:
+                hashes[k] = RecordLibrary._content_hash(fp)
+            changes['added' if i is None else 'changed'].append(fp)
+        FileIO.close_archives()
+        listed = set(files)
+        if old is not None:
+            changes['removed'] = [fp for fp in old.filepaths if fp not in listed]
+
+        # 反应谱缓存的周期与阻尼比均一致才能沿用
+        sa_ok = (old is not None and old.sa is not None and periods is not None and
+                 old.zeta == zeta and np.array_equal(old.periods, periods))
+        caches_ok = (old is not None and (old.im_index is not None) == intensity and
+                     (sa_ok or (periods is None and old.sa is None)))
+        if caches_ok and not any(changes.values()):
+            if touched:
+                RecordLibrary._save_files(path, old.filepaths, sizes, mtimes, hashes)
+                old.mtimes = mtimes
+            return old
+
+        # 解析新增/改动文件（失败的文件跳过并警告，下次同步时重试）
+        parse = [k for k, s in enumerate(source) if s is None]
+        parsed = {}
+        FileIO.load_files([files[k] for k in parse], workers=workers, executor=executor,
+                          progress_callback=progress_callback,
+                          result_callback=lambda j, rec: parsed.__setitem__(parse[j], rec))
+        keep = [k for k in range(len(files)) if source[k] is not None or k in parsed]
+        records = [old.store[source[k]] if source[k] is not None else parsed[k]
+                   for k in keep]
+
+        # 先删除清单，写入中断时下次同步全量重建
+        files_path = os.path.join(path, FILES_FILE)
+        if os.path.isfile(files_path):
+            os.remove(files_path)
+        tmp = RecordLibrary._build_store(path, records, dtype)
+
+        reuse = [source[k] for k in keep]
+        if intensity:
+            RecordLibrary._update_im(path, records, reuse,
+                                     old.im_index if old is not None else None)
+        elif os.path.isfile(os.path.join(path, IM_FILE)):
+            os.remove(os.path.join(path, IM_FILE))
+        if periods is not None:
+            RecordLibrary._update_spectra(path, records, reuse,
+                                          old.sa if sa_ok else None, periods, zeta)
+        elif os.path.isfile(os.path.join(path, SPECTRA_FILE)):
+            os.remove(os.path.join(path, SPECTRA_FILE))
+
+        # 沿用的记录是旧库映射数组的视图；先释放全部视图与映射再替换数据文件
+        # （Windows 下仍被映射的文件不能覆盖）
+        del records
+        if old is not None:
+            old.store.close()
+        RecordLibrary._replace_store(path, tmp)
+
+        RecordLibrary._save_files(path, [files[k] for k in keep],
+                                  sizes[keep], mtimes[keep], [hashes[k] for k in keep])
+        library = cls(path)
+        library.changes = changes
+        return library
+
+    @staticmethod
+    def _stat(filepath: str) -> tuple[int, int]:
+        """(大小, 修改时间 ns)；zip 成员取归档目录中的大小与时间戳"""
+        zip_member = _split_zip_path(filepath)
+        if zip_member is not None:
+            info = _zip_handle(zip_member[0]).getinfo(zip_member[1])
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            return info.file_size, int(mtime) * 10 ** 9
+        st = os.stat(filepath)
+        return st.st_size, st.st_mtime_ns
+
+    @staticmethod
+    def _content_hash(filepath: str) -> str:
+        """文件内容的 SHA-1（十六进制）"""
+        sha = hashlib.sha1()
+        zip_member = _split_zip_path(filepath)
+        if zip_member is not None:
+            f = _zip_handle(zip_member[0]).open(zip_member[1])
+        else:
+            f = open(filepath, 'rb')
+        with f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    @staticmethod
+    def _build_store(path: str, records: list[EQRecord], dtype) -> str:
+        """在临时目录写出新的 RecordStore，返回临时目录
+
+        沿用的记录是旧库映射数组的视图，写完新数据文件之前不能覆盖旧文件。
+        """
+        tmp = path.rstrip('/\\') + '.tmp'
+        if os.path.isdir(tmp):
+            shutil.rmtree(tmp)
+        RecordStore.build(tmp, records, dtype=dtype)
+        os.makedirs(path, exist_ok=True)
+        return tmp
+
+    @staticmethod
+    def _replace_store(path: str, tmp: str) -> None:
+        """以临时目录中的数据文件与索引替换旧文件"""
+        for name in (DATA_FILE, INDEX_FILE):
+            os.replace(os.path.join(tmp, name), os.path.join(path, name))
+        shutil.rmtree(tmp)
+
+    @staticmethod
+    def _update_im(path: str, records: list[EQRecord], reuse: list,
+                   old_im: Optional[IMIndex]) -> None:
+        """沿用旧行、只为新记录计算强度指标"""
+        kept = [j for j, i in enumerate(reuse) if i is not None and old_im is not None]
+        fresh = sorted(set(range(len(records))) - set(kept))
+        new_im = IMIndex.from_records([records[j] for j in fresh])
+        columns = {k: np.zeros(len(records)) for k in new_im.columns}
+        for k, col in columns.items():
+            col[fresh] = new_im.columns[k]
+            if kept:
+                col[kept] = old_im.columns[k][[reuse[j] for j in kept]]
+        IMIndex([rec.name for rec in records], columns).save(os.path.join(path, IM_FILE))
+
+    @staticmethod
+    def _update_spectra(path: str, records: list[EQRecord], reuse: list,
+                        old_sa: Optional[np.ndarray], periods: np.ndarray,
+                        zeta: float) -> None:
+        """沿用旧行、只为新记录计算加速度反应谱"""
+        sa = np.zeros((len(records), len(periods)))
+        for j, (rec, i) in enumerate(zip(records, reuse)):
+            if i is not None and old_sa is not None:
+                sa[j] = old_sa[i]
+            elif rec.npts:
+                sa[j] = NewmarkOperator(rec.npts, rec.dt, periods, zeta).sa(rec.acc)
+        np.savez(os.path.join(path, SPECTRA_FILE), periods=periods, zeta=zeta, sa=sa)
+
+    @staticmethod
+    def _save_files(path: str, filepaths: list[str], sizes, mtimes, hashes) -> None:
+        np.savez(
+            os.path.join(path, FILES_FILE),
+            version=LIBRARY_VERSION,
+            filepaths=np.array(filepaths, dtype=str),
+            sizes=np.asarray(sizes, dtype=np.int64),
+            mtimes=np.asarray(mtimes, dtype=np.int64),
+            hashes=np.array(hashes, dtype=str),
+        )
+
+    # ──────────────────── 访问 ────────────────────
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, index: int) -> EQRecord:
+        """第 index 条记录（acc 为映射数组的视图）"""
+        return self.store[index]
+
+    def records(self) -> list[EQRecord]:
+        """全部记录（均为视图）"""
+        return self.store.records()
+
+    def __str__(self):
+        return (f"RecordLibrary(path='{self.path}', n_records={len(self)}, "
+                f"intensity={self.im_index is not None}, "
+                f"n_periods={0 if self.periods is None else len(self.periods)})")
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,222 @@
+"""
+功率谱密度法人工波生成模块
+
+由目标单边功率谱密度 G(f) 合成平稳高斯过程样本，再施加强度包络得到非平稳时程：
+- Kanai-Tajimi / Clough-Penzien 场地谱模型，或由参考记录 Welch 谱估计
+- 随机相位谱逆 FFT 合成（每个频率点振幅 √(G·n / 2dt)，相位均匀分布），
+  所有样本堆叠为 (样本数, 点数) 数组一次批量 irfft，不逐频率叠加余弦
+- 时变（演化）谱通过 Envelope 施加：均匀调制用 trapezoidal 等形状，
+  频率相关调制用 evolutionary（分频带包络）
+- 批量反应谱相容性校核：NewmarkOperator 一次计算全部样本的反应谱
+
+参考：
+- Kanai (1957), Tajimi (1960): 场地滤波白噪声模型
+- Clough & Penzien (1975): 增加高通滤波以消除低频奇异
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional
+
+from .envelope import Envelope
+from .batch import RecordBatch
+
+# 相容性校核每块样本数
+COMPAT_CHUNK = 32
+
+
+@dataclass
+class CompatibilityResult:
+    """批量反应谱相容性校核结果"""
+    sa: np.ndarray                   # 各样本反应谱 (n_samples, n_periods)
+    max_error: np.ndarray            # 各样本最大相对偏差
+    mean_error: np.ndarray           # 各样本均方根相对偏差
+    passed: np.ndarray               # 各样本最大偏差 ≤ tol
+    mean_sa: np.ndarray              # 样本平均反应谱
+    suite_error: float               # 平均反应谱的最大相对偏差
+
+
+class PSDGenerator:
+    """功率谱密度法人工波生成器"""
+
+    @staticmethod
+    def kanai_tajimi(freqs: np.ndarray, s0: float, fg: float = 2.5,
+                     zeta_g: float = 0.6) -> np.ndarray:
+        """Kanai-Tajimi 单边功率谱密度
+
+        G(f) = S0 · [1 + 4ζg²(f/fg)²] / {[1 - (f/fg)²]² + 4ζg²(f/fg)²}
+
+        Parameters
+        ----------
+        freqs : np.ndarray
+            频率 (Hz)
+        s0 : float
+            基岩白噪声谱强度（加速度单位²/Hz）
+        fg : float
+            场地卓越频率 (Hz)
+        zeta_g : float
+            场地阻尼比
+
+        Returns
+        -------
+        np.ndarray
+            功率谱密度
+        """
+        r2 = (np.asarray(freqs, dtype=np.float64) / fg) ** 2
+        num = 1.0 + 4.0 * zeta_g ** 2 * r2
+        return s0 * num / ((1.0 - r2) ** 2 + 4.0 * zeta_g ** 2 * r2)
+
+    @staticmethod
+    def clough_penzien(freqs: np.ndarray, s0: float, fg: float = 2.5,
+                       zeta_g: float = 0.6, ff: float = 0.25,
+                       zeta_f: float = 0.6) -> np.ndarray:
+        """Clough-Penzien 单边功率谱密度
+
+        在 Kanai-Tajimi 谱上乘以高通项 (f/ff)⁴ / {[1 - (f/ff)²]² + 4ζf²(f/ff)²}，
+        消除速度、位移谱在零频处的奇异。
+
+        Parameters
+        ----------
+        ff : float
+            高通滤波频率 (Hz)
+        zeta_f : float
+            高通滤波阻尼比
+        其余参数同 kanai_tajimi()
+        """
+        r2 = (np.asarray(freqs, dtype=np.float64) / ff) ** 2
+        high_pass = r2 ** 2 / ((1.0 - r2) ** 2 + 4.0 * zeta_f ** 2 * r2)
+        return PSDGenerator.kanai_tajimi(freqs, s0, fg, zeta_g) * high_pass
+
+    @staticmethod
+    def from_record(acc: np.ndarray, dt: float, **welch_kwargs) -> tuple:
+        """由参考记录估计目标功率谱密度（FFT.welch_psd）
+
+        Welch 谱是整条记录的时间平均，合成时若再施加包络，
+        样本能量会低于参考记录；需要时可用 synthesize(envelope=None) 得到平稳样本。
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            (频率数组 Hz, 单边 PSD)
+        """
+        from .fft import FFT
+        return FFT.welch_psd(np.asarray(acc, dtype=np.float64), dt, **welch_kwargs)
+
+    @staticmethod
+    def synthesize(freqs: np.ndarray, psd: np.ndarray, n: int, dt: float,
+                   count: int = 1, seed=None,
+                   envelope: Optional[str] = 'trapezoidal',
+                   envelope_params: Optional[dict] = None,
+                   as_signals: bool = False):
+        """随机相位逆 FFT 合成
+
+        Parameters
+        ----------
+        freqs : np.ndarray
+            目标谱频率 (Hz)，递增
+        psd : np.ndarray
+            目标单边功率谱密度，线性插值到 FFT 频率网格（区间外取 0）
+        n : int
+            点数
+        dt : float
+            时间步长 (s)
+        count : int
+            样本数
+        seed : int or np.random.SeedSequence, optional
+            随机种子
+        envelope : str or None
+            强度包络形状（见 Envelope.SHAPES），None 表示平稳样本
+        envelope_params : dict, optional
+            包络参数
+        as_signals : bool
+            为 True 时返回 list[EQSignal]
+
+        Returns
+        -------
+        RecordBatch or list[EQSignal]
+            合成的加速度时程，单位与 psd 一致
+        """
+        f_grid = np.fft.rfftfreq(n, dt)
+        g = np.interp(f_grid, freqs, psd, left=0.0, right=0.0)
+        g[0] = 0.0                                  # 去掉直流分量
+        amp = np.sqrt(g * n / (2.0 * dt))
+
+        rng = np.random.default_rng(seed)
+        phase = rng.uniform(0.0, 2.0 * np.pi, (count, len(f_grid)))
+        acc = np.fft.irfft(amp * np.exp(1j * phase), n, axis=-1)
+
+        if envelope is not None:
+            acc = Envelope.apply(acc, dt, envelope, **(envelope_params or {}))
+
+        names = [f"psd_{i + 1}" for i in range(count)]
+        if as_signals:
+            from .signal import EQSignal
+            signals = []
+            for i in range(count):
+                sig = EQSignal(acc[i], dt, name=names[i])
+                sig.a2vd()
+                signals.append(sig)
+            return signals
+
+        offsets = np.arange(count + 1, dtype=np.int64) * n
+        return RecordBatch(acc.reshape(-1), offsets, np.full(count, dt), names)
+
+    @staticmethod
+    def check_compatibility(samples, target_spectrum: np.ndarray,
+                            periods: np.ndarray, zeta: float = 0.05,
+                            tol: float = 0.2) -> CompatibilityResult:
+        """批量反应谱相容性校核
+
+        Parameters
+        ----------
+        samples : RecordBatch or list[EQSignal]
+            等长、等步长的样本
+        target_spectrum : np.ndarray
+            目标反应谱（与 periods 对应，单位同样本加速度）
+        periods : np.ndarray
+            周期数组 (s)
+        zeta : float
+            阻尼比
+        tol : float
+            单条样本的最大相对偏差容许值
+
+        Returns
+        -------
+        CompatibilityResult
+        """
+        from .spectrum import NewmarkOperator
+        from .generator import WaveGenerator
+
+        if isinstance(samples, RecordBatch):
+            lengths = samples.lengths
+            dts = samples.dt
+            if len(samples) and np.any(lengths != lengths[0]):
+                raise ValueError("相容性校核要求样本等长")
+            acc = np.asarray(samples.data, dtype=np.float64).reshape(len(samples), -1)
+        else:
+            lengths = {len(s.acc) for s in samples}
+            if len(lengths) > 1:
+                raise ValueError("相容性校核要求样本等长")
+            dts = np.array([s.dt for s in samples])
+            acc = np.vstack([s.acc for s in samples])
+        if len(dts) and np.any(dts != dts[0]):
+            raise ValueError("相容性校核要求样本时间步长相同")
+
+        target = np.asarray(target_spectrum, dtype=np.float64)
+        operator = NewmarkOperator(acc.shape[1], float(dts[0]), periods, zeta)
+        # 分块计算，控制 (样本, 周期, nfft) 中间数组的内存
+        sa = np.zeros((len(acc), len(operator.periods)))
+        for start in range(0, len(acc), COMPAT_CHUNK):
+            sa[start:start + COMPAT_CHUNK] = operator.sa(acc[start:start + COMPAT_CHUNK])
+        max_err, mean_err = WaveGenerator._errors(sa, target)
+        mean_sa = np.mean(sa, axis=0)
+        suite_err, _ = WaveGenerator._errors(mean_sa, target)
+
+        return CompatibilityResult(
+            sa=sa,
+            max_error=max_err,
+            mean_error=mean_err,
+            passed=max_err <= tol,
+            mean_sa=mean_sa,
+            suite_error=float(suite_err),
+        )
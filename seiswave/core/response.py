@@ -84,7 +84,7 @@ class Response:
         for i in range(1, self.n):
             # 有效荷载
             p_eff = -self.acc[i] + a1 * self.rd[i-1] + a2 * self.rv[i-1] + a3 * self.ra[i-1]
-            p_eff += self.c * (a4 * self.rd[i-1] + a5 * self.rv[i-1] + a6 * self.ra[i-1])
+            p_eff += self.c * (a4 * self.rd[i-1] - a5 * self.rv[i-1] - a6 * self.ra[i-1])
             
             # 计算位移
             self.rd[i] = p_eff / keff
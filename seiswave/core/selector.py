@@ -2,18 +2,31 @@
 地震波选取引擎
 
 实现三步筛选：有效持时 → 主周期偏差 → 底部剪力校核（可选）。
+可选在三步之前按强度指标索引预筛（IMIndex），不做任何积分。
 
 参考：
 - MATLAB: SelectWave_0802g.m
 - GB 50011-2010 第 5.1.2 条
 """
 
+import hashlib
+import dataclasses
 import numpy as np
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Optional, Callable
 
 from .io import EQRecord
 from .code_spec import CodeSpectrum
+from .intensity import IMIndex
+from .batch import RecordBatch
+from .rvt import RVT
+
+# 积分循环中检查取消请求的步数间隔
+CHECKPOINT_INTERVAL = 2048
+
+# 逐条结果缓存的默认条数上限
+RESULT_CACHE_SIZE = 20000
 
 
 @dataclass
@@ -31,6 +44,8 @@ class SelectionCriteria:
     shear_range: tuple = (0.65, 1.35)        # 底部剪力比范围
     mass: Optional[np.ndarray] = None        # 质量数组 (kg)，底部剪力校核用
     stiffness: Optional[np.ndarray] = None   # 层刚度数组 (N/m)，底部剪力校核用
+    im_bounds: Optional[dict] = None         # 强度指标预筛 {name: (lo, hi)}，见 IntensityMeasures.NAMES
+    rvt_tol: Optional[float] = None          # RVT 反应谱预筛附加容差：偏差 > spectral_tol + rvt_tol 的记录直接剔除
 
 
 @dataclass
@@ -43,19 +58,49 @@ class SelectionResult:
     passed_duration: bool = False
     passed_spectral: bool = False
     passed_shear: bool = True                # 默认通过（不校核时）
+    passed_prescreen: bool = True            # 默认通过（不预筛时）
     passed: bool = False
 
 
+@dataclass
+class SweepResult:
+    """多组选波参数的扫描结果
+
+    所有布尔/数值矩阵形状均为 (n_criteria, n_records)。
+    """
+    criteria: list[SelectionCriteria]
+    records: list[EQRecord]
+    effective_duration: np.ndarray           # 有效持时 (s)
+    passed_prescreen: np.ndarray
+    passed_duration: np.ndarray
+    passed_spectral: np.ndarray
+    passed_shear: np.ndarray
+    passed: np.ndarray
+    deviations: list[np.ndarray] = field(default_factory=list)  # 每组 (n_records, len(T_main))，未计算为 NaN
+
+    def selected(self, index: int) -> list[EQRecord]:
+        """第 index 组参数下通过筛选的记录"""
+        return [rec for rec, ok in zip(self.records, self.passed[index]) if ok]
+
+
 class WaveSelector:
     """地震波选取引擎"""
 
-    def __init__(self, criteria: SelectionCriteria):
+    def __init__(self, criteria: SelectionCriteria, use_cache: bool = True,
+                 cache_size: int = RESULT_CACHE_SIZE):
         self.criteria = criteria
         self.target_spectrum = None  # 缓存的目标规范谱值（在主周期点）
         self.results: list[SelectionResult] = []
+        self.use_cache = use_cache
+        self.cache_size = cache_size
+        # 逐条结果 LRU 缓存 {(criteria_key, content_hash, im_key): SelectionResult}
+        self._cache: OrderedDict = OrderedDict()
+        self._fresh: list[int] = []
+        self.cache_stats = {"hits": 0, "misses": 0}
 
     def select(self, records: list[EQRecord],
-               progress_callback: Optional[Callable] = None) -> list[SelectionResult]:
+               progress_callback: Optional[Callable] = None,
+               im_index: Optional[IMIndex] = None) -> list[SelectionResult]:
         """执行三步筛选
 
         Parameters
@@ -64,12 +109,129 @@ class WaveSelector:
             待筛选的地震动记录
         progress_callback : callable, optional
             进度回调 fn(current, total, record_name)
+        im_index : IMIndex, optional
+            与 records 顺序一致的预计算强度指标索引。
+            criteria.im_bounds 非空且未提供时现场建立。
 
         Returns
         -------
         list[SelectionResult]
             通过筛选的结果列表
         """
+        keys, pending = self._prepare(records, im_index)
+        pending = set(pending)
+        total = len(records)
+
+        for idx, (rec, result) in enumerate(zip(records, self.results)):
+            if progress_callback:
+                progress_callback(idx + 1, total, rec.name)
+
+            if idx not in pending:
+                continue
+
+            # Step 2-3: 主周期偏差 → 底部剪力校核
+            self._evaluate(result)
+
+        self._store(keys)
+        return [r for r in self.results if r.passed]
+
+    def select_parallel(self, records: list[EQRecord],
+                        workers: Optional[int] = None,
+                        progress_callback: Optional[Callable] = None,
+                        result_callback: Optional[Callable] = None,
+                        should_stop: Optional[Callable] = None,
+                        im_index: Optional[IMIndex] = None) -> list[SelectionResult]:
+        """多进程并行执行三步筛选
+
+        预筛与持时检查在当前进程中批量完成，只有通过持时的记录才分发到进程池
+        做 SDOF / MDOF 积分。结果按完成顺序逐条回调，最终 self.results 保持
+        records 的原始顺序。
+
+        Parameters
+        ----------
+        records : list[EQRecord]
+            待筛选的地震动记录
+        workers : int, optional
+            进程数，默认 os.cpu_count()
+        progress_callback : callable, optional
+            进度回调 fn(current, total, record_name)
+        result_callback : callable, optional
+            单条结果回调 fn(index, SelectionResult)，按完成顺序调用
+        should_stop : callable, optional
+            取消判断 fn() -> bool。返回 True 时通知各进程在积分检查点中止，
+            并抛出 InterruptedError
+        im_index : IMIndex, optional
+            同 select()
+
+        Returns
+        -------
+        list[SelectionResult]
+            通过筛选的结果列表
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+        keys, pending = self._prepare(records, im_index)
+        total = len(records)
+        done = 0
+
+        waiting = set(pending)
+        for idx, result in enumerate(self.results):
+            if idx in waiting:
+                continue
+            done += 1
+            if progress_callback:
+                progress_callback(done, total, records[idx].name)
+            if result_callback:
+                result_callback(idx, result)
+
+        if not pending:
+            self._store(keys)
+            return self.get_passed()
+
+        # spawn：避免在 GUI 多线程进程中 fork
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Manager() as manager:
+            stop_event = manager.Event()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = {
+                    pool.submit(_evaluate_remote, self.criteria, self.results[idx],
+                                stop_event): idx
+                    for idx in pending
+                }
+                try:
+                    while futures:
+                        finished, _ = wait(list(futures), timeout=0.1,
+                                           return_when=FIRST_COMPLETED)
+                        if should_stop is not None and should_stop():
+                            raise InterruptedError("用户取消")
+                        for fut in finished:
+                            idx = futures.pop(fut)
+                            result = fut.result()
+                            result.record = records[idx]  # 换回原对象，避免持有副本
+                            self.results[idx] = result
+                            done += 1
+                            if progress_callback:
+                                progress_callback(done, total, records[idx].name)
+                            if result_callback:
+                                result_callback(idx, result)
+                except BaseException:
+                    stop_event.set()
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    raise
+
+        self._store(keys)
+        return self.get_passed()
+
+    # ──────────────────── 增量选波缓存 ────────────────────
+
+    def _prepare(self, records: list[EQRecord],
+                 im_index: Optional[IMIndex]) -> tuple[Optional[list], list[int]]:
+        """预计算目标谱，查缓存，并对未命中的记录批量完成 Step 0-1
+
+        设置 self.results（与 records 同序），返回 (缓存键, 待执行 Step 2-3 的序号)。
+        缓存命中的记录直接复用结果，不再参与任何计算。
+        """
         c = self.criteria
 
         # 预计算目标规范谱在主周期点的值
@@ -78,44 +240,287 @@ class WaveSelector:
             T_main, c.Tg, c.alpha_max, zeta=c.zeta, isolation=c.isolation
         )
 
-        self.results = []
-        total = len(records)
+        if im_index is not None and len(im_index) != len(records):
+            raise ValueError(
+                f"强度指标索引条数 ({len(im_index)}) 与记录数 ({len(records)}) 不一致"
+            )
+
+        results = [None] * len(records)
+        keys = None
+        if self.use_cache:
+            ckey = self._criteria_key(c)
+            im_keys = self._im_keys(im_index, c, len(records))
+            keys = [(ckey, self._content_hash(rec), im_key)
+                    for rec, im_key in zip(records, im_keys)]
+            for idx, (rec, key) in enumerate(zip(records, keys)):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[idx] = dataclasses.replace(
+                        cached, record=rec, deviations=dict(cached.deviations)
+                    )
+
+        fresh = [idx for idx, r in enumerate(results) if r is None]
+        self.cache_stats = {"hits": len(records) - len(fresh), "misses": len(fresh)}
+
+        if im_index is not None and len(fresh) < len(records):
+            im_index = im_index.subset(fresh)
+
+        screened = self._screen([records[idx] for idx in fresh], im_index)
+        for idx, result in zip(fresh, screened):
+            results[idx] = result
+
+        self.results = results
+        self._fresh = fresh
+        return keys, [idx for idx in fresh if results[idx].passed_duration]
+
+    def _store(self, keys: Optional[list]) -> None:
+        """将本次新计算的结果写入缓存（不保留波形引用），超出 cache_size 时淘汰最久未使用的结果"""
+        if keys is None:
+            return
+        for idx in self._fresh:
+            self._cache[keys[idx]] = dataclasses.replace(
+                self.results[idx], record=None
+            )
+            self._cache.move_to_end(keys[idx])
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """清空逐条结果缓存"""
+        self._cache.clear()
 
-        for idx, rec in enumerate(records):
-            if progress_callback:
-                progress_callback(idx + 1, total, rec.name)
+    @staticmethod
+    def _content_hash(rec: EQRecord) -> str:
+        """记录内容哈希（dt + 加速度数据）"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr(float(rec.dt)).encode())
+        h.update(np.ascontiguousarray(rec.acc, dtype=np.float64).tobytes())
+        return h.hexdigest()
 
-            result = SelectionResult(record=rec, effective_duration=0.0)
+    @staticmethod
+    def _im_keys(im_index: Optional[IMIndex], c: SelectionCriteria, n: int) -> list:
+        """逐条预筛输入的可哈希键
 
-            # Step 1: 有效持时
-            ok, dur = self._check_duration(rec)
-            result.effective_duration = dur
-            result.passed_duration = ok
-            if not ok:
-                self.results.append(result)
-                continue
+        外部提供的强度指标不一定由波形算出，预筛所用的那几列数值须计入缓存键；
+        未提供索引或不按强度指标预筛时为 None（现场计算的指标由内容哈希决定）。
+        """
+        if im_index is None or not c.im_bounds:
+            return [None] * n
+        names = sorted(c.im_bounds)
+        columns = [im_index.columns[k] if k in im_index.columns else np.full(n, np.nan)
+                   for k in names]
+        return [tuple(float(col[i]) for col in columns) for i in range(n)]
 
-            # Step 2: 主周期偏差
-            ok, devs = self._check_spectral_deviation(rec)
-            result.deviations = devs
-            result.passed_spectral = ok
+    @staticmethod
+    def _criteria_key(c: SelectionCriteria) -> tuple:
+        """选波参数的可哈希键"""
+        key = []
+        for f in dataclasses.fields(c):
+            v = getattr(c, f.name)
+            if isinstance(v, np.ndarray):
+                v = (v.dtype.str, v.shape, v.tobytes())
+            elif isinstance(v, dict):
+                v = tuple(sorted((k, tuple(b)) for k, b in v.items()))
+            elif isinstance(v, list):
+                v = tuple(v)
+            key.append(v)
+        return tuple(key)
+
+    # ──────────────────── Step 0-1: 批量预筛与持时 ────────────────────
+
+    def _screen(self, records: list[EQRecord],
+                im_index: Optional[IMIndex]) -> list[SelectionResult]:
+        """批量完成 Step 0（预筛）和 Step 1（有效持时）"""
+        c = self.criteria
+
+        prescreen = self._prescreen(records, c, im_index)
+        dur_ok, durations = self._check_duration_batch(RecordBatch.from_records(records))
+
+        results = []
+        for idx, rec in enumerate(records):
+            result = SelectionResult(record=rec, effective_duration=0.0)
+            if prescreen is not None and not prescreen[idx]:
+                result.passed_prescreen = False
+            else:
+                result.effective_duration = float(durations[idx])
+                result.passed_duration = bool(dur_ok[idx])
+            results.append(result)
+        return results
+
+    def _evaluate(self, result: SelectionResult,
+                  should_stop: Optional[Callable] = None) -> SelectionResult:
+        """对已通过持时检查的记录执行 Step 2（主周期偏差）和 Step 3（底部剪力）"""
+        c = self.criteria
+        rec = result.record
+
+        ok, devs = self._check_spectral_deviation(rec, should_stop)
+        result.deviations = devs
+        result.passed_spectral = ok
+        if not ok:
+            return result
+
+        if c.shear_check and c.mass is not None and c.stiffness is not None:
+            ok, ratio = self._check_base_shear(rec, should_stop)
+            result.shear_ratio = ratio
+            result.passed_shear = ok
             if not ok:
-                self.results.append(result)
+                return result
+
+        result.passed = True
+        return result
+
+    # ──────────────────── Step 0: 强度指标预筛 ────────────────────
+
+    @staticmethod
+    def _prescreen(records: list[EQRecord], c: SelectionCriteria,
+                   im_index: Optional[IMIndex]) -> Optional[np.ndarray]:
+        """按 im_bounds 与 rvt_tol 预筛，返回布尔掩码；均未设置时返回 None"""
+        mask = None
+        if c.im_bounds:
+            if im_index is None:
+                im_index = IMIndex.from_records(records)
+            if len(im_index) != len(records):
+                raise ValueError(
+                    f"强度指标索引条数 ({len(im_index)}) 与记录数 ({len(records)}) 不一致"
+                )
+            mask = im_index.screen(c.im_bounds)
+        if c.rvt_tol is not None:
+            rvt_mask = WaveSelector._rvt_screen(records, c)
+            mask = rvt_mask if mask is None else mask & rvt_mask
+        return mask
+
+    @staticmethod
+    def _rvt_screen(records: list[EQRecord], c: SelectionCriteria) -> np.ndarray:
+        """RVT 估计主周期点反应谱，偏差明显超限（> spectral_tol + rvt_tol）的记录不通过
+
+        RVT 误差范围见 rvt 模块说明；rvt_tol 应覆盖该误差，避免误删合格记录。
+        """
+        T_main = np.array(c.T_main)
+        target = CodeSpectrum.gb50011(T_main, c.Tg, c.alpha_max,
+                                      zeta=c.zeta, isolation=c.isolation)
+        safe = np.where(target > 0, target, 1.0)
+        mask = np.ones(len(records), dtype=bool)
+        for i, rec in enumerate(records):
+            peak = np.max(np.abs(rec.acc)) if len(rec.acc) else 0.0
+            if peak == 0:
                 continue
+            sa = RVT.sa(rec.acc / peak, rec.dt, T_main, c.zeta)
+            dev = np.where(target > 0, np.abs(sa - target) / safe, 0.0)
+            mask[i] = bool(np.all(dev <= c.spectral_tol + c.rvt_tol))
+        return mask
 
-            # Step 3: 底部剪力校核（可选）
-            if c.shear_check and c.mass is not None and c.stiffness is not None:
-                ok, ratio = self._check_base_shear(rec)
-                result.shear_ratio = ratio
-                result.passed_shear = ok
-                if not ok:
-                    self.results.append(result)
-                    continue
+    # ──────────────────── 多组参数扫描 ────────────────────
 
-            result.passed = True
-            self.results.append(result)
+    @staticmethod
+    def sweep(records: list[EQRecord],
+              criteria_list: list[SelectionCriteria],
+              progress_callback: Optional[Callable] = None,
+              im_index: Optional[IMIndex] = None) -> SweepResult:
+        """一次性评估多组选波参数
 
-        return [r for r in self.results if r.passed]
+        与参数无关的中间量只计算一次：有效持时按 duration_threshold 分组计算，
+        反应谱值按阻尼比分组、在所有组主周期的并集上计算。之后各组参数的
+        判断均为矩阵比较。
+
+        Parameters
+        ----------
+        records : list[EQRecord]
+            待筛选的地震动记录
+        criteria_list : list[SelectionCriteria]
+            多组选波参数（如不同场地、多遇/罕遇水准）
+        progress_callback : callable, optional
+            进度回调 fn(current, total, record_name)
+        im_index : IMIndex, optional
+            与 records 顺序一致的强度指标索引，有 im_bounds 的参数组共用
+
+        Returns
+        -------
+        SweepResult
+            (n_criteria, n_records) 的通过矩阵及中间结果
+        """
+        n_rec = len(records)
+        n_crit = len(criteria_list)
+
+        # Step 0: 强度指标预筛（索引只建立一次）
+        passed_prescreen = np.ones((n_crit, n_rec), dtype=bool)
+        if im_index is None and any(c.im_bounds for c in criteria_list):
+            im_index = IMIndex.from_records(records)
+        for i, c in enumerate(criteria_list):
+            mask = WaveSelector._prescreen(records, c, im_index)
+            if mask is not None:
+                passed_prescreen[i] = mask
+
+        # Step 1: 有效持时（仅依赖阈值）
+        batch = RecordBatch.from_records(records)
+        durations = {thd: batch.bracketed_duration(thd)
+                     for thd in {c.duration_threshold for c in criteria_list}}
+
+        eff_dur = np.vstack([durations[c.duration_threshold] for c in criteria_list]) \
+            if n_crit else np.zeros((0, n_rec))
+        required = np.array([c.duration_factor * max(c.T_main) for c in criteria_list])
+        with np.errstate(invalid='ignore'):
+            passed_duration = (eff_dur >= required[:, None]) & passed_prescreen
+        eff_dur = np.nan_to_num(eff_dur, nan=0.0)
+
+        # Step 2: 在各阻尼比的周期并集上计算反应谱（只对至少一组通过持时的记录）
+        sa_tables = {}
+        for zeta in {c.zeta for c in criteria_list}:
+            rows = [i for i, c in enumerate(criteria_list) if c.zeta == zeta]
+            periods = np.unique(np.concatenate(
+                [np.asarray(criteria_list[i].T_main, dtype=np.float64) for i in rows]
+            ))
+            sa_tables[zeta] = (periods, np.full((n_rec, len(periods)), np.nan))
+
+        for j, rec in enumerate(records):
+            if progress_callback:
+                progress_callback(j + 1, n_rec, rec.name)
+            acc = None
+            for zeta, (periods, table) in sa_tables.items():
+                rows = [i for i, c in enumerate(criteria_list) if c.zeta == zeta]
+                if not np.any(passed_duration[rows, j]):
+                    continue
+                if acc is None:
+                    acc = rec.acc / np.max(np.abs(rec.acc))
+                table[j] = [WaveSelector._sdof_peak_acc(acc, rec.dt, T, zeta)
+                            for T in periods]
+
+        passed_spectral = np.zeros((n_crit, n_rec), dtype=bool)
+        deviations = []
+        for i, c in enumerate(criteria_list):
+            periods, table = sa_tables[c.zeta]
+            T_main = np.asarray(c.T_main, dtype=np.float64)
+            sa = table[:, np.searchsorted(periods, T_main)]
+            target = CodeSpectrum.gb50011(
+                T_main, c.Tg, c.alpha_max, zeta=c.zeta, isolation=c.isolation
+            )
+            safe = np.where(target > 0, target, 1.0)
+            dev = np.where(target > 0, np.abs(sa - target) / safe, 0.0)
+            dev[~passed_duration[i]] = np.nan
+            deviations.append(dev)
+            passed_spectral[i] = passed_duration[i] & np.all(dev <= c.spectral_tol, axis=1)
+
+        # Step 3: 底部剪力校核依赖结构参数，逐组逐条计算
+        passed_shear = np.ones((n_crit, n_rec), dtype=bool)
+        for i, c in enumerate(criteria_list):
+            if not (c.shear_check and c.mass is not None and c.stiffness is not None):
+                continue
+            ws = WaveSelector(c)
+            for j in np.flatnonzero(passed_spectral[i]):
+                ok, _ = ws._check_base_shear(records[j])
+                passed_shear[i, j] = ok
+
+        return SweepResult(
+            criteria=list(criteria_list),
+            records=list(records),
+            effective_duration=eff_dur,
+            passed_prescreen=passed_prescreen,
+            passed_duration=passed_duration,
+            passed_spectral=passed_spectral,
+            passed_shear=passed_shear,
+            passed=passed_spectral & passed_shear,
+            deviations=deviations,
+        )
 
     # ──────────────────── Step 1: 有效持时 ────────────────────
 
@@ -129,29 +534,30 @@ class WaveSelector:
         -------
         (passed, effective_duration)
         """
-        c = self.criteria
-        acc = rec.acc
-        pga = np.max(np.abs(acc))
-
-        if pga == 0:
-            return False, 0.0
+        passed, duration = self._check_duration_batch(RecordBatch.from_records([rec]))
+        return bool(passed[0]), float(duration[0])
 
-        # 归一化后找超过阈值的时刻
-        threshold = c.duration_threshold * pga
-        above = np.where(np.abs(acc) >= threshold)[0]
+    def _check_duration_batch(self, batch: RecordBatch) -> tuple[np.ndarray, np.ndarray]:
+        """批量有效持时检查
 
-        if len(above) == 0:
-            return False, 0.0
+        对拼接存储的全部记录用分段归约一次算出（见 RecordBatch.bracketed_duration）。
 
-        duration = (above[-1] - above[0]) * rec.dt
-        T1 = max(c.T_main)  # 最大主周期
-        required = c.duration_factor * T1
-
-        return duration >= required, duration
+        Returns
+        -------
+        (passed, effective_duration)
+            布尔数组与持时数组，PGA 为零的记录持时为 0 且不通过
+        """
+        c = self.criteria
+        duration = batch.bracketed_duration(c.duration_threshold)
+        required = c.duration_factor * max(c.T_main)
+        with np.errstate(invalid='ignore'):
+            passed = duration >= required
+        return passed, np.nan_to_num(duration, nan=0.0)
 
     # ──────────────────── Step 2: 主周期偏差 ────────────────────
 
-    def _check_spectral_deviation(self, rec: EQRecord) -> tuple[bool, dict]:
+    def _check_spectral_deviation(self, rec: EQRecord,
+                                  should_stop: Optional[Callable] = None) -> tuple[bool, dict]:
         """主周期点反应谱偏差校核
 
         对每个主周期 Ti，计算归一化加速度反应谱值与规范谱值的偏差。
@@ -169,7 +575,7 @@ class WaveSelector:
 
         # 计算各主周期点的加速度反应谱值（Newmark-β）
         sa_values = np.array([
-            self._sdof_peak_acc(acc, rec.dt, T, c.zeta)
+            self._sdof_peak_acc(acc, rec.dt, T, c.zeta, should_stop)
             for T in T_main
         ])
 
@@ -190,7 +596,8 @@ class WaveSelector:
 
     # ──────────────────── Step 3: 底部剪力校核 ────────────────────
 
-    def _check_base_shear(self, rec: EQRecord) -> tuple[bool, float]:
+    def _check_base_shear(self, rec: EQRecord,
+                          should_stop: Optional[Callable] = None) -> tuple[bool, float]:
         """底部剪力校核
 
         时程分析底部剪力 vs SRSS 振型分解法底部剪力。
@@ -240,7 +647,8 @@ class WaveSelector:
 
         # 时程分析底部剪力
         acc_scaled = rec.acc / np.max(np.abs(rec.acc)) * 2.0  # 归一化后缩放
-        Fv_THA = self._time_history_base_shear(acc_scaled, rec.dt, M, K, k, cn, c.zeta)
+        Fv_THA = self._time_history_base_shear(acc_scaled, rec.dt, M, K, k, cn, c.zeta,
+                                               should_stop)
 
         if Fv_RS > 0:
             ratio = Fv_THA / Fv_RS
@@ -254,10 +662,11 @@ class WaveSelector:
 
     @staticmethod
     def _sdof_peak_acc(acc: np.ndarray, dt: float, period: float,
-                       zeta: float) -> float:
+                       zeta: float, should_stop: Optional[Callable] = None) -> float:
         """Newmark-β 法计算 SDOF 系统峰值绝对加速度
 
         移植自 MATLAB SelectWave_0802g.m 的 Newmark 线性加速度法。
+        每 CHECKPOINT_INTERVAL 步调用一次 should_stop，返回 True 时抛出 InterruptedError。
         """
         omega = 2.0 * np.pi / period
         k = omega ** 2
@@ -273,6 +682,8 @@ class WaveSelector:
         keff = k + 2.0 * c / dt + 4.0 / (dt ** 2)
 
         for i in range(n - 1):
+            if should_stop is not None and i % CHECKPOINT_INTERVAL == 0 and should_stop():
+                raise InterruptedError("用户取消")
             da = acc[i + 1] - acc[i]
             dp = (-da + (4.0 / dt) * vel + 2.0 * acc_r + 2.0 * c * vel)
             ddis = dp / keff
@@ -309,7 +720,8 @@ class WaveSelector:
     def _time_history_base_shear(acc: np.ndarray, dt: float,
                                   M: np.ndarray, K: np.ndarray,
                                   k_story: np.ndarray, cn: int,
-                                  zeta: float) -> float:
+                                  zeta: float,
+                                  should_stop: Optional[Callable] = None) -> float:
         """多自由度时程分析，返回底层最大剪力"""
         # Rayleigh 阻尼
         eigenvalues, _ = np.linalg.eig(np.linalg.solve(M, K))
@@ -333,6 +745,8 @@ class WaveSelector:
         max_base_shear = 0.0
 
         for i in range(n - 1):
+            if should_stop is not None and i % CHECKPOINT_INTERVAL == 0 and should_stop():
+                raise InterruptedError("用户取消")
             da = acc[i + 1] - acc[i]
             dp = (-M @ ones * da + (4.0 / dt) * M @ vel + 2.0 * M @ acc_r
                   + 2.0 * C @ vel)
@@ -365,14 +779,27 @@ class WaveSelector:
     def summary(self) -> dict:
         """生成筛选摘要"""
         total = len(self.results)
+        passed_pre = sum(1 for r in self.results if r.passed_prescreen)
         passed_dur = sum(1 for r in self.results if r.passed_duration)
         passed_spec = sum(1 for r in self.results if r.passed_spectral)
         passed_all = sum(1 for r in self.results if r.passed)
 
         return {
             "total": total,
+            "passed_prescreen": passed_pre,
             "passed_duration": passed_dur,
             "passed_spectral": passed_spec,
             "passed_all": passed_all,
             "passed_names": [r.record.name for r in self.results if r.passed],
         }
+
+
+def _evaluate_remote(criteria: SelectionCriteria, result: SelectionResult,
+                     stop_event) -> SelectionResult:
+    """进程池任务：在子进程中对单条记录执行 Step 2-3"""
+    selector = WaveSelector(criteria)
+    c = criteria
+    selector.target_spectrum = CodeSpectrum.gb50011(
+        np.array(c.T_main), c.Tg, c.alpha_max, zeta=c.zeta, isolation=c.isolation
+    )
+    return selector._evaluate(result, should_stop=stop_event.is_set)
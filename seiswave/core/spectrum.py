@@ -3,6 +3,8 @@
 
 实现 Newmark-β 法、频域法、混合法三种反应谱计算。
 周期数组支持对数/线性/混合分布（同 EQSignal C++）。
+NewmarkOperator 对固定的 (n, dt, periods, zeta) 预计算 Newmark-β 递推的
+精确传递函数，反复计算同长度波形的反应谱时只需批量 FFT。
 
 参考：
 - EQSignal C++: Spectra.h / Spectra.cpp
@@ -11,6 +13,7 @@
 """
 
 import numpy as np
+from scipy import signal
 
 
 class Spectra:
@@ -187,7 +190,7 @@ class Spectra:
             # 有效荷载
             p_eff = (-acc[i]
                      + a1 * rd[i - 1] + a2 * rv[i - 1] + a3 * ra[i - 1]
-                     + c * (a4 * rd[i - 1] + a5 * rv[i - 1] + a6 * ra[i - 1]))
+                     + c * (a4 * rd[i - 1] - a5 * rv[i - 1] - a6 * ra[i - 1]))
 
             rd[i] = p_eff / keff
             ra[i] = a1 * (rd[i] - rd[i - 1]) - a2 * rv[i - 1] - a3 * ra[i - 1]
@@ -269,3 +272,218 @@ class Spectra:
 
     def __repr__(self):
         return self.__str__()
+
+
+class NewmarkOperator:
+    """固定 (n, dt, periods, zeta) 的 Newmark-β 线性响应算子
+
+    Newmark-β 平均加速度法是线性时不变递推，绝对加速度响应可写成
+    y = h * a + a[0]·q（h 为递推的脉冲响应，q 修正初始条件 ra[0] = -a[0]），
+    与 Spectra._newmark_beta 逐步积分的结果一致（仅有舍入误差）。
+    构造时由递推系数一次算出各周期的 h、q 及其 rfft，之后每次计算
+    只需一次 rfft 和一次批量 irfft。
+    """
+
+    def __init__(self, n: int, dt: float, periods: np.ndarray, zeta=0.05):
+        """
+        Parameters
+        ----------
+        n : int
+            波形点数
+        dt : float
+            时间步长 (s)
+        periods : np.ndarray
+            周期数组 (s)
+        zeta : float or np.ndarray
+            阻尼比，数组时与 periods 一一对应
+        """
+        self.n = n
+        self.dt = dt
+        self.periods = np.asarray(periods, dtype=np.float64)
+        self.zeta = np.broadcast_to(np.asarray(zeta, dtype=np.float64),
+                                    self.periods.shape).copy()
+        # 线性卷积不回绕
+        self.nfft = 1 << int(np.ceil(np.log2(max(2 * n - 1, 1))))
+
+        n_periods = len(self.periods)
+        self.h = np.zeros((n_periods, n))
+        self.q = np.zeros((n_periods, n))
+        impulse = np.zeros(n)
+        impulse[0] = 1.0
+        for i, (T, z) in enumerate(zip(self.periods, self.zeta)):
+            A, B, C = self._state_space(dt, T, z)
+            CA = C @ A
+            # 输入脉冲响应：x_{k+1} = A x_k + B u_k, y_k = CA x_k + (CB + 1) u_k
+            b, a = signal.ss2tf(A, B[:, None], CA[None, :], [[C @ B + 1.0]])
+            self.h[i] = signal.lfilter(b[0], a, impulse)
+            # 初始状态 s_0 = -a[0]·e_ra 的自由响应
+            e_ra = np.array([0.0, 0.0, 1.0])
+            b, a = signal.ss2tf(A, e_ra[:, None], CA[None, :], [[1.0]])
+            g = -signal.lfilter(b[0], a, impulse)
+            g[0] += 1.0
+            self.q[i] = g - self.h[i]
+
+        self.H = np.fft.rfft(self.h, self.nfft, axis=-1)
+
+    @staticmethod
+    def _state_space(dt: float, period: float, zeta: float) -> tuple:
+        """Spectra._newmark_beta 的一步递推 s_i = A s_{i-1} + B a_i，s = [rd, rv, ra]"""
+        omega = 2.0 * np.pi / period
+        k = omega ** 2
+        c = 2.0 * zeta * omega
+
+        gamma = 0.5
+        beta = 0.25
+        a1 = 1.0 / (beta * dt ** 2)
+        a2 = 1.0 / (beta * dt)
+        a3 = (1.0 - 2.0 * beta) / (2.0 * beta)
+        a4 = gamma / (beta * dt)
+        a5 = 1.0 - gamma / beta
+        a6 = (1.0 - gamma / (2.0 * beta)) * dt
+        keff = k + a1 + c * a4
+
+        r = np.array([a1 + c * a4, a2 - c * a5, a3 - c * a6]) / keff
+        A = np.vstack([
+            r,
+            a4 * r + np.array([-a4, a5, a6]),
+            a1 * r - np.array([a1, a2, a3]),
+        ])
+        B = np.array([-1.0, -a4, -a1]) / keff
+        C = np.array([0.0, 0.0, 1.0])
+        return A, B, C
+
+    def response(self, acc: np.ndarray) -> np.ndarray:
+        """绝对加速度响应时程
+
+        Parameters
+        ----------
+        acc : np.ndarray
+            地面加速度，形状 (n,) 或 (m, n)
+
+        Returns
+        -------
+        np.ndarray
+            形状 (n_periods, n) 或 (m, n_periods, n)
+        """
+        acc = np.asarray(acc, dtype=np.float64)
+        if acc.shape[-1] != self.n:
+            raise ValueError(f"波形点数 {acc.shape[-1]} 与算子点数 {self.n} 不一致")
+        af = np.fft.rfft(acc, self.nfft, axis=-1)
+        y = np.fft.irfft(af[..., None, :] * self.H, self.nfft, axis=-1)[..., :self.n]
+        y += acc[..., None, :1] * self.q
+        return y
+
+    def sa(self, acc: np.ndarray) -> np.ndarray:
+        """加速度反应谱（绝对加速度峰值）
+
+        与 Spectra.compute(acc, dt, periods, zeta, method="newmark").sa 一致。
+
+        Returns
+        -------
+        np.ndarray
+            形状 (n_periods,) 或 (m, n_periods)
+        """
+        return np.max(np.abs(self.response(acc)), axis=-1)
+
+    def __str__(self):
+        return (f"NewmarkOperator(n={self.n}, dt={self.dt}, "
+                f"n_periods={len(self.periods)})")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class StreamingSpectra:
+    """分段累积的 Newmark-β 反应谱
+
+    在段间保留各周期振子的状态 [rd, rv, ra]，逐段送入与对整条记录调用
+    Spectra.compute(method="newmark") 的结果一致（仅有舍入误差），
+    内存占用只与单段长度有关，适合配合 RecordStream 处理超长记录。
+
+    每个周期的递推 s_i = A s_{i-1} + B a_i 对 rd、rv、ra 各化为一个三阶
+    IIR 滤波器，由 scipy.signal.lfilter 成段计算；段首的滤波器内部状态
+    由上一段末尾的振子状态线性换算得到。
+    """
+
+    def __init__(self, dt: float, periods: np.ndarray, zeta: float = 0.05):
+        """
+        Parameters
+        ----------
+        dt : float
+            时间步长 (s)
+        periods : np.ndarray
+            周期数组 (s)
+        zeta : float
+            阻尼比
+        """
+        self.dt = dt
+        self.periods = np.asarray(periods, dtype=np.float64)
+        self.zeta = zeta
+
+        n_periods = len(self.periods)
+        self._b = np.zeros((n_periods, 3, 4))
+        self._a = np.zeros((n_periods, 4))
+        self._zi = np.zeros((n_periods, 3, 3, 3))
+        for i, T in enumerate(self.periods):
+            A, B, _ = NewmarkOperator._state_space(dt, T, zeta)
+            for j in range(3):
+                # x_k = s_{k-1}：x_{k+1} = A x_k + B a_k，s_k[j] = A[j] x_k + B[j] a_k
+                b, a = signal.ss2tf(A, B[:, None], A[j][None, :], [[B[j]]])
+                self._b[i, j], self._a[i] = b[0], a
+                # 零输入时直接 II 型转置结构的前 3 个输出与内部状态 zi 的关系：
+                # zi = L·[y0, y1, y2]，y_m = A[j]·A^m·x
+                obs = np.vstack([A[j], A[j] @ A, A[j] @ A @ A])
+                L = np.array([[1.0, 0.0, 0.0], [a[1], 1.0, 0.0], [a[2], a[1], 1.0]])
+                self._zi[i, j] = L @ obs
+        self.reset()
+
+    def reset(self) -> None:
+        """清零振子状态与峰值，从新记录开始"""
+        n_periods = len(self.periods)
+        self.npts = 0
+        self._state = np.zeros((n_periods, 3))
+        self._sd = np.zeros(n_periods)
+        self._sv = np.zeros(n_periods)
+        self._sa = np.zeros(n_periods)
+
+    def update(self, chunk: np.ndarray) -> None:
+        """送入下一段地面加速度（与上一段首尾相接）"""
+        acc = np.asarray(chunk, dtype=np.float64)
+        if len(acc) == 0:
+            return
+        if self.npts == 0:
+            # 初始条件 rd = rv = 0, ra = -a0，绝对加速度为 0
+            self._state[:, 2] = -acc[0]
+            self.npts = 1
+            acc = acc[1:]
+            if len(acc) == 0:
+                return
+
+        peaks = (self._sd, self._sv, self._sa)
+        for i in range(len(self.periods)):
+            s_prev = self._state[i].copy()
+            for j in range(3):
+                y, _ = signal.lfilter(self._b[i, j], self._a[i], acc,
+                                      zi=self._zi[i, j] @ s_prev)
+                self._state[i, j] = y[-1]
+                if j == 2:
+                    y = y + acc
+                peaks[j][i] = max(peaks[j][i], np.max(np.abs(y)))
+        self.npts += len(acc)
+
+    def result(self) -> Spectra:
+        """到目前为止的反应谱"""
+        sp = Spectra(self.periods, self.zeta)
+        sp.sa = self._sa.copy()
+        sp.sv = self._sv.copy()
+        sp.sd = self._sd.copy()
+        omega = 2.0 * np.pi / self.periods
+        sp.se = 0.5 * omega ** 2 * sp.sd ** 2
+        return sp
+
+    def __str__(self):
+        return (f"StreamingSpectra(dt={self.dt}, n_periods={len(self.periods)}, "
+                f"npts={self.npts})")
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,236 @@
+"""
+二进制记录库模块
+
+将大量地震动记录一次性转换为二进制库，之后每次会话直接内存映射，
+不再重复解析 ASCII 文件：
+
+    <库目录>/data.bin    所有记录加速度首尾拼接的原始数组（float64 或 float32）
+    <库目录>/index.npz   偏移量、dt、名称、源文件路径、元数据（JSON）
+
+打开库只读取索引并建立 np.memmap，单条记录的 acc 是映射数组的切片视图，
+数据在首次访问时才由操作系统按页读入。
+"""
+
+import os
+import json
+import numpy as np
+from typing import Callable, Optional
+
+from .io import FileIO, EQRecord
+from .batch import RecordBatch
+
+# 库格式版本，索引结构变化时递增
+STORE_VERSION = 1
+
+DATA_FILE = 'data.bin'
+INDEX_FILE = 'index.npz'
+
+
+class RecordStore:
+    """内存映射的二进制记录库
+
+    第 i 条记录的数据为 data[offsets[i]:offsets[i + 1]]，与 RecordBatch 的
+    ragged 存储一致。
+    """
+
+    def __init__(self, path: str, mode: str = 'r'):
+        """打开已有记录库
+
+        Parameters
+        ----------
+        path : str
+            库目录
+        mode : str
+            np.memmap 打开模式：'r' 只读（默认），'c' 写时复制，'r+' 可写回文件
+        """
+        index_path = os.path.join(path, INDEX_FILE)
+        data_path = os.path.join(path, DATA_FILE)
+        if not os.path.isfile(index_path) or not os.path.isfile(data_path):
+            raise FileNotFoundError(f"记录库不存在或不完整: {path}")
+
+        with np.load(index_path) as index:
+            version = int(index['version'])
+            if version != STORE_VERSION:
+                raise ValueError(
+                    f"记录库版本 {version} 与当前支持的版本 {STORE_VERSION} 不一致: {path}"
+                )
+            self.offsets = index['offsets']
+            self.dt = index['dt']
+            self.names = [str(n) for n in index['names']]
+            self.filepaths = [str(p) for p in index['filepaths']]
+            self.metadata = json.loads(str(index['metadata']))
+            self.dtype = np.dtype(str(index['dtype']))
+
+        self.path = path
+        n_samples = int(self.offsets[-1])
+        if n_samples:
+            self.data = np.memmap(data_path, dtype=self.dtype, mode=mode,
+                                  shape=(n_samples,))
+        else:
+            # 空文件无法映射
+            self.data = np.zeros(0, dtype=self.dtype)
+
+    # ──────────────────── 建库 ────────────────────
+
+    @classmethod
+    def build(cls, path: str, records: list[EQRecord],
+              dtype=np.float64) -> 'RecordStore':
+        """由记录列表建库，逐条写入数据文件后打开
+
+        数据先写入临时文件再替换 data.bin，已打开的 RecordStore 仍映射旧文件。
+
+        Parameters
+        ----------
+        path : str
+            库目录（不存在时创建，已有库被覆盖）
+        records : list[EQRecord]
+            地震动记录
+        dtype : np.dtype
+            存储精度，np.float64（与原数据一致）或 np.float32（体积减半）
+
+        Returns
+        -------
+        RecordStore
+        """
+        dtype = RecordStore._check_dtype(dtype)
+        os.makedirs(path, exist_ok=True)
+        tmp_path = os.path.join(path, DATA_FILE + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            lengths = [RecordStore._write(f, rec.acc, dtype) for rec in records]
+        headers = [(rec.dt, rec.name, rec.filepath, rec.metadata) for rec in records]
+        return cls._commit(path, tmp_path, lengths, headers, dtype)
+
+    @classmethod
+    def from_directory(cls, path: str, directory: str, pattern: str = "*.AT2",
+                       recursive: bool = False, dtype=np.float64,
+                       workers: Optional[int] = 1, executor: str = "thread",
+                       progress_callback: Optional[Callable] = None) -> 'RecordStore':
+        """加载目录下的文件并逐条写入数据文件建库
+
+        每条记录解析完成后立即写入，不在内存中保留整个记录库；记录顺序与
+        FileIO.batch_load 相同。并行加载的完成顺序与文件顺序不一致时，
+        写完后再按文件顺序逐条重排一次数据文件。
+
+        Parameters
+        ----------
+        path : str
+            库目录
+        directory, pattern, recursive, workers, executor, progress_callback
+            同 FileIO.batch_load()
+        dtype : np.dtype
+            同 build()
+        """
+        dtype = RecordStore._check_dtype(dtype)
+        files = FileIO._find_files(directory, pattern, recursive)
+        os.makedirs(path, exist_ok=True)
+
+        # 按完成顺序追加写入：文件序号 → (写入位置, 点数, 头信息)
+        parts = {}
+        written = 0
+        part_path = os.path.join(path, DATA_FILE + '.part')
+        with open(part_path, 'wb') as f:
+            def write(idx, rec):
+                nonlocal written
+                n = RecordStore._write(f, rec.acc, dtype)
+                parts[idx] = (written, n, (rec.dt, rec.name, rec.filepath, rec.metadata))
+                written += n
+
+            FileIO.load_files(files, workers=workers, executor=executor,
+                              progress_callback=progress_callback,
+                              result_callback=write, return_records=False)
+
+        order = sorted(parts)
+        if list(parts) == order:
+            tmp_path = part_path
+        else:
+            tmp_path = os.path.join(path, DATA_FILE + '.tmp')
+            with open(part_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                for i in order:
+                    pos, n, _ = parts[i]
+                    src.seek(pos * dtype.itemsize)
+                    dst.write(src.read(n * dtype.itemsize))
+            os.remove(part_path)
+        lengths = [parts[i][1] for i in order]
+        headers = [parts[i][2] for i in order]
+        return cls._commit(path, tmp_path, lengths, headers, dtype)
+
+    @staticmethod
+    def _check_dtype(dtype) -> np.dtype:
+        dtype = np.dtype(dtype)
+        if dtype not in (np.dtype(np.float64), np.dtype(np.float32)):
+            raise ValueError(f"dtype 须为 float64 或 float32，当前为 {dtype}")
+        return dtype
+
+    @staticmethod
+    def _write(f, acc: np.ndarray, dtype: np.dtype) -> int:
+        """将一条记录的数据追加到文件，返回点数"""
+        acc = np.ascontiguousarray(acc, dtype=dtype)
+        f.write(acc.tobytes())
+        return len(acc)
+
+    @classmethod
+    def _commit(cls, path: str, tmp_path: str, lengths: list, headers: list,
+                dtype: np.dtype) -> 'RecordStore':
+        """以临时数据文件替换 data.bin，写入索引后打开
+
+        headers 为各记录的 (dt, 名称, 源文件路径, 元数据)。
+        """
+        index_path = os.path.join(path, INDEX_FILE)
+        # 先删除索引，替换中断时不会留下与数据不一致的旧索引
+        if os.path.isfile(index_path):
+            os.remove(index_path)
+        os.replace(tmp_path, os.path.join(path, DATA_FILE))
+
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths, dtype=np.int64)
+        np.savez(
+            index_path,
+            version=STORE_VERSION,
+            dtype=dtype.str,
+            offsets=offsets,
+            dt=np.array([h[0] for h in headers], dtype=np.float64),
+            names=np.array([h[1] for h in headers], dtype=str),
+            filepaths=np.array([h[2] for h in headers], dtype=str),
+            metadata=json.dumps([h[3] for h in headers], ensure_ascii=False),
+        )
+        return cls(path)
+
+    # ──────────────────── 访问 ────────────────────
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """各记录数据点数"""
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> EQRecord:
+        """第 index 条记录（acc 为映射数组的视图，不复制）"""
+        acc = self.data[self.offsets[index]:self.offsets[index + 1]]
+        return EQRecord(acc=acc, dt=float(self.dt[index]), name=self.names[index],
+                        filepath=self.filepaths[index],
+                        metadata=self.metadata[index])
+
+    def records(self) -> list[EQRecord]:
+        """全部记录（均为视图）"""
+        return [self[i] for i in range(len(self))]
+
+    def batch(self) -> RecordBatch:
+        """以映射数组为数据的 RecordBatch（不复制）"""
+        return RecordBatch(self.data, self.offsets, self.dt, self.names)
+
+    def close(self) -> None:
+        """释放数据文件映射
+
+        映射在最后一个引用（含 records() 等返回的视图）释放后才真正关闭；
+        替换或删除数据文件前须先调用，并丢弃已取得的记录。
+        """
+        self.data = np.zeros(0, dtype=self.dtype)
+
+    def __str__(self):
+        return (f"RecordStore(path='{self.path}', n_records={len(self)}, "
+                f"n_samples={len(self.data)}, dtype={self.dtype})")
+
+    def __repr__(self):
+        return self.__str__()
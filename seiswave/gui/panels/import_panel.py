@@ -5,6 +5,7 @@
 """
 
 import os
+import functools
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
     QPushButton, QFileDialog, QLineEdit, QComboBox, QFormLayout,
@@ -12,9 +13,11 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Signal, Qt
 
-from seiswave.core import FileIO, EQSignal
+from seiswave.core import FileIO
 from seiswave.gui.widgets.wave_table import WaveTable
 from seiswave.gui.widgets.plot_widget import PlotWidget
+from seiswave.gui.widgets.progress_dialog import ProgressDialog
+from seiswave.gui.workers import LoadWorker
 from seiswave.gui.styles import get_mpl_colors
 
 
@@ -28,6 +31,8 @@ class ImportPanel(QWidget):
         self._dark = dark
         self._signals = []
         self._current_dir = ""
+        self._worker = None
+        self._loaded_count = 0
         self._setup_ui()
 
     def _setup_ui(self):
@@ -104,7 +109,7 @@ class ImportPanel(QWidget):
             self._current_dir = dir_path
 
     def _load_files(self):
-        """加载地震动文件"""
+        """加载地震动文件（后台线程池并行解析）"""
         dir_path = self._dir_edit.text()
         if not dir_path or not os.path.isdir(dir_path):
             QMessageBox.warning(self, "警告", "请先选择有效的数据目录")
@@ -114,38 +119,52 @@ class ImportPanel(QWidget):
         pattern_map = {0: "*.AT2", 1: "*.txt", 2: "*.txt", 3: "*.csv"}
         pattern = pattern_map[fmt_idx]
 
-        try:
-            import glob
-            files = sorted(glob.glob(os.path.join(dir_path, pattern)))
-            if not files:
-                # 尝试小写扩展名
-                pattern_lower = pattern.lower()
-                files = sorted(glob.glob(os.path.join(dir_path, pattern_lower)))
-
-            if not files:
-                QMessageBox.information(self, "提示", f"目录中未找到 {pattern} 文件")
-                return
-
-            signals = []
-            for f in files:
-                try:
-                    if fmt_idx == 0:  # AT2
-                        sig = EQSignal.from_at2(f)
-                    else:
-                        # txt/csv 需要 dt，默认 0.02
-                        sig = EQSignal.from_txt(f, dt=0.02,
-                                                single_col=(fmt_idx == 1))
-                    signals.append(sig)
-                except Exception:
-                    continue  # 跳过无法解析的文件
-
-            self._signals = signals
-            self._table.load_signals(signals)
-            self._count_label.setText(f"已加载: {len(signals)} 条")
-            self.signals_loaded.emit(signals)
-
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"加载失败: {e}")
+        import glob
+        files = sorted(glob.glob(os.path.join(dir_path, pattern)))
+        if not files:
+            # 尝试小写扩展名
+            pattern_lower = pattern.lower()
+            files = sorted(glob.glob(os.path.join(dir_path, pattern_lower)))
+
+        if not files:
+            QMessageBox.information(self, "提示", f"目录中未找到 {pattern} 文件")
+            return
+
+        if fmt_idx == 0:  # AT2
+            reader = FileIO.read_at2
+        else:
+            # txt/csv 需要 dt，默认 0.02
+            reader = functools.partial(FileIO.read_txt, dt=0.02,
+                                       single_col=(fmt_idx == 1))
+
+        progress = ProgressDialog("加载地震动文件...", self)
+        self._loaded_count = 0
+        self._worker = LoadWorker(files, reader=reader, parent=self)
+        self._worker.signals.progress.connect(progress.update_progress)
+        self._worker.signals.partial.connect(self._on_file_loaded)
+        progress.cancelled.connect(self._worker.cancel)
+        self._worker.signals.finished.connect(
+            lambda signals: self._on_load_done(signals, progress))
+        self._worker.signals.error.connect(
+            lambda err: progress.set_finished(f"加载失败: {err}"))
+
+        self._worker.start()
+        progress.exec()
+
+        if progress.is_cancelled and self._worker:
+            self._worker.cancel()
+
+    def _on_file_loaded(self, index, sig):
+        """单个文件加载完成（按完成顺序逐条调用）"""
+        self._loaded_count += 1
+        self._count_label.setText(f"已加载: {self._loaded_count} 条")
+
+    def _on_load_done(self, signals, progress):
+        self._signals = signals
+        self._table.load_signals(signals)
+        self._count_label.setText(f"已加载: {len(signals)} 条")
+        progress.set_finished(f"加载完成，共 {len(signals)} 条")
+        self.signals_loaded.emit(signals)
 
     def _on_wave_selected(self, row):
         """选中地震波时预览"""
@@ -159,9 +159,9 @@ class ResultPanel(QWidget):
 
         if self._results:
             if self._export_passed_check.isChecked():
-                signals_to_export = [r.signal for r in self._results if r.passed]
+                signals_to_export = [r.record for r in self._results if r.passed]
             else:
-                signals_to_export = [r.signal for r in self._results]
+                signals_to_export = [r.record for r in self._results]
 
         if self._export_generated_check.isChecked():
             signals_to_export.extend(self._generated_waves)
@@ -205,9 +205,9 @@ class ResultPanel(QWidget):
         if self._export_wave_spec_check.isChecked() and self._results:
             passed = [r for r in self._results if r.passed]
             for r in passed:
-                spec = Spectra.compute(r.signal.acc, r.signal.dt,
+                spec = Spectra.compute(r.record.acc, r.record.dt,
                                        self._code_periods, 0.05)
-                name = (r.signal.name or "wave").replace("/", "_")
+                name = (r.record.name or "wave").replace("/", "_")
                 FileIO.write_csv(
                     os.path.join(out_dir, f"spectrum_{name}.csv"),
                     T=self._code_periods, Sa=spec.sa,
@@ -241,9 +241,9 @@ class ResultPanel(QWidget):
         passed = [r for r in self._results if r.passed]
         palette = colors['palette']
         for i, r in enumerate(passed):
-            spec = Spectra.compute(r.signal.acc, r.signal.dt,
+            spec = Spectra.compute(r.record.acc, r.record.dt,
                                    self._code_periods, 0.05)
-            ax.plot(self._code_periods, spec.sa, label=r.signal.name,
+            ax.plot(self._code_periods, spec.sa, label=r.record.name,
                     color=palette[i % len(palette)], linewidth=1.2, alpha=0.8)
 
         ax.set_xscale('log')
@@ -289,7 +289,7 @@ class ResultPanel(QWidget):
         for i, r in enumerate(passed, 1):
             devs = ", ".join(f"T={k:.3f}s: {v*100:.1f}%"
                             for k, v in sorted(r.deviations.items()))
-            lines.append(f"  {i}. {r.signal.name}")
+            lines.append(f"  {i}. {r.record.name}")
             lines.append(f"     有效持时: {r.effective_duration:.2f} s")
             lines.append(f"     谱偏差: {devs}")
             if r.shear_ratio is not None:
@@ -303,7 +303,7 @@ class ResultPanel(QWidget):
         ])
         failed = [r for r in self._results if not r.passed]
         for i, r in enumerate(failed, 1):
-            lines.append(f"  {i}. {r.signal.name}")
+            lines.append(f"  {i}. {r.record.name}")
 
         report_text = "\n".join(lines)
         self._preview.setPlainText(report_text)
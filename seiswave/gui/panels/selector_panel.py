@@ -17,7 +17,7 @@ from PySide6.QtCore import Signal, Qt
 from seiswave.core import WaveSelector, SelectionCriteria, Spectra, CodeSpectrum
 from seiswave.gui.widgets.spectrum_plot import SpectrumPlot
 from seiswave.gui.widgets.progress_dialog import ProgressDialog
-from seiswave.gui.workers import SelectionWorker, BatchSpectrumWorker
+from seiswave.gui.workers import ParallelSelectionWorker, BatchSpectrumWorker
 from seiswave.gui.styles import get_mpl_colors
 
 
@@ -34,6 +34,7 @@ class SelectorPanel(QWidget):
         self._code_sa = None
         self._results = []
         self._worker = None
+        self._selector = None  # 跨次保留，复用逐条结果缓存
         self._setup_ui()
 
     def _setup_ui(self):
@@ -179,14 +180,21 @@ class SelectorPanel(QWidget):
             shear_range=(self._shear_low_spin.value(), self._shear_high_spin.value()),
         )
 
-        selector = WaveSelector(criteria)
+        if self._selector is None:
+            self._selector = WaveSelector(criteria)
+        else:
+            self._selector.criteria = criteria
+        selector = self._selector
         selector.target_spectrum = (self._code_periods, self._code_sa)
 
         # 进度对话框
         progress = ProgressDialog("选波计算中...", self)
 
-        self._worker = SelectionWorker(selector, self._signals, parent=self)
+        self._result_table.setRowCount(len(self._signals))
+        self._worker = ParallelSelectionWorker(selector, self._signals, parent=self)
         self._worker.signals.progress.connect(progress.update_progress)
+        self._worker.signals.partial.connect(self._set_result_row)
+        progress.cancelled.connect(self._worker.cancel)
         self._worker.signals.finished.connect(
             lambda results: self._on_selection_done(results, progress))
         self._worker.signals.error.connect(
@@ -205,18 +213,7 @@ class SelectorPanel(QWidget):
         # 填充结果表格
         self._result_table.setRowCount(len(results))
         for i, r in enumerate(results):
-            self._result_table.setItem(i, 0, QTableWidgetItem(r.signal.name))
-            self._result_table.setItem(i, 1, QTableWidgetItem(f"{r.effective_duration:.2f}"))
-            for j, t_key in enumerate(sorted(r.deviations.keys())):
-                val = r.deviations[t_key] * 100
-                self._result_table.setItem(i, 2 + j, QTableWidgetItem(f"{val:.1f}"))
-            status = "✓" if r.passed else "✗"
-            self._result_table.setItem(i, 5, QTableWidgetItem(status))
-            # 右对齐数值列
-            for j in range(1, 6):
-                item = self._result_table.item(i, j)
-                if item:
-                    item.setTextAlignment(Qt.AlignCenter)
+            self._set_result_row(i, r)
 
         passed = sum(1 for r in results if r.passed)
         self._stat_label.setText(
@@ -228,6 +225,21 @@ class SelectorPanel(QWidget):
         self._plot_passed_spectra()
         self.selection_done.emit(results)
 
+    def _set_result_row(self, i, r):
+        """填充结果表格的一行（并行选波时逐条调用）"""
+        self._result_table.setItem(i, 0, QTableWidgetItem(r.record.name))
+        self._result_table.setItem(i, 1, QTableWidgetItem(f"{r.effective_duration:.2f}"))
+        for j, t_key in enumerate(sorted(r.deviations.keys())):
+            val = r.deviations[t_key] * 100
+            self._result_table.setItem(i, 2 + j, QTableWidgetItem(f"{val:.1f}"))
+        status = "✓" if r.passed else "✗"
+        self._result_table.setItem(i, 5, QTableWidgetItem(status))
+        # 右对齐数值列
+        for j in range(1, 6):
+            item = self._result_table.item(i, j)
+            if item:
+                item.setTextAlignment(Qt.AlignCenter)
+
     def _on_selection_error(self, err, progress):
         progress.set_finished(f"计算出错: {err}")
 
@@ -250,9 +262,9 @@ class SelectorPanel(QWidget):
         wave_spectra = []
         wave_labels = []
         for r in passed:
-            spec = Spectra.compute(r.signal.acc, r.signal.dt, periods, 0.05)
+            spec = Spectra.compute(r.record.acc, r.record.dt, periods, 0.05)
             wave_spectra.append(spec.sa)
-            wave_labels.append(r.signal.name)
+            wave_labels.append(r.record.name)
 
         self._plot.plot_comparison(periods, self._code_sa, wave_spectra, wave_labels)
         self._plot.plot_envelope(periods, self._code_sa)
@@ -268,15 +280,15 @@ class SelectorPanel(QWidget):
 
         r = self._results[row]
         periods = self._code_periods
-        spec = Spectra.compute(r.signal.acc, r.signal.dt, periods, 0.05)
+        spec = Spectra.compute(r.record.acc, r.record.dt, periods, 0.05)
 
         self._plot.clear()
         self._plot.plot_code_spectrum(periods, self._code_sa)
         self._plot.plot_envelope(periods, self._code_sa)
         colors = get_mpl_colors(self._dark)
-        self._plot.plot_spectrum(periods, spec.sa, label=r.signal.name,
+        self._plot.plot_spectrum(periods, spec.sa, label=r.record.name,
                                 color=colors['primary'], linewidth=2.0)
-        self._plot.ax.set_title(f"反应谱对比: {r.signal.name}", fontsize=11)
+        self._plot.ax.set_title(f"反应谱对比: {r.record.name}", fontsize=11)
         self._plot.refresh()
 
     def get_results(self):
@@ -7,12 +7,14 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QProgressBar, QPushButton, QHBoxLayout,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 
 
 class ProgressDialog(QDialog):
     """计算进度对话框"""
 
+    cancelled = Signal()  # 用户点击取消
+
     def __init__(self, title="计算中...", parent=None):
         super().__init__(parent)
         self.setWindowTitle(title)
@@ -46,6 +48,7 @@ class ProgressDialog(QDialog):
         self._cancelled = True
         self._label.setText("正在取消...")
         self._cancel_btn.setEnabled(False)
+        self.cancelled.emit()
 
     @property
     def is_cancelled(self):
@@ -11,6 +11,7 @@ class WorkerSignals(QObject):
     """通用 Worker 信号"""
     started = Signal()
     progress = Signal(int, str)       # (百分比, 描述)
+    partial = Signal(int, object)     # (序号, 单条中间结果)，流式返回
     finished = Signal(object)         # 结果对象
     error = Signal(str)               # 错误信息
 
@@ -99,14 +100,84 @@ class SelectionWorker(BaseWorker):
         self._signals = signals
 
     def execute(self):
-        def progress_cb(pct, msg):
+        def progress_cb(current, total, name):
             if self.is_cancelled:
                 raise InterruptedError("用户取消")
-            self.signals.progress.emit(pct, msg)
+            pct = int(current / total * 100)
+            self.signals.progress.emit(pct, f"选波 {current}/{total}: {name}")
 
         return self._selector.select(self._signals, progress_callback=progress_cb)
 
 
+class ParallelSelectionWorker(BaseWorker):
+    """并行选波 Worker
+
+    通过 WaveSelector.select_parallel 在进程池中积分，每完成一条即发出
+    partial 信号；取消请求会传递到子进程的积分检查点。
+    完成后返回全部记录的筛选结果（保持输入顺序）。
+    """
+
+    def __init__(self, selector, signals, workers=None, parent=None):
+        super().__init__(parent)
+        self._selector = selector
+        self._signals = signals
+        self._workers = workers
+
+    def execute(self):
+        def progress_cb(current, total, name):
+            pct = int(current / total * 100)
+            self.signals.progress.emit(pct, f"选波 {current}/{total}: {name}")
+
+        def result_cb(index, result):
+            self.signals.partial.emit(index, result)
+
+        self._selector.select_parallel(
+            self._signals, workers=self._workers,
+            progress_callback=progress_cb,
+            result_callback=result_cb,
+            should_stop=lambda: self.is_cancelled,
+        )
+        return self._selector.results
+
+
+class LoadWorker(BaseWorker):
+    """文件加载 Worker
+
+    通过 FileIO.load_files 并行解析文件，每加载一条即发出 partial 信号
+    (文件序号, EQSignal)。完成后返回按文件顺序排列的 EQSignal 列表，
+    解析失败的文件被跳过。
+    """
+
+    def __init__(self, files, reader=None, workers=None, executor="thread",
+                 parent=None):
+        super().__init__(parent)
+        self._files = files
+        self._reader = reader
+        self._workers = workers
+        self._executor = executor
+
+    def execute(self):
+        import os
+        from seiswave.core import FileIO, EQSignal
+
+        def progress_cb(current, total, filepath):
+            if self.is_cancelled:
+                raise InterruptedError("用户取消")
+            pct = int(current / total * 100)
+            self.signals.progress.emit(
+                pct, f"加载 {current}/{total}: {os.path.basename(filepath)}")
+
+        def result_cb(index, rec):
+            self.signals.partial.emit(index, EQSignal(rec.acc, rec.dt, name=rec.name))
+
+        records = FileIO.load_files(
+            self._files, reader=self._reader,
+            workers=self._workers, executor=self._executor,
+            progress_callback=progress_cb, result_callback=result_cb,
+        )
+        return [EQSignal(rec.acc, rec.dt, name=rec.name) for rec in records]
+
+
 class GeneratorWorker(BaseWorker):
     """人工波生成 Worker"""
 
@@ -125,10 +196,12 @@ class GeneratorWorker(BaseWorker):
     def execute(self):
         from seiswave.core import WaveGenerator
 
-        def progress_cb(pct, msg):
+        def progress_cb(iteration, max_err, mean_err):
             if self.is_cancelled:
                 raise InterruptedError("用户取消")
-            self.signals.progress.emit(pct, msg)
+            pct = int(iteration / self._max_iter * 100)
+            self.signals.progress.emit(
+                pct, f"迭代 {iteration}/{self._max_iter}  最大偏差 {max_err:.1%}")
 
         return WaveGenerator.generate(
             self._target, self._periods,
@@ -1,7 +1,7 @@
 """
 SeisWave v2 核心库测试
 
-覆盖: IO, Signal, Spectrum, CodeSpec, Filter, FFT, Generator, Selector
+覆盖: IO, Signal, Spectrum, CodeSpec, Filter, FFT, Generator, Stochastic, PSD, Envelope, Selector, Intensity, Batch, Store, Catalog, Library, Dedup
 """
 import os
 import tempfile
@@ -59,6 +59,188 @@ class TestFileIO:
         finally:
             os.unlink(path)
 
+    def test_block_writers_match_per_value_format(self):
+        import csv
+        import io as _io
+        from seiswave.core import FileIO
+        acc = np.concatenate([np.random.default_rng(0).standard_normal(12),
+                              [np.nan, -np.inf, -0.0]])
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'w.AT2')
+            FileIO.write_at2(path, acc, 0.01)
+            lines = open(path).read().splitlines()
+            assert lines[3] == 'NPTS=       15, DT=   0.010000 SEC'
+            assert lines[4:] == [''.join(f'{v:>15.7E}' for v in acc[i:i + 5])
+                                 for i in range(0, 15, 5)]
+
+            path = os.path.join(d, 'w.txt')
+            FileIO.write_txt(path, acc[:7], 0.02, two_col=True)
+            ref = os.path.join(d, 'ref.txt')
+            np.savetxt(ref, np.column_stack([np.arange(7) * 0.02, acc[:7]]),
+                       fmt='%15.7E', delimiter='  ', comments='# ',
+                       header='Time(s)  Acceleration\ndt=0.02  npts=7')
+            assert open(path, 'rb').read() == open(ref, 'rb').read()
+
+            path = os.path.join(d, 'w.csv')
+            FileIO.write_csv(path, t=acc, a=acc[:4])
+            buf = _io.StringIO(newline='')
+            writer = csv.writer(buf)
+            writer.writerow(['t', 'a'])
+            for i, v in enumerate(acc):
+                writer.writerow([f'{v:.7E}', f'{acc[i]:.7E}' if i < 4 else ''])
+            assert open(path, newline='').read() == buf.getvalue()
+
+    def test_read_at2_malformed_tokens(self):
+        from seiswave.core import FileIO
+        text = ("h1\r\nh2\r\nh3\r\nNPTS=    5, DT= .0100 SEC\r\n"
+                "  1.0E-03  2.0E-03  ***  3.0E-03\r\n  4.0D-03  5.0E-03  6.0E-03\r\n")
+        with tempfile.NamedTemporaryFile(suffix='.AT2', delete=False) as f:
+            f.write(text.encode())
+            path = f.name
+        try:
+            # 非数值记号逐个跳过，多余数据截断到 NPTS
+            rec = FileIO.read_at2(path)
+            np.testing.assert_array_equal(rec.acc, [1e-3, 2e-3, 3e-3, 5e-3, 6e-3])
+            assert rec.dt == pytest.approx(0.01)
+            assert rec.metadata['header3'] == 'h3'
+        finally:
+            os.unlink(path)
+
+    def test_batch_load_parallel_ordered(self):
+        from seiswave.core import FileIO
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as d:
+            for i in range(6):
+                FileIO.write_at2(os.path.join(d, f'w{i}.AT2'),
+                                 rng.standard_normal(100 + i), 0.01)
+            with open(os.path.join(d, 'bad.AT2'), 'w') as f:
+                f.write('too short\n')
+            with pytest.warns(UserWarning, match='bad.AT2'):
+                seq = FileIO.batch_load(d)
+            names = [r.name for r in seq]
+            assert names == [f'w{i}' for i in range(6)]
+            for executor in ('thread', 'process'):
+                streamed = []
+                with pytest.warns(UserWarning, match='bad.AT2'):
+                    par = FileIO.batch_load(
+                        d, workers=2, executor=executor,
+                        result_callback=lambda i, r: streamed.append((i, r.name)))
+                assert [r.name for r in par] == names
+                for a, b in zip(par, seq):
+                    np.testing.assert_array_equal(a.acc, b.acc)
+                # 序号对应排序后的文件列表（bad.AT2 排在首位）
+                assert sorted(streamed) == [(i + 1, n) for i, n in enumerate(names)]
+        with pytest.raises(ValueError):
+            FileIO.load_files([], executor='fiber')
+
+    def test_lazy_record_lru(self):
+        from seiswave.core import FileIO, LazyRecord, WaveformCache
+        rng = np.random.default_rng(0)
+        old_cache = LazyRecord.cache
+        # 缓存上限只够两条 400 点 float64 波形
+        LazyRecord.cache = WaveformCache(max_bytes=2 * 400 * 8)
+        try:
+            with tempfile.TemporaryDirectory() as d:
+                for i in range(3):
+                    FileIO.write_at2(os.path.join(d, f'w{i}.AT2'),
+                                     rng.standard_normal(400), 0.01)
+                lazy = FileIO.batch_scan(d)
+                full = FileIO.batch_load(d)
+                assert [r.name for r in lazy] == [r.name for r in full]
+                assert all(r.npts == 400 and not r.is_loaded for r in lazy)
+                assert lazy[0].metadata == full[0].metadata
+
+                for r, ref in zip(lazy, full):
+                    np.testing.assert_array_equal(r.acc, ref.acc)
+                # 最久未使用的 w0 被淘汰
+                assert [r.is_loaded for r in lazy] == [False, True, True]
+                assert LazyRecord.cache.nbytes == 2 * 400 * 8
+                assert lazy[2].acc is lazy[2].acc
+                assert not lazy[2].acc.flags.writeable
+                assert lazy[2].load().npts == 400
+
+                # 不缓存时同样返回只读数组
+                uncached = LazyRecord.from_at2(lazy[0].filepath, cache=False)
+                assert not uncached.acc.flags.writeable
+                assert not uncached.is_loaded
+        finally:
+            LazyRecord.cache = old_cache
+
+    def test_load_from_zip(self, monkeypatch):
+        import shutil
+        import zipfile
+        from seiswave.core import FileIO
+        from seiswave.core import io as sio
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, 'src', 'sub')
+            os.makedirs(src)
+            for i in range(3):
+                FileIO.write_at2(os.path.join(src, f'w{i}.AT2'),
+                                 rng.standard_normal(200), 0.01)
+            FileIO.write_txt(os.path.join(src, 'w3.txt'), rng.standard_normal(50),
+                             0.02, two_col=True)
+            archive = os.path.join(d, 'lib.zip')
+            with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+                for fn in sorted(os.listdir(src)):
+                    zf.write(os.path.join(src, fn), f'sub/{fn}')
+
+            ref = FileIO.batch_load(os.path.join(d, 'src'), recursive=True)
+            # 非递归只查找归档根目录
+            assert FileIO.batch_load(archive) == []
+            recs = FileIO.batch_load(archive, recursive=True, workers=2)
+            assert [r.name for r in recs] == [r.name for r in ref]
+            assert recs[0].filepath == os.path.join(archive, 'sub', 'w0.AT2')
+            for a, b in zip(recs, ref):
+                np.testing.assert_array_equal(a.acc, b.acc)
+                assert a.dt == pytest.approx(b.dt)
+
+            txt = FileIO.batch_load(archive, pattern='*.txt', recursive=True)
+            assert len(txt) == 1 and txt[0].dt == pytest.approx(0.02)
+            lazy = FileIO.batch_scan(archive, recursive=True)
+            assert [r.npts for r in lazy] == [200, 200, 200]
+            np.testing.assert_array_equal(lazy[1].acc, ref[1].acc)
+            with pytest.raises(FileNotFoundError):
+                FileIO.read_at2(os.path.join(archive, 'sub', 'missing.AT2'))
+
+            # 批量读取结束后不再持有归档句柄（含已结束的工作线程）
+            FileIO.batch_load(archive, recursive=True, workers=2)
+            assert sio._zip_tables == {}
+            # 每个线程保留的句柄数有上限
+            monkeypatch.setattr(sio, 'ZIP_HANDLES', 1)
+            copy = os.path.join(d, 'copy.zip')
+            shutil.copy(archive, copy)
+            first = sio._zip_handle(archive)
+            sio._zip_handle(copy)
+            assert first.fp is None
+            FileIO.close_archives()
+            assert sio._zip_tables == {}
+
+    def test_record_stream_windows(self):
+        from seiswave.core import FileIO, RecordStream
+        rng = np.random.default_rng(0)
+        acc = rng.standard_normal(2500)
+        with tempfile.TemporaryDirectory() as d:
+            at2 = os.path.join(d, 'long.AT2')
+            FileIO.write_at2(at2, acc, 0.005)
+            txt = os.path.join(d, 'long.txt')
+            with open(txt, 'w') as f:
+                f.write('station XYZ\n# time acc\n')
+                f.write(''.join(f'{i * 0.005:.3f} {v:.17g}\n' for i, v in enumerate(acc)))
+
+            windows = list(RecordStream(at2, window=1000, overlap=200))
+            assert [w.start for w in windows] == [0, 800, 1600]
+            assert [len(w.data) for w in windows] == [1000, 1000, 900]
+            np.testing.assert_array_equal(windows[1].data[:200], windows[0].data[-200:])
+            np.testing.assert_array_equal(
+                np.concatenate([w.new for w in windows]), FileIO.read_at2(at2).acc)
+
+            stream = RecordStream(txt, window=1000)
+            assert stream.dt == pytest.approx(0.005)
+            np.testing.assert_array_equal(np.concatenate([w.data for w in stream]), acc)
+            with pytest.raises(ValueError):
+                RecordStream(txt, window=100, overlap=100)
+
 
 # ═══════════════════ Signal Module ═══════════════════
 
@@ -173,6 +355,21 @@ class TestSpectra:
         peak_idx = np.argmax(sp.sa)
         assert periods[peak_idx] == pytest.approx(0.2, abs=0.1)
 
+    def test_newmark_operator_matches_compute(self):
+        from seiswave.core import Spectra, NewmarkOperator
+        rng = np.random.default_rng(5)
+        dt = 0.01
+        acc = rng.standard_normal(800)
+        periods = np.array([0.05, 0.2, 1.0, 3.0])
+        op = NewmarkOperator(len(acc), dt, periods, zeta=0.05)
+        ref = Spectra.compute(acc, dt, periods, zeta=0.05, method='newmark')
+        np.testing.assert_allclose(op.sa(acc), ref.sa, rtol=1e-9)
+        # 批量输入
+        batch = op.sa(np.vstack([acc, -0.5 * acc]))
+        np.testing.assert_allclose(batch[1], 0.5 * ref.sa, rtol=1e-9)
+        with pytest.raises(ValueError):
+            op.sa(acc[:-1])
+
     def test_freq_domain_method(self):
         from seiswave.core import Spectra
         dt = 0.01
@@ -186,6 +383,37 @@ class TestSpectra:
                 ratio = sp_freq.sa[i] / sp_nmk.sa[i]
                 assert 0.5 < ratio < 2.0
 
+    def test_newmark_resonance_amplitude(self):
+        from seiswave.core import Spectra, NewmarkOperator
+        dt, n = 0.02, 4096
+        acc = np.sin(2 * np.pi * np.arange(n) * dt)
+        # ζ=5% 共振稳态绝对加速度放大系数 √(1+(2ζ)²)/(2ζ)
+        expected = np.sqrt(1 + 0.1 ** 2) / 0.1
+        sa = Spectra.compute(acc, dt, np.array([1.0]), zeta=0.05).sa[0]
+        assert sa == pytest.approx(expected, rel=0.01)
+        y = NewmarkOperator(n, dt, np.array([1.0])).response(acc)[0]
+        assert np.max(np.abs(y)) == pytest.approx(sa, rel=1e-9)
+
+    def test_streaming_spectra_and_filter(self):
+        from seiswave.core import Spectra, StreamingSpectra, StreamingFilter
+        from scipy import signal
+        rng = np.random.default_rng(3)
+        acc = rng.standard_normal(3000) * 0.1
+        dt = 0.01
+        periods = np.array([0.05, 0.3, 1.0, 4.0])
+        ref = Spectra.compute(acc, dt, periods)
+        stream = StreamingSpectra(dt, periods)
+        filt = StreamingFilter(dt, 'bandpass', freqs=(0.2, 20.0))
+        filtered = []
+        for k in range(0, len(acc), 701):
+            stream.update(acc[k:k + 701])
+            filtered.append(filt.process(acc[k:k + 701]))
+        sp = stream.result()
+        assert stream.npts == len(acc)
+        for key in ('sa', 'sv', 'sd', 'se'):
+            np.testing.assert_allclose(getattr(sp, key), getattr(ref, key), rtol=1e-8)
+        np.testing.assert_allclose(np.concatenate(filtered), signal.sosfilt(filt.sos, acc))
+
 
 # ═══════════════════ CodeSpec Module ═══════════════════
 
@@ -340,6 +568,324 @@ class TestFFT:
         assert np.std(psd[1:]) / np.mean(psd[1:]) < 2.0
 
 
+# ═══════════════════ Intensity Module ═══════════════════
+
+class TestIntensityMeasures:
+    def test_compute_sine(self):
+        from seiswave.core import IntensityMeasures, EQSignal
+        dt = 0.01
+        t = np.arange(0, 20, dt)
+        acc = 0.3 * np.sin(2 * np.pi * 2.0 * t)
+        ims = IntensityMeasures.compute(acc, dt)
+        assert ims['pga'] == pytest.approx(0.3, rel=0.01)
+        # Harmonic at 2 Hz => Tm ~ 0.5 s
+        assert ims['mean_period'] == pytest.approx(0.5, rel=0.05)
+        sig = EQSignal(acc, dt)
+        assert ims['arias'] == pytest.approx(sig.arias_intensity()[-1])
+        assert ims['significant_duration'] == pytest.approx(sig.effective_duration)
+
+    def test_index_screen_and_roundtrip(self):
+        from seiswave.core import IMIndex, EQRecord
+        records = [EQRecord(acc=np.ones(100) * a, dt=0.01, name=f'r{i}')
+                   for i, a in enumerate([0.1, 0.2, 0.4])]
+        index = IMIndex.from_records(records)
+        mask = index.screen({'pga': (0.15, None)})
+        np.testing.assert_array_equal(mask, [False, True, True])
+        with pytest.raises(KeyError):
+            index.screen({'foo': (0, 1)})
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'im.npz')
+            index.save(path)
+            loaded = IMIndex.load(path)
+        assert loaded.names == index.names
+        assert loaded.row(2)['pga'] == pytest.approx(0.4)
+
+
+# ═══════════════════ Batch Module ═══════════════════
+
+class TestRecordBatch:
+    def test_durations_match_per_record(self):
+        from seiswave.core import (
+            RecordBatch, EQRecord, EQSignal, WaveSelector, SelectionCriteria
+        )
+        rng = np.random.default_rng(3)
+        records = []
+        for i, n in enumerate([800, 1, 2500, 1200]):
+            acc = rng.standard_normal(n) * np.exp(-np.linspace(0, 4, n))
+            records.append(EQRecord(acc=acc, dt=0.01 * (i + 1), name=f'r{i}'))
+        records.append(EQRecord(acc=np.zeros(50), dt=0.01, name='zero'))
+        batch = RecordBatch.from_records(records)
+        assert len(batch) == 5
+        np.testing.assert_array_equal(batch[2].acc, records[2].acc)
+
+        ws = WaveSelector(SelectionCriteria(
+            Tg=0.4, alpha_max=0.16, T_main=[0.5], duration_threshold=0.2))
+        ok, dur = ws._check_duration_batch(batch)
+        for i, rec in enumerate(records):
+            pga = np.max(np.abs(rec.acc))
+            above = np.flatnonzero(np.abs(rec.acc) >= 0.2 * pga) if pga > 0 else []
+            expected = (above[-1] - above[0]) * rec.dt if len(above) else 0.0
+            assert dur[i] == pytest.approx(expected)
+            assert ok[i] == (expected >= 2.5 and pga > 0)
+            assert ws._check_duration(rec) == (ok[i], dur[i])
+
+        sig_dur = batch.significant_duration()
+        for i, rec in enumerate(records):
+            expected = EQSignal(rec.acc, rec.dt).effective_duration
+            assert sig_dur[i] == pytest.approx(expected, abs=rec.dt)
+
+        # 排在大幅值记录之后的小记录不受整批累加的相消影响
+        small = records[0].acc * 1e-6
+        mixed = RecordBatch.from_records(
+            [EQRecord(acc=rng.standard_normal(200000) * 1e3, dt=0.01), records[0],
+             EQRecord(acc=small, dt=0.01)])
+        assert mixed.significant_duration()[2] == sig_dur[0]
+
+
+# ═══════════════════ Store Module ═══════════════════
+
+class TestRecordStore:
+    def test_build_open_zero_copy(self):
+        from seiswave.core import FileIO, EQRecord, RecordStore, RecordBatch
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, 'src')
+            os.makedirs(src)
+            for i, n in enumerate([300, 200, 500]):
+                FileIO.write_at2(os.path.join(src, f'w{i}.AT2'),
+                                 rng.standard_normal(n), 0.01 * (i + 1))
+            records = FileIO.batch_load(src)
+            lib = os.path.join(d, 'lib')
+            RecordStore.from_directory(lib, src)
+
+            store = RecordStore(lib)
+            assert len(store) == 3
+            assert list(store.lengths) == [300, 200, 500]
+            for rec, ref in zip(store.records(), records):
+                assert rec.name == ref.name and rec.dt == ref.dt
+                assert rec.metadata == ref.metadata
+                np.testing.assert_array_equal(rec.acc, ref.acc)
+            # acc 是映射数组的视图
+            assert np.shares_memory(store[2].acc, store.data)
+            assert not store[2].acc.flags.writeable
+            np.testing.assert_array_equal(
+                store.batch().pga(), RecordBatch.from_records(records).pga())
+
+            records.append(EQRecord(acc=np.zeros(0), dt=0.02, name='empty'))
+            small = RecordStore.build(os.path.join(d, 'f32'), records, dtype=np.float32)
+            assert small.data.dtype == np.float32
+            assert small[3].npts == 0 and small[3].name == 'empty'
+            np.testing.assert_allclose(small[0].acc, records[0].acc, rtol=1e-6)
+            with pytest.raises(FileNotFoundError):
+                RecordStore(os.path.join(d, 'missing'))
+
+            # 重建写入新文件后替换，已打开的库仍映射旧数据
+            RecordStore.build(lib, records[:1])
+            assert len(RecordStore(lib)) == 1
+            np.testing.assert_array_equal(store[2].acc, records[2].acc)
+            assert sorted(os.listdir(lib)) == ['data.bin', 'index.npz']
+
+    def test_from_directory_streams_out_of_order(self, monkeypatch):
+        from seiswave.core import FileIO, RecordStore
+        rng = np.random.default_rng(1)
+        load_files = FileIO.load_files
+
+        def reversed_completion(files, result_callback=None, return_records=True, **kwargs):
+            # 模拟并行加载按逆序完成，且不保留记录
+            assert not return_records
+            recs = load_files(files, **kwargs)
+            for idx in reversed(range(len(recs))):
+                result_callback(idx, recs[idx])
+            return []
+
+        with tempfile.TemporaryDirectory() as d:
+            for i, n in enumerate([300, 200, 500]):
+                FileIO.write_at2(os.path.join(d, f'w{i}.AT2'), rng.standard_normal(n), 0.01)
+            records = FileIO.batch_load(d)
+            monkeypatch.setattr(FileIO, 'load_files', staticmethod(reversed_completion))
+            store = RecordStore.from_directory(os.path.join(d, 'lib'), d, dtype=np.float32)
+            assert list(store.lengths) == [300, 200, 500]
+            assert store.names == [rec.name for rec in records]
+            for rec, ref in zip(store.records(), records):
+                np.testing.assert_allclose(rec.acc, ref.acc, rtol=1e-6)
+            assert sorted(os.listdir(os.path.join(d, 'lib'))) == ['data.bin', 'index.npz']
+
+
+# ═══════════════════ Library Module ═══════════════════
+
+class TestRecordLibrary:
+    def test_incremental_sync(self):
+        from seiswave.core import FileIO, RecordLibrary, IMIndex, NewmarkOperator
+        rng = np.random.default_rng(0)
+        periods = np.array([0.1, 0.5, 1.0])
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, 'src')
+            os.makedirs(src)
+            for i in range(4):
+                FileIO.write_at2(os.path.join(src, f'w{i}.AT2'), rng.standard_normal(200), 0.01)
+            lib = os.path.join(d, 'lib')
+            library = RecordLibrary.sync(lib, src, periods=periods)
+            assert len(library) == 4 and len(library.changes['added']) == 4
+
+            # 未变化：只做 stat，不重写任何文件
+            stamp = os.stat(os.path.join(lib, 'data.bin')).st_mtime_ns
+            library = RecordLibrary.sync(lib, src, periods=periods)
+            assert not any(library.changes.values())
+            assert os.stat(os.path.join(lib, 'data.bin')).st_mtime_ns == stamp
+
+            os.remove(os.path.join(src, 'w0.AT2'))
+            FileIO.write_at2(os.path.join(src, 'w1.AT2'), rng.standard_normal(300), 0.02)
+            st = os.stat(os.path.join(src, 'w2.AT2'))
+            os.utime(os.path.join(src, 'w2.AT2'), ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+            FileIO.write_at2(os.path.join(src, 'w4.AT2'), rng.standard_normal(100), 0.01)
+            library = RecordLibrary.sync(lib, src, periods=periods)
+            assert [os.path.basename(p) for p in library.changes['added']] == ['w4.AT2']
+            assert [os.path.basename(p) for p in library.changes['changed']] == ['w1.AT2']
+            assert [os.path.basename(p) for p in library.changes['removed']] == ['w0.AT2']
+
+            ref = FileIO.batch_load(src)
+            reopened = RecordLibrary(lib)
+            assert [r.name for r in reopened.records()] == ['w1', 'w2', 'w3', 'w4']
+            im = IMIndex.from_records(ref)
+            for rec, ref_rec, sa in zip(reopened.records(), ref, reopened.sa):
+                np.testing.assert_array_equal(rec.acc, ref_rec.acc)
+                np.testing.assert_allclose(
+                    sa, NewmarkOperator(rec.npts, rec.dt, periods).sa(rec.acc))
+            for k, col in im.columns.items():
+                np.testing.assert_allclose(reopened.im_index.columns[k], col)
+
+    @pytest.mark.skipif(not os.path.isfile('/proc/self/maps'), reason="需要 /proc/self/maps")
+    def test_sync_releases_old_mapping(self, monkeypatch):
+        from seiswave.core import FileIO, RecordLibrary
+        from seiswave.core import library as lib_module
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, 'src')
+            os.makedirs(src)
+            for i in range(3):
+                FileIO.write_at2(os.path.join(src, f'w{i}.AT2'), rng.standard_normal(200), 0.01)
+            lib = os.path.join(d, 'lib')
+            RecordLibrary.sync(lib, src)
+            FileIO.write_at2(os.path.join(src, 'w3.AT2'), rng.standard_normal(100), 0.01)
+
+            # 替换数据文件时旧库的映射已释放（Windows 下被映射的文件不能覆盖）
+            data_path = os.path.realpath(os.path.join(lib, 'data.bin'))
+            replace = os.replace
+
+            def checked_replace(src_path, dst_path):
+                if os.path.realpath(dst_path) == data_path:
+                    with open('/proc/self/maps') as f:
+                        assert data_path not in f.read()
+                replace(src_path, dst_path)
+
+            monkeypatch.setattr(lib_module.os, 'replace', checked_replace)
+            library = RecordLibrary.sync(lib, src)
+            assert len(library) == 4
+
+
+# ═══════════════════ Catalog Module ═══════════════════
+
+class TestRecordCatalog:
+    def test_header_flatfile_query(self):
+        from seiswave.core import FileIO, RecordCatalog
+        rng = np.random.default_rng(0)
+        headers = [
+            ('RSN6_IMPVALL.I_I-ELC180', 'Imperial Valley-02, 5/19/1940, El Centro Array #9, 180'),
+            ('RSN30_PARKF_C05085', 'Parkfield, 6/28/1966, Cholame - Shandon Array #5, 85'),
+            ('RSN95_MANAGUA_A-ESO090', 'Managua Nicaragua-01, 12/23/1972, Managua ESSO, 90'),
+            ('synthetic', 'SeisWave Generated, dt=0.0100s'),
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            for name, h2 in headers:
+                FileIO.write_at2(os.path.join(d, name + '.AT2'), rng.standard_normal(100),
+                                 0.01, {'header2': h2})
+            flatfile = os.path.join(d, '_SearchResults.csv')
+            with open(flatfile, 'w') as f:
+                f.write('Unscaled\n\n'
+                        ' Result ID, Record Sequence Number, Earthquake Name, Magnitude,'
+                        ' Mechanism, Rrup (km), Vs30 (m/sec)\n'
+                        '1,6,"Imperial Valley-02",6.95,strike slip,6.09,213.44\n'
+                        '2,30,"Parkfield",6.19,strike slip,9.58,289.56\n'
+                        '3,95,"Managua Nicaragua-01",6.24,strike slip,-,288.77\n'
+                        '\n -- Scaled Spectra --\n1,2,3\n')
+
+            db = os.path.join(d, 'lib.db')
+            RecordCatalog.from_directory(db, d, flatfile=flatfile).close()
+            with RecordCatalog(db) as catalog:
+                assert len(catalog) == 4
+                row = catalog.row(0)
+                assert row['name'] == 'RSN30_PARKF_C05085' and row['rsn'] == 30
+                assert row['station'] == 'Cholame - Shandon Array #5'
+                assert row['component'] == '85' and row['magnitude'] == 6.19
+
+                ids = catalog.query(magnitude=(6.2, None))
+                assert [catalog.row(i)['rsn'] for i in ids] == [6, 95]
+                # 缺失值（'-'）不满足范围条件
+                assert list(catalog.query(rrup=(None, 10.0))) == list(catalog.query(rsn=[6, 30]))
+                mask = catalog.query(as_mask=True, event='Parkfield')
+                assert mask.tolist() == [True, False, False, False]
+                assert np.isnan(catalog.column('magnitude')[3])
+
+                recs = catalog.records(ids)
+                assert not recs[0].is_loaded and recs[0].npts == 100
+                np.testing.assert_array_equal(
+                    recs[0].acc, FileIO.read_at2(catalog.paths(ids)[0]).acc)
+                with pytest.raises(KeyError):
+                    catalog.query(distance=(0, 10))
+
+
+# ═══════════════════ Dedup Module ═══════════════════
+
+class TestRecordDedup:
+    def test_collapse_format_variants(self):
+        from seiswave.core import FileIO, RecordDedup
+        rng = np.random.default_rng(0)
+        acc = rng.standard_normal(1500) * 0.1
+        other = rng.standard_normal(1500) * 0.1
+        with tempfile.TemporaryDirectory() as d:
+            FileIO.write_at2(os.path.join(d, 'RSN1_A.AT2'), acc, 0.01)
+            FileIO.write_at2(os.path.join(d, 'RSN2_B.AT2'), other, 0.01)
+            # 同一记录的文本版本：定点 6 位小数、时间列、末尾补零
+            with open(os.path.join(d, 'RSN1_A-Acc.txt'), 'w') as f:
+                f.write(''.join(f'{i * 0.01:.2f} {v:.6f}\n'
+                                for i, v in enumerate(np.concatenate([acc, np.zeros(20)]))))
+            # 不同 dt 不是重复
+            FileIO.write_at2(os.path.join(d, 'RSN1_A_dt.AT2'), acc, 0.02)
+
+            records = FileIO.batch_load(d, '*')
+            assert len(records) == 4
+            result = RecordDedup.deduplicate(records)
+            assert len(result.records) == 3 and result.n_duplicates == 1
+            canon = result.records[result.index[[r.name for r in records].index('RSN1_A-Acc')]]
+            assert canon.name == 'RSN1_A'
+            assert [os.path.basename(p) for p in canon.metadata['aliases']] == ['RSN1_A-Acc.txt']
+            assert 'aliases' not in records[0].metadata
+
+            deduped = FileIO.batch_load(d, '*', dedup=True)
+            assert [r.name for r in deduped] == [r.name for r in result.records]
+            assert RecordDedup.fingerprint(acc, 0.01) == RecordDedup.fingerprint(
+                np.concatenate([acc, np.zeros(5)]), 0.01)
+            # 首部补零同样不计入
+            assert RecordDedup.fingerprint(acc, 0.01) == RecordDedup.fingerprint(
+                np.concatenate([np.zeros(50), acc]), 0.01)
+
+    def test_pga_on_decade_boundary(self):
+        from seiswave.core import EQRecord, RecordDedup
+        rng = np.random.default_rng(1)
+        acc = rng.standard_normal(1000)
+        acc /= np.max(np.abs(acc))                  # PGA 恰为 1：tol × PGA 落在 10 的整数次幂上
+        copy = acc + rng.uniform(-5e-8, 5e-8, len(acc))
+        copy[np.argmax(np.abs(acc))] = np.sign(acc[np.argmax(np.abs(acc))]) * (1.0 - 5e-8)
+        # 两份拷贝的量化步长不同，指纹不同，仍按容差识别为重复
+        assert RecordDedup.fingerprint(acc, 0.01) != RecordDedup.fingerprint(copy, 0.01)
+        records = [EQRecord(acc=acc, dt=0.01, name='a'),
+                   EQRecord(acc=np.concatenate([np.zeros(50), copy, np.zeros(7)]),
+                            dt=0.01, name='b'),
+                   EQRecord(acc=acc * 1.01, dt=0.01, name='c')]
+        result = RecordDedup.deduplicate(records)
+        assert result.groups == [[0, 1], [2]]
+
+
 # ═══════════════════ Generator Module ═══════════════════
 
 class TestWaveGenerator:
@@ -359,6 +905,126 @@ class TestWaveGenerator:
         # After 30 iterations, mean error should improve significantly
         assert errors['mean_error'] < 0.80
 
+    def test_adjust_spectrum_interpolation(self):
+        from seiswave.core.generator import WaveGenerator, _SpectrumAdjuster
+        rng = np.random.default_rng(6)
+        n, dt, nfft = 1000, 0.02, 1024
+        periods = np.array([2.0, 0.1, 0.5, 1.0])
+        acc = rng.standard_normal(n)
+        target = np.array([1.5, 0.8, 1.2, 1.0])
+        current = np.ones(4)
+        out = WaveGenerator._adjust_spectrum(
+            acc, target, current, _SpectrumAdjuster(periods, dt, nfft))
+        # 参考：np.interp 插值后逐点缩放
+        freqs = np.fft.rfftfreq(nfft, dt)
+        order = np.argsort(1.0 / periods)
+        adj = np.interp(freqs[1:nfft // 2], (1.0 / periods)[order], target[order])
+        af = np.fft.rfft(acc, nfft)
+        af[1:nfft // 2] *= adj
+        np.testing.assert_allclose(out, np.fft.irfft(af, nfft)[:n], atol=1e-12)
+
+    def test_generate_batch_reproducible(self, monkeypatch):
+        from seiswave.core import WaveGenerator, CodeSpectrum, Spectra, FitReport
+        from seiswave.core import generator
+        periods = Spectra.default_periods(0.1, 4.0, 30, mode='log')
+        target = CodeSpectrum.gb50011(periods, 0.40, 0.16)
+        kwargs = dict(n=1024, dt=0.02, tol=0.15, max_iter=8, pga=0.16, seed=123)
+        sigs, reports = WaveGenerator.generate_batch(3, target, periods, **kwargs)
+        again, _ = WaveGenerator.generate_batch(2, target, periods, **kwargs)
+        assert len(sigs) == 3 and all(isinstance(r, FitReport) for r in reports)
+        # 第 i 条波只取决于根种子与序号
+        np.testing.assert_array_equal(sigs[1].acc, again[1].acc)
+        assert not np.allclose(sigs[0].acc, sigs[1].acc)
+        for sig, rep in zip(sigs, reports):
+            assert np.max(np.abs(sig.acc)) == pytest.approx(0.16)
+            sp = Spectra.compute(sig.acc, sig.dt, periods, zeta=0.05)
+            err = WaveGenerator.fit_error(sp.sa, target)
+            assert err['max_error'] == pytest.approx(rep.max_error, rel=1e-6)
+            assert 1 <= rep.iterations <= 8
+
+        # 分块计算反应谱不改变结果
+        monkeypatch.setattr(generator, 'FIT_CHUNK', 2)
+        chunked, _ = WaveGenerator.generate_batch(3, target, periods, **kwargs)
+        for a, b in zip(sigs, chunked):
+            np.testing.assert_allclose(a.acc, b.acc, rtol=1e-12, atol=1e-15)
+
+    def test_adaptive_gain_and_warm_start(self):
+        from seiswave.core import WaveGenerator, CodeSpectrum, Spectra
+        from seiswave.core.generator import _SpectrumAdjuster, RATIO_MAX
+        periods = Spectra.default_periods(0.1, 4.0, 30, mode='log')
+        target = CodeSpectrum.gb50011(periods, 0.40, 0.16)
+
+        # 多条独立随机流：默认的固定更新中位误差不劣于自适应增益
+        kwargs = dict(n=2048, dt=0.02, tol=0.08, max_iter=40, pga=0.16, seed=0)
+        _, fixed = WaveGenerator.generate_batch(24, target, periods, **kwargs)
+        _, adaptive = WaveGenerator.generate_batch(24, target, periods, adaptive=True, **kwargs)
+        assert (np.median([r.max_error for r in fixed]) <=
+                np.median([r.max_error for r in adaptive]))
+        for r in adaptive:
+            assert len(r.history) == r.iterations
+            assert min(h[0] for h in r.history) == pytest.approx(r.max_error)
+
+        # 增益只改变步长，单次调整比不超出限幅
+        acc = np.random.default_rng(0).standard_normal(512)
+        adjuster = _SpectrumAdjuster(periods, 0.02, 512)
+        low = target / 4.0
+        capped = WaveGenerator._adjust_spectrum(acc, target, low, adjuster,
+                                                np.full(len(periods), 3.0))
+        unit = WaveGenerator._adjust_spectrum(acc, target, low, adjuster)
+        np.testing.assert_allclose(capped, unit)
+        assert np.all(WaveGenerator._ratio(target, low) == RATIO_MAX)
+
+        np.random.seed(3)
+        w0, r0 = WaveGenerator.generate(target, periods, n=2048, tol=0.15,
+                                        max_iter=40, pga=0.16, return_report=True)
+        w1, r1 = WaveGenerator.generate(target, periods, tol=0.08, max_iter=60,
+                                        pga=0.16, initial=w0, return_report=True)
+        # 暖启动从已有波形的误差水平开始
+        assert r1.history[0][0] == pytest.approx(r0.max_error, rel=1e-6)
+        assert len(w1.acc) == 2048 and r1.max_error <= r0.max_error
+
+        stopped, rep = WaveGenerator.generate(target, periods, n=2048, tol=1e-6,
+                                              max_iter=200, patience=5,
+                                              return_report=True)
+        assert not rep.converged and rep.iterations < 200
+
+    def test_multi_damping_fit(self):
+        from seiswave.core import WaveGenerator, CodeSpectrum, Spectra
+        periods = Spectra.default_periods(0.1, 4.0, 30, mode='log')
+        t5 = CodeSpectrum.gb50011(periods, 0.40, 0.16)
+        t20 = CodeSpectrum.gb50011(periods, 0.40, 0.16, zeta=0.20)
+        kwargs = dict(n=2048, dt=0.02, tol=0.05, max_iter=60, pga=0.16, seed=1)
+        joint, reps = WaveGenerator.generate_batch(
+            2, np.vstack([t5, t20]), periods, zeta=[0.05, 0.20], **kwargs)
+        single, _ = WaveGenerator.generate_batch(2, t5, periods, **kwargs)
+
+        def worst(sig):
+            e5 = WaveGenerator.fit_error(Spectra.compute(sig.acc, sig.dt, periods, 0.05).sa, t5)
+            e20 = WaveGenerator.fit_error(Spectra.compute(sig.acc, sig.dt, periods, 0.20).sa, t20)
+            return max(e5['max_error'], e20['max_error'])
+
+        for j, s, rep in zip(joint, single, reps):
+            assert worst(j) == pytest.approx(rep.max_error, rel=1e-6)
+            assert worst(j) < worst(s)
+        with pytest.raises(ValueError):
+            WaveGenerator.generate(t5, periods, zeta=[0.05, 0.20], max_iter=1)
+
+    @pytest.mark.skipif(not HAS_AT2, reason="AT2 test file not found")
+    def test_match_preserves_record(self):
+        from seiswave.core import WaveGenerator, CodeSpectrum, Spectra, FileIO
+        rec = FileIO.read_at2(SAMPLE_AT2)
+        periods = Spectra.default_periods(0.1, 3.0, 40, mode='log')
+        sa0 = Spectra.compute(rec.acc, rec.dt, periods, zeta=0.05).sa
+        target = CodeSpectrum.gb50011(periods, 0.40, 0.16)
+        target *= np.median(sa0 / target)
+        out = WaveGenerator.match(rec, target, periods, tol=0.1, max_iter=20)
+        sp = Spectra.compute(out.acc, out.dt, periods, zeta=0.05)
+        assert WaveGenerator.fit_error(sp.sa, target)['max_error'] <= 0.1
+        assert WaveGenerator.fit_error(sa0, target)['max_error'] > 0.3
+        # 小波修正保留原记录的相位特征
+        assert len(out.acc) == len(rec.acc)
+        assert np.corrcoef(out.acc, rec.acc)[0, 1] > 0.75
+
     def test_fit_error(self):
         from seiswave.core import WaveGenerator
         target = np.array([1.0, 2.0, 3.0])
@@ -367,6 +1033,169 @@ class TestWaveGenerator:
         assert err['max_error'] == pytest.approx(0.1, abs=0.01)
 
 
+# ═══════════════════ Stochastic Module ═══════════════════
+
+class TestStochasticGenerator:
+    def test_simulate_matches_target_fas(self):
+        from seiswave.core import StochasticGenerator, PointSource, RecordBatch
+        src = PointSource(magnitude=6.5, distance=20.0)
+        batch = StochasticGenerator.simulate(src, 200, dt=0.01, seed=2)
+        assert isinstance(batch, RecordBatch) and len(batch) == 200
+        n = int(batch.lengths[0])
+        assert np.all(batch.lengths == n)
+        # 样本的均方傅里叶振幅谱与目标谱一致
+        acc = batch.data.reshape(len(batch), n) * 980.665
+        amp = np.abs(np.fft.rfft(acc, axis=-1)) * 0.01
+        freqs = np.fft.rfftfreq(n, 0.01)
+        band = (freqs > 0.5) & (freqs < 10.0)
+        rms = np.sqrt(np.mean(amp[:, band] ** 2, axis=0))
+        ratio = rms / StochasticGenerator.fourier_spectrum(src, freqs[band])
+        assert np.mean(ratio) == pytest.approx(1.0, abs=0.05)
+        # 震级越大 PGA 越大
+        small = StochasticGenerator.simulate(PointSource(5.0, 20.0), 50, seed=2)
+        assert np.median(small.pga()) < np.median(batch.pga())
+
+    def test_simulate_reproducible(self):
+        from seiswave.core import StochasticGenerator, PointSource, EQSignal
+        src = PointSource(magnitude=6.0, distance=30.0)
+        a = StochasticGenerator.simulate(src, 3, seed=7)
+        b = StochasticGenerator.simulate(src, 3, seed=7)
+        np.testing.assert_array_equal(a.data, b.data)
+        sigs = StochasticGenerator.simulate(src, 3, seed=7, as_signals=True)
+        assert all(isinstance(s, EQSignal) for s in sigs)
+        np.testing.assert_allclose(sigs[1].acc, a[1].acc)
+
+
+# ═══════════════════ PSD Module ═══════════════════
+
+class TestPSDGenerator:
+    def test_synthesize_variance_and_compatibility(self):
+        from seiswave.core import PSDGenerator, Spectra
+        freqs = np.linspace(0.0, 25.0, 2001)
+        psd = PSDGenerator.clough_penzien(freqs, 0.01, fg=2.5, zeta_g=0.6)
+        batch = PSDGenerator.synthesize(freqs, psd, 4096, 0.02, count=40,
+                                        seed=1, envelope=None)
+        acc = batch.data.reshape(40, -1)
+        # 平稳样本方差 = ∫G(f)df
+        area = np.sum(0.5 * (psd[1:] + psd[:-1]) * np.diff(freqs))
+        assert np.mean(acc.var(axis=1)) == pytest.approx(area, rel=0.01)
+        again = PSDGenerator.synthesize(freqs, psd, 4096, 0.02, count=40, seed=1,
+                                        envelope=None)
+        np.testing.assert_array_equal(batch.data, again.data)
+
+        periods = Spectra.default_periods(0.1, 4.0, 20, mode='log')
+        sp = Spectra.compute(acc[3], 0.02, periods, zeta=0.05)
+        res = PSDGenerator.check_compatibility(batch, sp.sa, periods, tol=0.1)
+        np.testing.assert_allclose(res.sa[3], sp.sa, rtol=1e-9)
+        assert res.passed[3] and res.max_error[3] < 1e-9
+        assert res.mean_sa.shape == (20,)
+
+    def test_from_record_roundtrip(self):
+        from seiswave.core import PSDGenerator
+        rng = np.random.default_rng(0)
+        ref = rng.standard_normal(8192) * 0.3
+        freqs, psd = PSDGenerator.from_record(ref, 0.01)
+        sigs = PSDGenerator.synthesize(freqs, psd, 8192, 0.01, count=2, seed=3,
+                                       envelope='saragoni_hart', as_signals=True)
+        assert len(sigs) == 2 and sigs[0].n == 8192
+        assert np.argmax(np.abs(sigs[0].acc)) < 0.7 * 8192
+        flat = PSDGenerator.synthesize(freqs, psd, 8192, 0.01, seed=3, envelope=None)
+        assert flat.data.var() == pytest.approx(ref.var(), rel=0.1)
+
+
+# ═══════════════════ RVT Module ═══════════════════
+
+class TestRVT:
+    @pytest.mark.skipif(not HAS_AT2, reason="AT2 test file not found")
+    def test_within_documented_envelope(self):
+        from seiswave.core import RVT, FileIO, Spectra, NewmarkOperator
+        rec = FileIO.read_at2(SAMPLE_AT2)
+        periods = Spectra.default_periods(0.1, 4.0, 20, mode='log')
+        ref = NewmarkOperator(len(rec.acc), rec.dt, periods).sa(rec.acc)
+        est = RVT.sa(rec.acc, rec.dt, periods)
+        ratio = est / ref
+        assert 0.7 < np.median(ratio) < 1.3
+        assert np.all((ratio > 0.4) & (ratio < 2.0))
+        # 批量输入逐行一致
+        both = RVT.sa(np.vstack([rec.acc, 2.0 * rec.acc]), rec.dt, periods)
+        np.testing.assert_allclose(both, [est, 2.0 * est], rtol=1e-10)
+
+    def test_rvt_prescreen_skips_integration(self):
+        from seiswave.core import WaveSelector, SelectionCriteria, EQRecord
+        t = np.arange(2000) * 0.01
+        records = [
+            EQRecord(acc=np.sin(2 * np.pi * 1.0 * t), dt=0.01, name='resonant'),
+            EQRecord(acc=np.sin(2 * np.pi * 8.0 * t), dt=0.01, name='stiff'),
+        ]
+        criteria = SelectionCriteria(Tg=0.40, alpha_max=0.16, T_main=[1.0],
+                                     spectral_tol=10.0, rvt_tol=5.0)
+        ws = WaveSelector(criteria)
+        passed = ws.select(records)
+        assert [r.record.name for r in passed] == ['stiff']
+        assert [r.passed_prescreen for r in ws.results] == [False, True]
+        assert ws.results[0].deviations == {}
+
+    def test_rejects_zero_damping(self):
+        from seiswave.core import RVT
+        acc = np.random.default_rng(0).standard_normal(512)
+        with pytest.raises(ValueError):
+            RVT.sa(acc, 0.01, np.array([0.5, 1.0]), zeta=0.0)
+
+
+# ═══════════════════ Envelope Module ═══════════════════
+
+class TestEnvelope:
+    def test_trapezoidal_matches_reference(self):
+        from seiswave.core import Envelope
+        n, dt = 1001, 0.02
+        env = Envelope.compute('trapezoidal', n, dt)
+        # 原逐点循环实现
+        t_total = (n - 1) * dt
+        ref = np.zeros(n)
+        for i, ti in enumerate(np.arange(n) * dt):
+            if ti <= 0.1 * t_total:
+                ref[i] = (ti / (0.1 * t_total)) ** 2
+            elif ti <= 0.6 * t_total:
+                ref[i] = 1.0
+            else:
+                ref[i] = np.exp(-3.0 * (ti - 0.6 * t_total) / (0.4 * t_total))
+        np.testing.assert_allclose(env, ref, atol=1e-12)
+        # 缓存：同参数返回同一只读数组
+        assert Envelope.compute('trapezoidal', n, dt) is env
+        assert not env.flags.writeable
+
+    def test_shapes(self):
+        from seiswave.core import Envelope
+        n, dt = 2000, 0.01
+        sh = Envelope.compute('saragoni_hart', n, dt, eps=0.25, eta=0.1)
+        assert np.argmax(sh) == pytest.approx(0.25 * (n - 1), abs=1)
+        assert sh.max() == pytest.approx(1.0, abs=1e-4)
+        assert sh[-1] == pytest.approx(0.1, rel=1e-6)
+        jn = Envelope.compute('jennings', n, dt, t1=2.0, t2=8.0, c=0.5)
+        assert jn[100] == pytest.approx(0.25) and jn[500] == 1.0
+        assert jn[-1] == pytest.approx(np.exp(-0.5 * (19.99 - 8.0)))
+        with pytest.raises(ValueError):
+            Envelope.compute('boxcar', n, dt)
+        with pytest.raises(ValueError):
+            Envelope.compute('jennings', n, dt, eps=0.2)
+
+    def test_evolutionary_apply(self):
+        from seiswave.core import Envelope
+        n, dt = 2048, 0.01
+        env = Envelope.compute('evolutionary', n, dt, n_bands=4)
+        assert env.shape == (4, n)
+        # 高频带峰值更早
+        assert np.all(np.diff(np.argmax(env, axis=1)) <= 0)
+        # eta → 1 时各频带包络趋于常数 1（t = 0 除外），分解后求和还原原信号
+        acc = np.random.default_rng(0).standard_normal((2, n))
+        flat = Envelope.apply(acc, dt, 'evolutionary', eta=1.0 - 1e-12)
+        assert flat.shape == acc.shape
+        np.testing.assert_allclose(flat[:, 1:], acc[:, 1:], atol=1e-8)
+        band = Envelope.apply(acc, dt, 'evolutionary', n_bands=1, slope=0.0)
+        np.testing.assert_allclose(
+            band, acc * Envelope.compute('saragoni_hart', n, dt), atol=1e-10)
+
+
 # ═══════════════════ Selector Module ═══════════════════
 
 class TestWaveSelector:
@@ -413,3 +1242,150 @@ class TestWaveSelector:
         summary = ws.summary()
         assert summary['total'] == 5
 
+    def test_sweep_matches_select(self):
+        from seiswave.core import (
+            WaveSelector, SelectionCriteria, EQRecord
+        )
+        rng = np.random.default_rng(0)
+        records = [
+            EQRecord(acc=rng.standard_normal(n) * 0.1, dt=0.01, name=f'wave_{i}')
+            for i, n in enumerate([300, 1500, 1500, 2000])
+        ]
+        criteria_list = [
+            SelectionCriteria(Tg=0.40, alpha_max=0.16, T_main=[0.5, 0.3],
+                              spectral_tol=0.50),
+            SelectionCriteria(Tg=0.35, alpha_max=0.90, T_main=[0.6, 0.2],
+                              spectral_tol=0.90, duration_threshold=0.2),
+            SelectionCriteria(Tg=0.45, alpha_max=0.16, T_main=[0.5],
+                              zeta=0.10, spectral_tol=0.90),
+        ]
+        sweep = WaveSelector.sweep(records, criteria_list)
+        assert sweep.passed.shape == (3, 4)
+        for i, c in enumerate(criteria_list):
+            ws = WaveSelector(c)
+            ws.select(records)
+            np.testing.assert_array_equal(
+                sweep.passed_duration[i], [r.passed_duration for r in ws.results])
+            np.testing.assert_array_equal(
+                sweep.passed[i], [r.passed for r in ws.results])
+            assert [r.name for r in sweep.selected(i)] == \
+                ws.summary()['passed_names']
+
+    def test_prescreen_rejects_before_duration(self):
+        from seiswave.core import (
+            WaveSelector, SelectionCriteria, EQRecord
+        )
+        criteria = SelectionCriteria(
+            Tg=0.40, alpha_max=0.16, T_main=[0.5],
+            spectral_tol=10.0, im_bounds={'pga': (None, 1.0)},
+        )
+        rng = np.random.default_rng(1)
+        acc = rng.standard_normal(1000)
+        records = [
+            EQRecord(acc=acc / np.max(np.abs(acc)) * 0.5, dt=0.01, name='weak'),
+            EQRecord(acc=acc / np.max(np.abs(acc)) * 2.0, dt=0.01, name='strong'),
+        ]
+        ws = WaveSelector(criteria)
+        passed = ws.select(records)
+        assert [r.record.name for r in passed] == ['weak']
+        assert not ws.results[1].passed_prescreen
+        assert ws.summary()['passed_prescreen'] == 1
+
+    def test_select_parallel_matches_select(self):
+        from seiswave.core import (
+            WaveSelector, SelectionCriteria, EQRecord
+        )
+        criteria = SelectionCriteria(
+            Tg=0.35, alpha_max=0.90, T_main=[0.6, 0.2], spectral_tol=0.90,
+        )
+        rng = np.random.default_rng(2)
+        records = [EQRecord(acc=rng.standard_normal(n) * 0.1, dt=0.01, name=f'w{i}')
+                   for i, n in enumerate([200, 1500, 1500, 1500])]
+        ws_seq = WaveSelector(criteria)
+        ws_seq.select(records)
+        streamed = []
+        ws = WaveSelector(criteria)
+        ws.select_parallel(records, workers=2,
+                           result_callback=lambda i, r: streamed.append(i))
+        assert sorted(streamed) == [0, 1, 2, 3]
+        assert [r.passed for r in ws.results] == [r.passed for r in ws_seq.results]
+        assert ws.results[1].record is records[1]
+        for a, b in zip(ws.results, ws_seq.results):
+            assert a.deviations == pytest.approx(b.deviations)
+
+    def test_cancellation_checkpoint(self):
+        from seiswave.core import WaveSelector
+        acc = np.random.randn(5000)
+        with pytest.raises(InterruptedError):
+            WaveSelector._sdof_peak_acc(acc, 0.01, 0.5, 0.05,
+                                        should_stop=lambda: True)
+
+    def test_incremental_reselection_cache(self):
+        from seiswave.core import (
+            WaveSelector, SelectionCriteria, EQRecord
+        )
+        criteria = SelectionCriteria(
+            Tg=0.35, alpha_max=0.90, T_main=[0.6, 0.2], spectral_tol=0.90,
+        )
+        rng = np.random.default_rng(4)
+        records = [EQRecord(acc=rng.standard_normal(1500) * 0.1, dt=0.01, name=f'w{i}')
+                   for i in range(3)]
+        ws = WaveSelector(criteria)
+        ws.select(records)
+        first = [r.passed for r in ws.results]
+        assert ws.cache_stats == {'hits': 0, 'misses': 3}
+
+        # 新增一条、修改一条
+        modified = EQRecord(acc=records[1].acc * 2.0, dt=0.01, name='w1')
+        added = EQRecord(acc=rng.standard_normal(1500) * 0.1, dt=0.01, name='w3')
+        library = [records[0], modified, records[2], added]
+        ws.select(library)
+        assert ws.cache_stats == {'hits': 2, 'misses': 2}
+        assert ws.results[0].record is records[0]
+        assert [r.passed for r in ws.results[::2]] == first[::2]
+
+        fresh = WaveSelector(criteria, use_cache=False)
+        fresh.select(library)
+        for a, b in zip(ws.results, fresh.results):
+            assert a.passed == b.passed
+            assert a.deviations == pytest.approx(b.deviations)
+
+        # 参数改变则缓存失效
+        ws.criteria = SelectionCriteria(
+            Tg=0.35, alpha_max=0.90, T_main=[0.6, 0.2], spectral_tol=0.50,
+        )
+        ws.select(library)
+        assert ws.cache_stats['hits'] == 0
+
+    def test_reselection_cache_bound_and_im_key(self):
+        from seiswave.core import (
+            WaveSelector, SelectionCriteria, EQRecord, IMIndex
+        )
+        rng = np.random.default_rng(6)
+        records = [EQRecord(acc=rng.standard_normal(1000) * 0.1, dt=0.01, name=f'w{i}')
+                   for i in range(4)]
+
+        # LRU 条数上限
+        criteria = SelectionCriteria(
+            Tg=0.35, alpha_max=0.90, T_main=[0.6], spectral_tol=10.0,
+        )
+        ws = WaveSelector(criteria, cache_size=3)
+        ws.select(records)
+        assert len(ws._cache) == 3
+        ws.select(records[1:])
+        assert ws.cache_stats == {'hits': 3, 'misses': 0}
+
+        # 外部强度指标改变时不得命中旧结果
+        criteria = SelectionCriteria(
+            Tg=0.35, alpha_max=0.90, T_main=[0.6], spectral_tol=10.0,
+            im_bounds={'pga': (None, 1.0)},
+        )
+        ws = WaveSelector(criteria)
+        names = [rec.name for rec in records]
+        ws.select(records, im_index=IMIndex(names, {'pga': np.full(4, 0.5)}))
+        assert all(r.passed_prescreen for r in ws.results)
+        ws.select(records, im_index=IMIndex(names, {'pga': np.full(4, 2.0)}))
+        assert ws.cache_stats['hits'] == 0
+        assert not any(r.passed_prescreen for r in ws.results)
+        ws.select(records, im_index=IMIndex(names, {'pga': np.full(4, 0.5)}))
+        assert ws.cache_stats == {'hits': 4, 'misses': 0}